@@ -17,6 +17,10 @@ load_dotenv(
 from src.db import Base
 from src.db import (
     TradeORM,
+    UserFacetORM,
+    UserTradeAggregateORM,
+    UserTradeDailyBucketORM,
+    UserDataVersionORM,
     UserORM,
     RefreshTokenORM,
     PasswordResetTokenORM,
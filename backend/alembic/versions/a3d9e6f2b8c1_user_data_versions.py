@@ -0,0 +1,34 @@
+"""user data versions
+
+Revision ID: a3d9e6f2b8c1
+Revises: f5b1c8d3a7e9
+Create Date: 2026-10-18 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a3d9e6f2b8c1'
+down_revision: Union[str, Sequence[str], None] = 'f5b1c8d3a7e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Per-user data version backing the read endpoints' ETags.
+
+    Starts empty: a missing row reads as version 0 and the first write
+    creates it, so no backfill is needed.
+    """
+    op.create_table('user_data_versions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_data_versions')
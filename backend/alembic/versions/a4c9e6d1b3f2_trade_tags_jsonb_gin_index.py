@@ -0,0 +1,75 @@
+"""trade tags jsonb with gin index
+
+Revision ID: a4c9e6d1b3f2
+Revises: f3b8d5c0a2e1
+Create Date: 2026-10-18 00:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'a4c9e6d1b3f2'
+down_revision: Union[str, Sequence[str], None] = 'f3b8d5c0a2e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    """Store tags as JSONB and index them for the ?| tags filter.
+
+    The default jsonb_ops opclass is used: jsonb_path_ops only supports
+    containment (@>), not the key/element existence operators.
+
+    Same online swap as b7d2f8e4c6a3: a new column is backfilled in
+    id-range batches committed one by one and its GIN index is built
+    concurrently; rows the old app version wrote meanwhile are caught
+    up under a short table lock right before the swap.
+    """
+    op.add_column('trades', sa.Column('tags_jsonb', postgresql.JSONB(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        max_id = bind.execute(sa.text("SELECT max(id) FROM trades")).scalar() or 0
+        for start in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            bind.execute(
+                sa.text(
+                    "UPDATE trades SET tags_jsonb = tags::jsonb "
+                    "WHERE id >= :start AND id < :stop"
+                ),
+                {"start": start, "stop": start + BACKFILL_BATCH_SIZE},
+            )
+        op.create_index(
+            'ix_trades_tags_jsonb_gin',
+            'trades',
+            ['tags_jsonb'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+    op.execute("LOCK TABLE trades IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        "UPDATE trades SET tags_jsonb = tags::jsonb "
+        "WHERE tags_jsonb IS DISTINCT FROM tags::jsonb"
+    )
+    op.drop_column('trades', 'tags')
+    op.alter_column('trades', 'tags_jsonb', new_column_name='tags')
+    op.execute("ALTER INDEX ix_trades_tags_jsonb_gin RENAME TO ix_trades_tags_gin")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trades_tags_gin', table_name='trades')
+    op.alter_column(
+        'trades',
+        'tags',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='tags::json',
+    )
@@ -0,0 +1,89 @@
+"""trade timestamps to timestamptz
+
+Revision ID: b7d2f8e4c6a3
+Revises: a4c9e6d1b3f2
+Create Date: 2026-10-18 00:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b7d2f8e4c6a3'
+down_revision: Union[str, Sequence[str], None] = 'a4c9e6d1b3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMP_COLUMNS = ('opened_at', 'closed_at', 'created_at')
+BACKFILL_BATCH_SIZE = 10_000
+
+_COPY_TIMESTAMPS = ", ".join(
+    f"{column}_ts = NULLIF({column}, '')::timestamptz" for column in TIMESTAMP_COLUMNS
+)
+_TIMESTAMPS_DIFFER = " OR ".join(
+    f"{column}_ts IS DISTINCT FROM NULLIF({column}, '')::timestamptz"
+    for column in TIMESTAMP_COLUMNS
+)
+
+
+def upgrade() -> None:
+    """Convert ISO text timestamps to timestamptz.
+
+    New columns are backfilled in id-range batches committed one by one,
+    so the table is never rewritten under a single long lock, and their
+    (user_id, <column>, id) indexes are built concurrently next to the
+    old ones. Rows written by the old app version during the backfill
+    are caught up under a short table lock right before the columns and
+    indexes are swapped by drop and rename.
+    """
+    for column in TIMESTAMP_COLUMNS:
+        op.add_column(
+            'trades',
+            sa.Column(f'{column}_ts', sa.DateTime(timezone=True), nullable=True),
+        )
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        max_id = bind.execute(sa.text("SELECT max(id) FROM trades")).scalar() or 0
+        for start in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            bind.execute(
+                sa.text(
+                    f"UPDATE trades SET {_COPY_TIMESTAMPS} "
+                    "WHERE id >= :start AND id < :stop"
+                ),
+                {"start": start, "stop": start + BACKFILL_BATCH_SIZE},
+            )
+        for column in TIMESTAMP_COLUMNS:
+            op.create_index(
+                f'ix_trades_user_id_{column}_ts_id',
+                'trades',
+                ['user_id', f'{column}_ts', 'id'],
+                postgresql_concurrently=True,
+            )
+
+    op.execute("LOCK TABLE trades IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(f"UPDATE trades SET {_COPY_TIMESTAMPS} WHERE {_TIMESTAMPS_DIFFER}")
+
+    for column in TIMESTAMP_COLUMNS:
+        op.drop_index(f'ix_trades_user_id_{column}_id', table_name='trades')
+        op.drop_column('trades', column)
+        op.alter_column('trades', f'{column}_ts', new_column_name=column)
+        op.execute(
+            f"ALTER INDEX ix_trades_user_id_{column}_ts_id RENAME TO ix_trades_user_id_{column}_id"
+        )
+    op.alter_column('trades', 'opened_at', nullable=False)
+
+
+def downgrade() -> None:
+    # ALTER COLUMN ... TYPE rebuilds the (user_id, <column>, id) indexes
+    # in place, so they come back under the same names; the older
+    # (user_id, <column>) indexes are restored by e2a7c4b9f1d0's downgrade
+    for column in TIMESTAMP_COLUMNS:
+        op.execute(
+            f"""
+            ALTER TABLE trades ALTER COLUMN {column} TYPE varchar
+            USING to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"')
+            """
+        )
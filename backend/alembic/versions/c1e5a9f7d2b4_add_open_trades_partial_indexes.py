@@ -0,0 +1,38 @@
+"""add open trades partial indexes
+
+Revision ID: c1e5a9f7d2b4
+Revises: b7d2f8e4c6a3
+Create Date: 2026-10-18 00:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c1e5a9f7d2b4'
+down_revision: Union[str, Sequence[str], None] = 'b7d2f8e4c6a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index only open trades so open-position listings skip closed history."""
+    op.create_index(
+        'ix_trades_open_user_id_opened_at_id',
+        'trades',
+        ['user_id', 'opened_at', 'id'],
+        postgresql_where=sa.text('close_price IS NULL'),
+    )
+    op.create_index(
+        'ix_trades_open_user_id_created_at_id',
+        'trades',
+        ['user_id', 'created_at', 'id'],
+        postgresql_where=sa.text('close_price IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trades_open_user_id_created_at_id', table_name='trades')
+    op.drop_index('ix_trades_open_user_id_opened_at_id', table_name='trades')
@@ -0,0 +1,72 @@
+"""user facets table
+
+Revision ID: d6f3b0a8e5c7
+Revises: c1e5a9f7d2b4
+Create Date: 2026-10-18 00:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd6f3b0a8e5c7'
+down_revision: Union[str, Sequence[str], None] = 'c1e5a9f7d2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Current per-user symbol/tag reference counts, computed from trades.
+FACETS_SQL = """
+    SELECT user_id, 'symbol' AS kind, upper(symbol) AS value, count(*) AS trade_count
+    FROM trades
+    WHERE symbol IS NOT NULL AND symbol <> ''
+    GROUP BY user_id, upper(symbol)
+    UNION ALL
+    SELECT trades.user_id, 'tag', tag.value, count(*)
+    FROM trades
+    JOIN jsonb_array_elements_text(
+        CASE WHEN jsonb_typeof(trades.tags) = 'array' THEN trades.tags END
+    ) AS tag(value) ON true
+    GROUP BY trades.user_id, tag.value
+"""
+
+
+def upgrade() -> None:
+    """Per-user symbol/tag reference counts, seeded from existing trades.
+
+    The seed runs without blocking writes; facets the old app version
+    changed meanwhile are caught up under a short table lock, which only
+    writes the rows whose counts differ.
+    """
+    op.create_table('user_facets',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('trade_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'kind', 'value')
+    )
+    op.execute(f"INSERT INTO user_facets (user_id, kind, value, trade_count) {FACETS_SQL}")
+
+    op.execute("LOCK TABLE trades IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        f"""
+        DELETE FROM user_facets
+        WHERE (user_id, kind, value) NOT IN (
+            SELECT user_id, kind, value FROM ({FACETS_SQL}) AS current
+        )
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO user_facets (user_id, kind, value, trade_count) {FACETS_SQL}
+        ON CONFLICT (user_id, kind, value) DO UPDATE
+        SET trade_count = EXCLUDED.trade_count
+        WHERE user_facets.trade_count <> EXCLUDED.trade_count
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_facets')
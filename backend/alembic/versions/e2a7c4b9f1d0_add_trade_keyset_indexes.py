@@ -0,0 +1,33 @@
+"""add trade keyset indexes
+
+Revision ID: e2a7c4b9f1d0
+Revises: d8e1f2a3b4c5
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'e2a7c4b9f1d0'
+down_revision: Union[str, Sequence[str], None] = 'd8e1f2a3b4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Cover the full (sort column, id) keyset so cursor pages are index range scans."""
+    op.drop_index('ix_trades_user_id_closed_at', table_name='trades')
+    op.drop_index('ix_trades_user_id_opened_at', table_name='trades')
+    op.create_index('ix_trades_user_id_opened_at_id', 'trades', ['user_id', 'opened_at', 'id'])
+    op.create_index('ix_trades_user_id_closed_at_id', 'trades', ['user_id', 'closed_at', 'id'])
+    op.create_index('ix_trades_user_id_created_at_id', 'trades', ['user_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trades_user_id_created_at_id', table_name='trades')
+    op.drop_index('ix_trades_user_id_closed_at_id', table_name='trades')
+    op.drop_index('ix_trades_user_id_opened_at_id', table_name='trades')
+    op.create_index('ix_trades_user_id_opened_at', 'trades', ['user_id', 'opened_at'])
+    op.create_index('ix_trades_user_id_closed_at', 'trades', ['user_id', 'closed_at'])
@@ -0,0 +1,142 @@
+"""user trade aggregates
+
+Revision ID: e9a4c7d2f6b1
+Revises: d6f3b0a8e5c7
+Create Date: 2026-10-18 02:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e9a4c7d2f6b1'
+down_revision: Union[str, Sequence[str], None] = 'd6f3b0a8e5c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQL twin of trade_metrics.calc_absolute_pnl (0 for open trades).
+PNL_SQL = """
+    CASE
+        WHEN t.close_price IS NULL THEN 0.0
+        WHEN t.lev > 1 AND (
+            (t.type = 'buy' AND t.close_price <= t.open_price * (1 - 1 / t.lev))
+            OR (t.type = 'sell' AND t.close_price >= t.open_price * (1 + 1 / t.lev))
+        ) THEN (-t.open_price * t.quantity) / t.lev
+        WHEN t.type = 'buy' THEN (t.close_price - t.open_price) * t.quantity
+        ELSE (t.open_price - t.close_price) * t.quantity
+    END
+"""
+VOLUME_SQL = "(t.open_price + coalesce(t.close_price, 0)) * t.quantity"
+TRADES_SQL = """
+    (SELECT trades.*, coalesce(nullif(leverage, 0), 1.0) AS lev FROM trades) AS t
+"""
+AGGREGATES_SQL = f"""
+    SELECT
+        t.user_id,
+        sum(CASE WHEN t.close_price IS NULL THEN t.open_price * t.quantity ELSE 0.0 END),
+        sum({PNL_SQL}),
+        sum(CASE WHEN t.close_price IS NULL THEN 1 ELSE 0 END),
+        sum(CASE WHEN t.close_price IS NULL THEN 0 ELSE 1 END),
+        sum({VOLUME_SQL})
+    FROM {TRADES_SQL}
+    GROUP BY t.user_id
+"""
+BUCKETS_SQL = f"""
+    SELECT
+        t.user_id,
+        (t.opened_at AT TIME ZONE 'UTC')::date,
+        sum(CASE WHEN t.close_price IS NOT NULL THEN {PNL_SQL} ELSE 0.0 END),
+        sum({VOLUME_SQL}),
+        count(*)
+    FROM {TRADES_SQL}
+    GROUP BY t.user_id, (t.opened_at AT TIME ZONE 'UTC')::date
+"""
+AGGREGATE_COLUMNS = (
+    "user_id, open_equity, realized_pnl, open_trades, closed_trades, traded_volume"
+)
+BUCKET_COLUMNS = "user_id, day, closed_pnl, traded_volume, trade_count"
+
+
+def upgrade() -> None:
+    """Running per-user summary totals and daily buckets, seeded from trades.
+
+    The seed runs without blocking writes; totals and buckets the old
+    app version changed meanwhile are caught up under a short table
+    lock, which only writes the rows that differ.
+    """
+    op.create_table('user_trade_aggregates',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('open_equity', sa.Float(), nullable=False),
+    sa.Column('realized_pnl', sa.Float(), nullable=False),
+    sa.Column('open_trades', sa.Integer(), nullable=False),
+    sa.Column('closed_trades', sa.Integer(), nullable=False),
+    sa.Column('traded_volume', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('user_trade_daily_buckets',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('closed_pnl', sa.Float(), nullable=False),
+    sa.Column('traded_volume', sa.Float(), nullable=False),
+    sa.Column('trade_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.execute(f"INSERT INTO user_trade_aggregates ({AGGREGATE_COLUMNS}) {AGGREGATES_SQL}")
+    op.execute(f"INSERT INTO user_trade_daily_buckets ({BUCKET_COLUMNS}) {BUCKETS_SQL}")
+
+    op.execute("LOCK TABLE trades IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        """
+        DELETE FROM user_trade_aggregates
+        WHERE user_id NOT IN (SELECT user_id FROM trades)
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO user_trade_aggregates ({AGGREGATE_COLUMNS}) {AGGREGATES_SQL}
+        ON CONFLICT (user_id) DO UPDATE
+        SET (open_equity, realized_pnl, open_trades, closed_trades, traded_volume) = (
+            EXCLUDED.open_equity, EXCLUDED.realized_pnl, EXCLUDED.open_trades,
+            EXCLUDED.closed_trades, EXCLUDED.traded_volume
+        )
+        WHERE (
+            user_trade_aggregates.open_equity, user_trade_aggregates.realized_pnl,
+            user_trade_aggregates.open_trades, user_trade_aggregates.closed_trades,
+            user_trade_aggregates.traded_volume
+        ) IS DISTINCT FROM (
+            EXCLUDED.open_equity, EXCLUDED.realized_pnl, EXCLUDED.open_trades,
+            EXCLUDED.closed_trades, EXCLUDED.traded_volume
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM user_trade_daily_buckets
+        WHERE (user_id, day) NOT IN (
+            SELECT user_id, (opened_at AT TIME ZONE 'UTC')::date FROM trades
+        )
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO user_trade_daily_buckets ({BUCKET_COLUMNS}) {BUCKETS_SQL}
+        ON CONFLICT (user_id, day) DO UPDATE
+        SET (closed_pnl, traded_volume, trade_count) = (
+            EXCLUDED.closed_pnl, EXCLUDED.traded_volume, EXCLUDED.trade_count
+        )
+        WHERE (
+            user_trade_daily_buckets.closed_pnl, user_trade_daily_buckets.traded_volume,
+            user_trade_daily_buckets.trade_count
+        ) IS DISTINCT FROM (
+            EXCLUDED.closed_pnl, EXCLUDED.traded_volume, EXCLUDED.trade_count
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_trade_daily_buckets')
+    op.drop_table('user_trade_aggregates')
@@ -0,0 +1,48 @@
+"""add trade symbol search indexes
+
+Revision ID: f3b8d5c0a2e1
+Revises: e2a7c4b9f1d0
+Create Date: 2026-10-18 00:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f3b8d5c0a2e1'
+down_revision: Union[str, Sequence[str], None] = 'e2a7c4b9f1d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Trigram GIN index for ILIKE '%..%' and a pattern-ops btree for prefix search.
+
+    Every search is scoped to one user, so the trigram index leads with
+    user_id (btree_gin provides the GIN operator class for the integer
+    column) and Postgres only intersects that user's posting lists.
+    Both indexes are built concurrently, so writes continue meanwhile.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_trades_user_id_symbol_trgm',
+            'trades',
+            ['user_id', sa.text('symbol gin_trgm_ops')],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_trades_user_id_upper_symbol_pattern',
+            'trades',
+            ['user_id', sa.text('upper(symbol) text_pattern_ops')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trades_user_id_upper_symbol_pattern', table_name='trades')
+    op.drop_index('ix_trades_user_id_symbol_trgm', table_name='trades')
@@ -0,0 +1,80 @@
+"""trade realized pnl columns
+
+Revision ID: f5b1c8d3a7e9
+Revises: e9a4c7d2f6b1
+Create Date: 2026-10-18 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f5b1c8d3a7e9'
+down_revision: Union[str, Sequence[str], None] = 'e9a4c7d2f6b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10_000
+
+# SQL twin of trade_metrics.calc_absolute_pnl (NULL for open trades).
+_LEVERAGE = "coalesce(nullif(leverage, 0), 1.0)"
+_PNL = f"""
+    CASE
+        WHEN close_price IS NULL THEN NULL
+        WHEN {_LEVERAGE} > 1 AND (
+            (type = 'buy' AND close_price <= open_price * (1 - 1 / {_LEVERAGE}))
+            OR (type = 'sell' AND close_price >= open_price * (1 + 1 / {_LEVERAGE}))
+        ) THEN (-open_price * quantity) / {_LEVERAGE}
+        WHEN type = 'buy' THEN (close_price - open_price) * quantity
+        ELSE (open_price - close_price) * quantity
+    END
+"""
+_MARGIN = f"nullif(open_price * quantity / {_LEVERAGE}, 0)"
+_COPY_PNL = f"realized_pnl = {_PNL}, pnl_pct = ({_PNL}) / {_MARGIN}"
+
+
+def upgrade() -> None:
+    """Stored realized PnL / PnL % for SQL sorting and range filters.
+
+    The app keeps both in sync on every write from now on; existing rows
+    are backfilled in id-range batches committed one by one, and rows
+    the old app version wrote meanwhile are caught up under a short lock.
+
+    The index is built concurrently and matches the default PnL sort
+    (realized_pnl DESC NULLS LAST, id DESC); scanned backwards it also
+    serves "prev" pages of that sort.
+    """
+    op.add_column('trades', sa.Column('realized_pnl', sa.Float(), nullable=True))
+    op.add_column('trades', sa.Column('pnl_pct', sa.Float(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        max_id = bind.execute(sa.text("SELECT max(id) FROM trades")).scalar() or 0
+        for start in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            bind.execute(
+                sa.text(
+                    f"UPDATE trades SET {_COPY_PNL} "
+                    "WHERE id >= :start AND id < :stop"
+                ),
+                {"start": start, "stop": start + BACKFILL_BATCH_SIZE},
+            )
+        op.create_index(
+            'ix_trades_user_id_realized_pnl_id',
+            'trades',
+            ['user_id', sa.text('realized_pnl DESC NULLS LAST'), sa.text('id DESC')],
+            postgresql_concurrently=True,
+        )
+
+    op.execute("LOCK TABLE trades IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        f"UPDATE trades SET {_COPY_PNL} "
+        f"WHERE realized_pnl IS DISTINCT FROM ({_PNL})"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trades_user_id_realized_pnl_id', table_name='trades')
+    op.drop_column('trades', 'pnl_pct')
+    op.drop_column('trades', 'realized_pnl')
@@ -0,0 +1,121 @@
+"""Dashboard summary end to end: scalar Python vs NumPy vs SQL vs running aggregates.
+
+Seeds an in-memory SQLite database (or `--url`) with `--sizes` trades of
+one user and reports the median wall time of each way to compute the
+summary, reading from the database included:
+
+- scalar: load the rows, build TradeDomain objects, compute_summary
+- numpy: select the bare columns into arrays (load_trade_columns),
+  compute_summary(engine="numpy"); needs the `metrics` extra
+- sql: one SUM(CASE ...) query (compute_summary_sql)
+- aggregates: read the running totals (read_summary, what get_summary uses)
+
+    cd backend
+    python -m benchmarks.bench_summary --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("ALLOWED_ORIGINS", "http://localhost")
+
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.orm import sessionmaker
+
+from src.db import Base, TradeORM
+from src.domain.trade.enums import TradeType
+from src.services.trade_aggregates_service import read_summary, rebuild_trade_aggregates
+from src.services.trade_metrics import compute_summary
+from src.services.trade_metrics_numpy import load_trade_columns
+from src.services.trade_sql_metrics import compute_summary_sql
+
+NOW = datetime(2025, 6, 15, 12, tzinfo=timezone.utc)
+USER_ID = 1
+INSERT_BATCH_SIZE = 10_000
+
+
+def _rows(size: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(size):
+        open_price = rng.uniform(0.5, 50_000)
+        opened_at = NOW - timedelta(hours=rng.uniform(0, 24 * 365))
+        closed = rng.random() < 0.7
+        rows.append({
+            "user_id": USER_ID,
+            "symbol": "BTCUSDT",
+            "type": rng.choice((TradeType.buy, TradeType.sell)).value,
+            "open_price": open_price,
+            "quantity": rng.uniform(0.001, 100),
+            "opened_at": opened_at,
+            "leverage": rng.choice((None, 1, 5, 20, 100)),
+            "close_price": open_price * rng.uniform(0.5, 1.5) if closed else None,
+            "closed_at": opened_at + timedelta(hours=rng.uniform(0.1, 240)) if closed else None,
+            "created_at": opened_at,
+        })
+    return rows
+
+
+def _seed(session, size: int, seed: int) -> None:
+    session.execute(delete(TradeORM))
+    rows = _rows(size, seed)
+    for start in range(0, size, INSERT_BATCH_SIZE):
+        session.execute(insert(TradeORM), rows[start:start + INSERT_BATCH_SIZE])
+    rebuild_trade_aggregates(session)
+    session.commit()
+
+
+def _scalar(session) -> dict[str, float]:
+    trades = [
+        row.to_domain()
+        for row in session.query(TradeORM).filter(TradeORM.user_id == USER_ID)
+    ]
+    session.expunge_all()
+    return compute_summary(trades, now=NOW)
+
+
+def _numpy(session) -> dict[str, float]:
+    return compute_summary(load_trade_columns(session, USER_ID), now=NOW, engine="numpy")
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for attempt in range(repeat + 1):
+        started = time.perf_counter()
+        fn()
+        if attempt:  # first run is warm-up
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--url", default="sqlite://")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    print(
+        f"{'trades':>10}{'scalar ms':>12}{'numpy ms':>12}{'sql ms':>12}{'aggregates ms':>15}"
+    )
+    for size in args.sizes:
+        _seed(session, size, args.seed)
+        scalar = _median_ms(lambda: _scalar(session), args.repeat)
+        numpy = _median_ms(lambda: _numpy(session), args.repeat)
+        sql = _median_ms(lambda: compute_summary_sql(session, USER_ID, now=NOW), args.repeat)
+        aggregates = _median_ms(lambda: read_summary(session, USER_ID, now=NOW), args.repeat)
+        print(f"{size:>10,}{scalar:>12.2f}{numpy:>12.2f}{sql:>12.2f}{aggregates:>15.2f}")
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Symbol search latency with and without the symbol search indexes.
+
+Runs against Postgres only (pg_trgm). Seeds a throwaway schema with
+`--rows` trades spread over `--users` users, then times the list query
+built by trade_query_service for substring and prefix matches, first
+without and then with the indexes from migration f3b8d5c0a2e1.
+
+    cd backend
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.bench_symbol_search
+"""
+import argparse
+import os
+import statistics
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv(
+    dotenv_path=os.path.join(os.path.dirname(__file__), "..", "..", ".env"),
+    override=False,
+)
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("ALLOWED_ORIGINS", "http://localhost")
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from src.db import Base
+from src.models.trade.trade_list_query import TradeListQuery
+from src.services.trade_query_service import build_filtered_query
+from src.utils import _get_env_var
+
+SCHEMA = "bench_symbol_search"
+
+# Indexes that exist before migration f3b8d5c0a2e1
+BASELINE_INDEXES = [
+    "CREATE INDEX ix_trades_user_id_opened_at_id ON trades (user_id, opened_at, id)",
+]
+
+SEARCH_INDEXES = [
+    "CREATE INDEX ix_trades_user_id_symbol_trgm "
+    "ON trades USING gin (user_id, symbol gin_trgm_ops)",
+    "CREATE INDEX ix_trades_user_id_upper_symbol_pattern "
+    "ON trades (user_id, upper(symbol) text_pattern_ops)",
+]
+
+CASES = [
+    ("contains '123U'", TradeListQuery(symbol="123U")),
+    ("contains 'H042'", TradeListQuery(symbol="H042")),
+    ("prefix 'SOL07'", TradeListQuery(symbol="SOL07", symbol_match="prefix")),
+]
+
+
+def _seed(engine, rows: int, users: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gin"))
+    Base.metadata.tables["trades"].create(bind=engine)
+    with engine.begin() as conn:
+        # ~2k distinct symbols so substring matches stay selective
+        conn.execute(
+            text(
+                """
+                INSERT INTO trades (user_id, symbol, open_price, type, opened_at, quantity)
+                SELECT
+                    1 + (g % :users),
+                    (ARRAY['BTC','ETH','SOL','XRP','ADA','DOGE','AVAX','LINK'])[1 + g % 8]
+                        || lpad((g % 250)::text, 3, '0')
+                        || (ARRAY['USDT','USDC','EUR','BTC'])[1 + (g / 8) % 4],
+                    100, 'buy',
+                    now() - (g || ' minutes')::interval,
+                    1
+                FROM generate_series(1, :rows) AS g
+                """
+            ),
+            {"rows": rows, "users": users},
+        )
+        for statement in BASELINE_INDEXES:
+            conn.execute(text(statement))
+        conn.execute(text("ANALYZE trades"))
+
+
+def _time_case(Session, query_params: TradeListQuery, repeat: int) -> float:
+    """Median ms for one filtered page plus its COUNT, as list_trades issues."""
+    samples = []
+    with Session() as db:
+        query = build_filtered_query(db, 1, query_params)
+        for attempt in range(repeat + 1):
+            started = time.perf_counter()
+            query.limit(query_params.limit).all()
+            query.order_by(None).count()
+            if attempt:  # first run is warm-up
+                samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(_get_env_var("DATABASE_URL"))
+
+    @event.listens_for(engine, "connect")
+    def _use_bench_schema(dbapi_connection, _record):
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f"SET search_path TO {SCHEMA}, public")
+
+    Session = sessionmaker(bind=engine)
+    print(f"Seeding {args.rows:,} trades over {args.users} users...")
+    _seed(engine, args.rows, args.users)
+
+    results: dict[str, list[float]] = {label: [] for label, _ in CASES}
+    for label, query_params in CASES:
+        results[label].append(_time_case(Session, query_params, args.repeat))
+
+    with engine.begin() as conn:
+        for statement in SEARCH_INDEXES:
+            conn.execute(text(statement))
+        conn.execute(text("ANALYZE trades"))
+
+    for label, query_params in CASES:
+        results[label].append(_time_case(Session, query_params, args.repeat))
+
+    print(f"{'case':<18}{'no index ms':>14}{'indexed ms':>14}{'speedup':>10}")
+    for label, (before, after) in results.items():
+        print(f"{label:<18}{before:>14.2f}{after:>14.2f}{before / after:>9.1f}x")
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Rebuild the user_trade_aggregates and user_trade_daily_buckets from trades.
+
+    cd backend
+    python -m src.commands.rebuild_trade_aggregates            # all users
+    python -m src.commands.rebuild_trade_aggregates --user-id 42
+"""
+import argparse
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", "..", "..", ".env"), override=False)
+
+from .. import database
+from ..services.trade_aggregates_service import rebuild_trade_aggregates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild per-user trade summary aggregates.")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user.")
+    args = parser.parse_args()
+
+    db = database.SessionLocal()
+    try:
+        rebuild_trade_aggregates(db, args.user_id)
+        db.commit()
+    finally:
+        db.close()
+    scope = f"user {args.user_id}" if args.user_id is not None else "all users"
+    print(f"Rebuilt trade aggregates for {scope}.")
+
+
+if __name__ == "__main__":
+    main()
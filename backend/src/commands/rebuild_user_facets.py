@@ -0,0 +1,34 @@
+"""Rebuild the user_facets dictionary from the trades table.
+
+    cd backend
+    python -m src.commands.rebuild_user_facets            # all users
+    python -m src.commands.rebuild_user_facets --user-id 42
+"""
+import argparse
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", "..", "..", ".env"), override=False)
+
+from .. import database
+from ..services.user_facets_service import rebuild_user_facets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild per-user trade facet counts.")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user.")
+    args = parser.parse_args()
+
+    db = database.SessionLocal()
+    try:
+        rebuild_user_facets(db, args.user_id)
+        db.commit()
+    finally:
+        db.close()
+    scope = f"user {args.user_id}" if args.user_id is not None else "all users"
+    print(f"Rebuilt facets for {scope}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,54 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import URL, create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from .db import Base
 from .utils import _get_env_var
 
 database_url = _get_env_var("DATABASE_URL")
-engine = create_engine(database_url)
+# Trade timestamps are timestamptz; a UTC session makes psycopg return
+# aware UTC datetimes without per-row conversion
+connect_args = (
+    {"options": "-c timezone=UTC"}
+    if make_url(database_url).get_backend_name() == "postgresql"
+    else {}
+)
+engine = create_engine(database_url, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# "sync" serves every route from threadpool handlers on `engine`; "async"
+# also registers the event-loop handlers in main.py on `get_async_db`.
+# Switchable per deployment while routes migrate.
+DB_STACK = os.getenv("DB_STACK", "sync")
+if DB_STACK not in ("sync", "async"):
+    raise RuntimeError(f"DB_STACK must be 'sync' or 'async', got {DB_STACK!r}")
+
+
+def async_database_url(url: str) -> URL:
+    """DATABASE_URL with its async driver: psycopg (async mode) or aiosqlite."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        return parsed.set(drivername="postgresql+psycopg")
+    if parsed.get_backend_name() == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite")
+    return parsed
+
+
+_async_engine: AsyncEngine | None = None
+_AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Async engine on the same database, created on first use so the sync
+    stack doesn't need the async driver installed."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = create_async_engine(async_database_url(database_url), connect_args=connect_args)
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
 
 def init_db():
     """Create all tables. Used for local dev/testing; production uses Alembic migrations."""
@@ -18,4 +59,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
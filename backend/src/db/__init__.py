@@ -1,5 +1,8 @@
 from .base import Base
 from .trade_orm import TradeORM
+from .user_facet_orm import UserFacetORM, FACET_KIND_SYMBOL, FACET_KIND_TAG
+from .user_trade_aggregate_orm import UserTradeAggregateORM, UserTradeDailyBucketORM
+from .user_data_version_orm import UserDataVersionORM
 from .user_orm import UserORM
 from .refresh_token_orm import RefreshTokenORM
 from .email_verification_token_orm import EmailVerificationTokenORM, EMAIL_VERIFICATION_TOKEN_EXPIRE_SEC
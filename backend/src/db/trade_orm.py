@@ -1,9 +1,11 @@
-from datetime import datetime
-from sqlalchemy import Column, Integer, Float, String, JSON
+from sqlalchemy import Column, Integer, Float, String, JSON, event
+from sqlalchemy.dialects.postgresql import JSONB
 
 from .base import Base
+from .utc_datetime import UtcDateTime
 from ..domain import TradeDomain, TradeType
-from ..utils import get_current_time
+from ..services.trade_metrics import calc_absolute_pnl, calc_pnl_pct
+from ..utils.datetime_utils import utc_now
 
 class TradeORM(Base):
     __tablename__ = "trades"
@@ -12,31 +14,43 @@ class TradeORM(Base):
     symbol = Column(String, index=True)
     open_price = Column(Float, nullable=False)  # renamed from price
     type = Column(String, index=True, nullable=False)
-    opened_at = Column(String, nullable=False)
+    opened_at = Column(UtcDateTime, nullable=False)
     quantity = Column(Float, nullable=False)
     leverage = Column(Float, nullable=True)
     stop_loss = Column(Float, nullable=True)
     take_profit = Column(Float, nullable=True)
     close_price = Column(Float, nullable=True)
-    closed_at = Column(String, nullable=True)
-    created_at = Column(String, default=get_current_time)
+    closed_at = Column(UtcDateTime, nullable=True)
+    created_at = Column(UtcDateTime, default=utc_now)
     comment = Column(String, nullable=True)
-    tags = Column(JSON, nullable=True)
+    # JSONB on Postgres (GIN-indexed for the tags filter), JSON elsewhere
+    tags = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    # Derived from the price columns on every flush (see _sync_pnl); NULL
+    # while the trade is open. Indexed with user_id for PnL sort/filters.
+    realized_pnl = Column(Float, nullable=True)
+    pnl_pct = Column(Float, nullable=True)
 
     def to_domain(self) -> "TradeDomain":
         return TradeDomain(
             id=self.id,
-            created_at=datetime.fromisoformat(self.created_at.replace('Z', '+00:00')) if self.created_at else None,
+            created_at=self.created_at,
             symbol=self.symbol,
             type=TradeType(self.type),
             open_price=self.open_price,
             quantity=self.quantity,
-            opened_at=datetime.fromisoformat(self.opened_at.replace('Z', '+00:00')),
+            opened_at=self.opened_at,
             take_profit=self.take_profit,
             stop_loss=self.stop_loss,
             leverage=self.leverage,
             close_price=self.close_price,
-            closed_at=datetime.fromisoformat(self.closed_at.replace('Z', '+00:00')) if self.closed_at else None,
+            closed_at=self.closed_at,
             comment=self.comment,
             tags=self.tags,
         )
+
+
+@event.listens_for(TradeORM, "before_insert")
+@event.listens_for(TradeORM, "before_update")
+def _sync_pnl(_mapper, _connection, trade: TradeORM) -> None:
+    trade.realized_pnl = calc_absolute_pnl(trade)
+    trade.pnl_pct = calc_pnl_pct(trade)
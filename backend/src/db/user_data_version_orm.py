@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, Integer
+
+from .base import Base
+
+
+class UserDataVersionORM(Base):
+    """Per-user counter bumped by every trade write.
+
+    Read endpoints derive their ETags from it (see
+    services/data_version_service.py); a missing row means version 0.
+    """
+
+    __tablename__ = "user_data_versions"
+
+    user_id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String
+
+from .base import Base
+
+FACET_KIND_SYMBOL = "symbol"
+FACET_KIND_TAG = "tag"
+
+
+class UserFacetORM(Base):
+    """Per-user facet dictionary: how many trades carry each symbol/tag.
+
+    Kept in step with the trades table by the trade write routes (see
+    services/user_facets_service.py) so facets are a primary-key read.
+    """
+
+    __tablename__ = "user_facets"
+
+    user_id = Column(Integer, primary_key=True)
+    kind = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    trade_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Date, Float, Integer
+
+from .base import Base
+
+
+class UserTradeAggregateORM(Base):
+    """Running per-user totals behind /trades/summary.
+
+    Updated in the same transaction as every trade write (see
+    services/trade_aggregates_service.py).
+    """
+
+    __tablename__ = "user_trade_aggregates"
+
+    user_id = Column(Integer, primary_key=True)
+    open_equity = Column(Float, nullable=False, default=0.0)
+    realized_pnl = Column(Float, nullable=False, default=0.0)
+    open_trades = Column(Integer, nullable=False, default=0)
+    closed_trades = Column(Integer, nullable=False, default=0)
+    traded_volume = Column(Float, nullable=False, default=0.0)
+
+
+class UserTradeDailyBucketORM(Base):
+    """Per-user, per-UTC-day (of opened_at) PnL and volume.
+
+    Lets the rolling 7-day summary window be summed from a handful of
+    rows instead of the user's trade history.
+    """
+
+    __tablename__ = "user_trade_daily_buckets"
+
+    user_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    closed_pnl = Column(Float, nullable=False, default=0.0)
+    traded_volume = Column(Float, nullable=False, default=0.0)
+    trade_count = Column(Integer, nullable=False, default=0)
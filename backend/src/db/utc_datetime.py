@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+
+from ..utils.datetime_utils import ensure_utc
+
+
+class UtcDateTime(TypeDecorator):
+    """timestamptz column that always round-trips as aware UTC datetimes.
+
+    Postgres connections run with timezone=UTC (see database.py), so
+    psycopg already returns aware UTC values and no result processing is
+    added there. SQLite has no timezone support: values are stored as
+    naive UTC and tagged with UTC on load.
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value: datetime | None, dialect) -> datetime | None:
+        if value is None:
+            return None
+        value = ensure_utc(value)
+        if dialect.name == "sqlite":
+            return value.replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value: datetime | None, dialect) -> datetime | None:
+        if value is None or value.tzinfo is not None:
+            return value
+        return value.replace(tzinfo=timezone.utc)
+
+    def result_processor(self, dialect, coltype):
+        if dialect.name == "postgresql":
+            return None
+        return super().result_processor(dialect, coltype)
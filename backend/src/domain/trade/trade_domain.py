@@ -6,7 +6,7 @@ from ...errors.trade_validators import (
     validate_take_profit,
     validate_closed_at, validate_close_trade,
 )
-from ...utils.datetime_utils import to_utc_iso_string
+from ...utils.datetime_utils import ensure_utc
 
 class TradeDomain:
     def __init__(
@@ -49,17 +49,17 @@ class TradeDomain:
     def to_dict(self) -> dict:
         return {
             'id': self.id,
-            'created_at': to_utc_iso_string(self.created_at) if self.created_at else None,
+            'created_at': ensure_utc(self.created_at) if self.created_at else None,
             'symbol': self.symbol,
             'type': self.type.value,
             'open_price': self.open_price,
             'quantity': self.quantity,
-            'opened_at': to_utc_iso_string(self.opened_at),
+            'opened_at': ensure_utc(self.opened_at),
             'take_profit': self.take_profit,
             'stop_loss': self.stop_loss,
             'leverage': self.leverage,
             'close_price': self.close_price,
-            'closed_at': to_utc_iso_string(self.closed_at) if self.closed_at else None,
+            'closed_at': ensure_utc(self.closed_at) if self.closed_at else None,
             'comment': self.comment,
             'tags': self.tags,
         }
\ No newline at end of file
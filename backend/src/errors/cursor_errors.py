@@ -0,0 +1,7 @@
+from pydantic_core import PydanticCustomError
+
+def invalid_cursor_error() -> PydanticCustomError:
+    return PydanticCustomError(
+        "cursor.invalid",
+        "Invalid or expired pagination cursor."
+    )
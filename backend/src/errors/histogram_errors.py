@@ -0,0 +1,7 @@
+from pydantic_core import PydanticCustomError
+
+def invalid_bin_edges_error() -> PydanticCustomError:
+    return PydanticCustomError(
+        "histogram.invalid_edges",
+        "Bin edges must be 1 to 50 finite numbers in strictly increasing order."
+    )
@@ -0,0 +1,7 @@
+from pydantic_core import PydanticCustomError
+
+def unknown_timezone_error() -> PydanticCustomError:
+    return PydanticCustomError(
+        "timezone.unknown",
+        "Unknown time zone. Use an IANA name such as 'Europe/Berlin'."
+    )
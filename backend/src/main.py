@@ -1,11 +1,14 @@
 import json
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 import os
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", "..", ".env"), override=False)
 
-from fastapi import FastAPI, APIRouter, Depends, Form, HTTPException, UploadFile, Query
+from fastapi import FastAPI, APIRouter, Depends, Form, HTTPException, UploadFile, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Annotated
 
@@ -18,11 +21,45 @@ from .models.trade.trade_list_query import TradeListQuery
 from .models.trade.trade_list_response import TradeListResponse
 from .models.trade.trade_facets_response import TradeFacetsResponse
 from .models.trade.trade_summary_response import TradeSummaryResponse
+from .models.trade.trade_analytics_response import TradeAnalyticsResponse
+from .models.trade.trade_equity_curve_response import TradeEquityCurveResponse
+from .models.trade.trade_pnl_buckets_response import TradePnlBucketsResponse
+from .models.trade.trade_breakdown_response import TradeBreakdownResponse
+from .models.trade.trade_r_multiple_histogram_response import TradeRMultipleHistogramResponse
 from .domain.trade.enums import TradeType
+from .services.trade_write_service import apply_trade_changes, invalidate_trade_caches
+from .services.trade_result_cache import facets_cache, render_cache_metrics, summary_cache
+from .services.trade_page_cache import trade_page_cache
+from .services.data_version_service import (
+    etag_matches,
+    get_data_version,
+    make_etag,
+    query_etag_parts,
+)
+from .services.trade_analytics_service import compute_trade_analytics
+from .services.equity_curve_service import DEFAULT_MAX_POINTS, compute_equity_curve
+from .services.pnl_buckets_service import compute_pnl_buckets
+from .services.trade_breakdown_service import compute_trade_breakdown
+from .services.r_multiple_histogram_service import compute_r_multiple_histogram
+from .services.trade_stream import (
+    NDJSON_MEDIA_TYPE,
+    aiter_trade_list_json,
+    aiter_trade_ndjson,
+    iter_trade_list_json,
+    iter_trade_ndjson,
+)
+from .services.trade_query_service_async import (
+    get_data_version_async,
+    get_facets_async,
+    get_summary_async,
+    get_trade_by_id_async,
+    list_trades_async,
+)
 from .services.trade_query_service import (
     get_facets,
     get_summary,
     get_trade_by_id,
+    list_query_key,
     list_trades,
 )
 from .utils.normalize_csv_row import normalize_csv_row
@@ -51,41 +88,82 @@ router = APIRouter()
 
 db_dependency = Annotated[Session, Depends(database.get_db)]
 
-def parse_trade_list_query(
+# Pure parsing, no I/O: async so it runs on the event loop for both
+# routers instead of taking a threadpool hop per request
+async def parse_trade_list_query(
     status: str | None = Query(None, pattern="^(open|closed)$"),
     symbol: str | None = None,
+    symbol_match: str = Query("contains", pattern="^(contains|prefix)$"),
     type: str | None = Query(None, pattern="^(buy|sell)$"),
     tags: list[str] | None = Query(None),
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = None,
     paginate: bool = Query(True),
-    sort_by: str = Query("opened_at", pattern="^(opened_at|closed_at|created_at)$"),
+    pnl_min: float | None = None,
+    pnl_max: float | None = None,
+    outcome: str | None = Query(None, pattern="^(win|loss)$"),
+    sort_by: str = Query("opened_at", pattern="^(opened_at|closed_at|created_at|pnl)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
+    count: str = Query("exact", pattern="^(exact|estimated|none|has_more)$"),
 ) -> TradeListQuery:
     trade_type = TradeType(type) if type else None
     return TradeListQuery(
         status=status,  # type: ignore[arg-type]
         symbol=symbol,
+        symbol_match=symbol_match,  # type: ignore[arg-type]
         type=trade_type,
         tags=tags,
         date_from=date_from,
         date_to=date_to,
         limit=limit,
         offset=offset,
+        cursor=cursor,
         paginate=paginate,
+        pnl_min=pnl_min,
+        pnl_max=pnl_max,
+        outcome=outcome,  # type: ignore[arg-type]
         sort_by=sort_by,  # type: ignore[arg-type]
         sort_order=sort_order,  # type: ignore[arg-type]
+        count=count,  # type: ignore[arg-type]
     )
 
 trade_list_query_dependency = Annotated[TradeListQuery, Depends(parse_trade_list_query)]
 
+# Revalidated on every use: the ETag is what makes repeat loads cheap
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def _read_etag(request: Request, user_id: int, version: int, scope: str, *parts) -> str:
+    """ETag of a trade read endpoint: the user's data version plus the
+    normalized query string and any extra `parts` the body depends on."""
+    return make_etag(scope, user_id, version, query_etag_parts(request.query_params.multi_items()), *parts)
+
+
+def _summary_minute() -> str:
+    # The 7-day window moves with the clock, so the summary tag also
+    # expires with the minute even when no trade was written
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M")
+
+
+def _not_modified(request: Request, etag: str) -> Response | None:
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL})
+    return None
+
+
+def _set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = ETAG_CACHE_CONTROL
+
 @router.post("/trades/import")
 def import_trades_from_csv(file: Annotated[UploadFile, Form()], mapping: Annotated[str, Form()], db: db_dependency, user_id: int = Depends(current_user_id)):
     content = file.file.read().decode('utf-8')
     fields_mapping = json.loads(mapping)
     csv_reader = csv.DictReader(io.StringIO(content))
+    imported_trades = []
     for index, row in enumerate(csv_reader, start=1):
         try:
             trade_import = TradeImportModel(**normalize_csv_row(row, fields_mapping))
@@ -93,6 +171,7 @@ def import_trades_from_csv(file: Annotated[UploadFile, Form()], mapping: Annotat
             db_trade = TradeORM(**trade.to_dict())
             db_trade.user_id = user_id
             db.add(db_trade)
+            imported_trades.append(trade)
         except ValidationError as e:
             db.rollback()
             raise HTTPException(status_code=400, detail=format_import_error(index, e))
@@ -105,7 +184,9 @@ def import_trades_from_csv(file: Annotated[UploadFile, Form()], mapping: Annotat
         except ValueError as e:
             db.rollback()
             raise HTTPException(status_code=400, detail=f"Row {index}: Invalid value - {str(e)}")
+    apply_trade_changes(db, user_id, added=imported_trades)
     db.commit()
+    invalidate_trade_caches(user_id)
     return {"message": "Trades imported successfully"}
 
 @router.post("/trades", response_model=TradeResponse)
@@ -115,9 +196,11 @@ def create_trade(trade_form: TradeForm, db: db_dependency, user_id: int = Depend
         db_trade = TradeORM(**trade.to_dict())
         db_trade.user_id = user_id
         db.add(db_trade)
+        apply_trade_changes(db, user_id, added=[trade])
         db.commit()
+        invalidate_trade_caches(user_id)
         db.refresh(db_trade)
-        return db_trade.to_domain()
+        return db_trade
     except ValidationError as e:
         raise HTTPException(
             status_code=422,
@@ -133,18 +216,26 @@ def create_trade(trade_form: TradeForm, db: db_dependency, user_id: int = Depend
 
 @router.put("/trades/{trade_id}", response_model=TradeResponse)
 def update_trade(trade_id: int, trade_form: TradeForm, db: db_dependency, user_id: int = Depends(current_user_id)):
-    db_trade = db.query(TradeORM).filter(TradeORM.id == trade_id, TradeORM.user_id == user_id).first()
+    db_trade = (
+        db.query(TradeORM)
+        .filter(TradeORM.id == trade_id, TradeORM.user_id == user_id)
+        .with_for_update()
+        .first()
+    )
     if db_trade is None:
         raise HTTPException(status_code=404, detail="Trade not found")
     try:
         trade = trade_form.to_trade()
+        # The stored row as is, before it is overwritten below
+        apply_trade_changes(db, user_id, added=[trade], removed=[db_trade])
         for key, value in trade.to_dict().items():
             if key == 'created_at' or key == 'id':
                 continue
             setattr(db_trade, key, value)
         db.commit()
+        invalidate_trade_caches(user_id)
         db.refresh(db_trade)
-        return db_trade.to_domain()
+        return db_trade
     except ValidationError as e:
         raise HTTPException(
             status_code=422,
@@ -159,22 +250,159 @@ def update_trade(trade_id: int, trade_form: TradeForm, db: db_dependency, user_i
         )
 
 @router.get("/trades/summary", response_model=TradeSummaryResponse)
-def read_trades_summary(db: db_dependency, user_id: int = Depends(current_user_id)):
-    return get_summary(db, user_id)
+def read_trades_summary(
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    query: trade_list_query_dependency,
+    user_id: int = Depends(current_user_id),
+):
+    etag = _read_etag(request, user_id, get_data_version(db, user_id), "summary", _summary_minute())
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    _set_etag(response, etag)
+    return get_summary(db, user_id, query)
 
 
 @router.get("/trades/facets", response_model=TradeFacetsResponse)
-def read_trades_facets(db: db_dependency, user_id: int = Depends(current_user_id)):
+def read_trades_facets(
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    user_id: int = Depends(current_user_id),
+):
+    etag = _read_etag(request, user_id, get_data_version(db, user_id), "facets")
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    _set_etag(response, etag)
     return get_facets(db, user_id)
 
 
+@router.get("/trades/analytics", response_model=TradeAnalyticsResponse)
+def read_trades_analytics(
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    query: trade_list_query_dependency,
+    user_id: int = Depends(current_user_id),
+):
+    etag = _read_etag(request, user_id, get_data_version(db, user_id), "analytics")
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    _set_etag(response, etag)
+    return compute_trade_analytics(db, user_id, query)
+
+
+@router.get("/trades/equity-curve", response_model=TradeEquityCurveResponse)
+def read_trades_equity_curve(
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    query: trade_list_query_dependency,
+    user_id: int = Depends(current_user_id),
+    max_points: int = Query(DEFAULT_MAX_POINTS, ge=10, le=10_000),
+):
+    etag = _read_etag(request, user_id, get_data_version(db, user_id), "equity-curve")
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    _set_etag(response, etag)
+    return compute_equity_curve(db, user_id, query, max_points=max_points)
+
+
+@router.get("/trades/pnl-buckets", response_model=TradePnlBucketsResponse)
+def read_trades_pnl_buckets(
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    query: trade_list_query_dependency,
+    user_id: int = Depends(current_user_id),
+    granularity: str = Query("month", pattern="^(day|week|month)$"),
+    tz: str = "UTC",
+):
+    etag = _read_etag(request, user_id, get_data_version(db, user_id), "pnl-buckets")
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    _set_etag(response, etag)
+    return compute_pnl_buckets(
+        db,
+        user_id,
+        query,
+        granularity=granularity,  # type: ignore[arg-type]
+        tz=tz,
+    )
+
+
+@router.get("/trades/breakdown", response_model=TradeBreakdownResponse)
+def read_trades_breakdown(
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    query: trade_list_query_dependency,
+    user_id: int = Depends(current_user_id),
+    top: int | None = Query(None, ge=1, le=1000),
+):
+    etag = _read_etag(request, user_id, get_data_version(db, user_id), "breakdown")
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    _set_etag(response, etag)
+    return compute_trade_breakdown(db, user_id, query, top=top)
+
+
+@router.get("/trades/r-multiples", response_model=TradeRMultipleHistogramResponse)
+def read_trades_r_multiples(
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    query: trade_list_query_dependency,
+    user_id: int = Depends(current_user_id),
+    edges: list[float] | None = Query(None),
+):
+    etag = _read_etag(request, user_id, get_data_version(db, user_id), "r-multiples")
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    _set_etag(response, etag)
+    return compute_r_multiple_histogram(db, user_id, query, edges=edges)
+
+
 @router.get("/trades", response_model=TradeListResponse)
 def read_trades(
+    request: Request,
     db: db_dependency,
     query: trade_list_query_dependency,
     user_id: int = Depends(current_user_id),
+    stream: str | None = Query(None, pattern="^(json|ndjson)$"),
 ):
-    return list_trades(db, user_id, query)
+    version = get_data_version(db, user_id)
+    etag = _read_etag(request, user_id, version, "trades")
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    headers = {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+
+    # paginate=false can be streamed from a server-side cursor instead of
+    # being built in memory: "json" keeps the TradeListResponse shape,
+    # "ndjson" writes one trade per line
+    if stream and not query.paginate:
+        if stream == "ndjson":
+            return StreamingResponse(
+                iter_trade_ndjson(db, user_id, query),
+                media_type=NDJSON_MEDIA_TYPE,
+                headers=headers,
+            )
+        return StreamingResponse(
+            iter_trade_list_json(db, user_id, query),
+            media_type="application/json",
+            headers=headers,
+        )
+
+    # Items are built from persisted rows without validation; return the
+    # encoded body directly so FastAPI doesn't validate the page again.
+    # Encoded pages are cached per data version, so a hit is just bytes
+    key = list_query_key(query)
+    body = trade_page_cache.get("trades", user_id, version, key)
+    if body is None:
+        body = list_trades(db, user_id, query).model_dump_json().encode()
+        trade_page_cache.set("trades", user_id, version, key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/trades/{trade_id}", response_model=TradeResponse)
@@ -182,19 +410,117 @@ def read_trade(trade_id: int, db: db_dependency, user_id: int = Depends(current_
     db_trade = get_trade_by_id(db, user_id, trade_id)
     if db_trade is None:
         raise HTTPException(status_code=404, detail="Trade not found")
-    return db_trade.to_domain().__dict__
+    return db_trade
 
 
 @router.delete("/trades/{trade_id}")
 def delete_trade(trade_id: int, db: db_dependency, user_id: int = Depends(current_user_id)):
-    trade = db.query(TradeORM).filter(TradeORM.id == trade_id, TradeORM.user_id == user_id).first()
+    trade = (
+        db.query(TradeORM)
+        .filter(TradeORM.id == trade_id, TradeORM.user_id == user_id)
+        .with_for_update()
+        .first()
+    )
     if trade is None:
         raise HTTPException(status_code=404, detail="Trade not found")
+    apply_trade_changes(db, user_id, removed=[trade])
     db.delete(trade)
     db.commit()
+    invalidate_trade_caches(user_id)
     return {"message": "Trade deleted successfully"}
 
+# Event-loop handlers on AsyncSession (DB_STACK=async). Registered ahead
+# of `router`, so they shadow the sync handlers of the same paths; routes
+# not listed here keep running in the threadpool until they migrate.
+async_router = APIRouter()
+
+async_db_dependency = Annotated[AsyncSession, Depends(database.get_async_db)]
+
+
+@async_router.get("/trades/summary", response_model=TradeSummaryResponse)
+async def read_trades_summary_async(
+    request: Request,
+    response: Response,
+    db: async_db_dependency,
+    query: trade_list_query_dependency,
+    user_id: int = Depends(current_user_id),
+):
+    version = await get_data_version_async(db, user_id)
+    etag = _read_etag(request, user_id, version, "summary", _summary_minute())
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    _set_etag(response, etag)
+    return await get_summary_async(db, user_id, query)
+
+
+@async_router.get("/trades/facets", response_model=TradeFacetsResponse)
+async def read_trades_facets_async(
+    request: Request,
+    response: Response,
+    db: async_db_dependency,
+    user_id: int = Depends(current_user_id),
+):
+    etag = _read_etag(request, user_id, await get_data_version_async(db, user_id), "facets")
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    _set_etag(response, etag)
+    return await get_facets_async(db, user_id)
+
+
+@async_router.get("/trades", response_model=TradeListResponse)
+async def read_trades_async(
+    request: Request,
+    db: async_db_dependency,
+    query: trade_list_query_dependency,
+    user_id: int = Depends(current_user_id),
+    stream: str | None = Query(None, pattern="^(json|ndjson)$"),
+):
+    version = await get_data_version_async(db, user_id)
+    etag = _read_etag(request, user_id, version, "trades")
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    headers = {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+
+    if stream and not query.paginate:
+        if stream == "ndjson":
+            return StreamingResponse(
+                aiter_trade_ndjson(db, user_id, query),
+                media_type=NDJSON_MEDIA_TYPE,
+                headers=headers,
+            )
+        return StreamingResponse(
+            aiter_trade_list_json(db, user_id, query),
+            media_type="application/json",
+            headers=headers,
+        )
+
+    key = list_query_key(query)
+    body = trade_page_cache.get("trades", user_id, version, key)
+    if body is None:
+        body = (await list_trades_async(db, user_id, query)).model_dump_json().encode()
+        trade_page_cache.set("trades", user_id, version, key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# `:int` so paths like /trades/analytics fall through to `router`
+@async_router.get("/trades/{trade_id:int}", response_model=TradeResponse)
+async def read_trade_async(trade_id: int, db: async_db_dependency, user_id: int = Depends(current_user_id)):
+    db_trade = await get_trade_by_id_async(db, user_id, trade_id)
+    if db_trade is None:
+        raise HTTPException(status_code=404, detail="Trade not found")
+    return db_trade
+
+
+# Scrape target for the per-process cache counters (no per-user data)
+@app.get("/metrics", include_in_schema=False, response_class=PlainTextResponse)
+def read_metrics():
+    return render_cache_metrics(
+        (summary_cache, facets_cache, auth_routes.user_info_cache, trade_page_cache)
+    )
+
 app.include_router(auth_routes.router, prefix="/api/v1")
+if database.DB_STACK == "async":
+    app.include_router(async_router, prefix="/api/v1")
 app.include_router(router, prefix="/api/v1")
 
 ErrorsHandlerService.register_exception_handlers(app)
\ No newline at end of file
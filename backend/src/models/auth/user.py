@@ -14,4 +14,10 @@ class UserResponse(BaseModel):
     username: str
     email: EmailStr
     is_active: bool
-    is_verified: bool
\ No newline at end of file
+    is_verified: bool
+
+class UserProfile(BaseModel):
+    """The cacheable part of UserResponse; only active users are cached."""
+    username: str
+    email: EmailStr
+    is_verified: bool
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+
+
+class TradeAnalyticsResponse(BaseModel):
+    """Dashboard statistics over the closed trades matching the filters."""
+
+    closed_trades: int
+    winrate: float
+    average_win: float
+    average_loss: float
+    # None when there are winning trades but no losing ones
+    profit_factor: float | None
+    expectancy: float
+    best_trade: float | None
+    worst_trade: float | None
+    gross_profit: float
+    gross_loss: float
+    max_win_streak: int
+    max_loss_streak: int
+    average_duration_seconds: float
+    # Both negative (or 0), like the dashboard shows them
+    max_drawdown: float
+    max_drawdown_pct: float
+    # Mean realized R multiple over trades with a stop loss
+    average_risk_reward: float | None
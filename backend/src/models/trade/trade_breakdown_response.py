@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+
+class TradeGroupStats(BaseModel):
+    # Upper-cased symbol, "buy"/"sell", or tag
+    key: str
+    trade_count: int
+    closed_trades: int
+    win_count: int
+    # Share of closed trades with positive PnL
+    winrate: float
+    realized_pnl: float
+    volume: float
+    # realized_pnl per closed trade
+    average_pnl: float
+
+
+class TradeBreakdownResponse(BaseModel):
+    """Per-group statistics, each list ordered by volume (largest first)."""
+
+    by_symbol: list[TradeGroupStats]
+    by_side: list[TradeGroupStats]
+    by_tag: list[TradeGroupStats]
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class EquityCurvePoint(BaseModel):
+    trade_id: int
+    closed_at: datetime
+    # Cumulative closed PnL after this trade
+    equity: float
+    # equity minus its running peak (the peak starts at 0); <= 0
+    drawdown: float
+
+
+class TradeEquityCurveResponse(BaseModel):
+    points: list[EquityCurvePoint]
+    # Closed trades on the full-resolution curve, before downsampling
+    total_points: int
+    max_drawdown: float
@@ -1,6 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TradeFacetsResponse(BaseModel):
     symbols: list[str]
     tags: list[str]
+    # Number of trades per facet value, for the filter UI
+    symbol_counts: dict[str, int] = Field(default_factory=dict)
+    tag_counts: dict[str, int] = Field(default_factory=dict)
@@ -9,6 +9,9 @@ from ...domain.trade.enums import TradeType
 class TradeListQuery(BaseModel):
     status: Literal["open", "closed"] | None = None
     symbol: str | None = None
+    # contains: substring match (trigram index); prefix: starts-with match
+    # (text_pattern_ops index)
+    symbol_match: Literal["contains", "prefix"] = "contains"
     type: TradeType | None = None
     tags: list[str] | None = None
     # Accept YYYY-MM-DD or full ISO datetime; normalized in trade_query_service
@@ -16,6 +19,16 @@ class TradeListQuery(BaseModel):
     date_to: str | date | None = None
     limit: int = Field(50, ge=1, le=200)
     offset: int = Field(0, ge=0)
+    # Opaque keyset cursor from a previous page; takes precedence over offset
+    cursor: str | None = None
     paginate: bool = True
-    sort_by: Literal["opened_at", "closed_at", "created_at"] = "opened_at"
+    # Realized PnL range (inclusive) and sign; open trades never match
+    pnl_min: float | None = None
+    pnl_max: float | None = None
+    outcome: Literal["win", "loss"] | None = None
+    sort_by: Literal["opened_at", "closed_at", "created_at", "pnl"] = "opened_at"
     sort_order: Literal["asc", "desc"] = "desc"
+    # exact: COUNT(*) (cached briefly per user); estimated: planner row
+    # estimate; none: skip counting; has_more: only report whether a next
+    # page exists
+    count: Literal["exact", "estimated", "none", "has_more"] = "exact"
@@ -5,6 +5,11 @@ from .trade_response import TradeResponse
 
 class TradeListResponse(BaseModel):
     items: list[TradeResponse]
-    total: int
+    # None when the request opted out of counting (count=none|has_more)
+    total: int | None
     limit: int | None = None
-    offset: int
+    # None on cursor (keyset) pages, where an offset has no meaning
+    offset: int | None
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    has_more: bool | None = None
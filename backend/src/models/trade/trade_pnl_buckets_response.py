@@ -0,0 +1,20 @@
+from datetime import date
+from typing import Literal
+
+from pydantic import BaseModel
+
+PnlGranularity = Literal["day", "week", "month"]
+
+
+class PnlBucket(BaseModel):
+    # First day of the bucket in the requested time zone (weeks start on Monday)
+    period_start: date
+    pnl: float
+    trade_count: int
+    win_count: int
+
+
+class TradePnlBucketsResponse(BaseModel):
+    granularity: PnlGranularity
+    tz: str
+    buckets: list[PnlBucket]
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class HistogramBin(BaseModel):
+    # None on the open-ended first/last bins; bins are [lower, upper)
+    lower: float | None
+    upper: float | None
+    count: int
+
+
+class TradeRMultipleHistogramResponse(BaseModel):
+    edges: list[float]
+    bins: list[HistogramBin]
+    # Closed trades with a stop loss that were binned
+    total: int
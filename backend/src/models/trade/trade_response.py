@@ -18,6 +18,8 @@ class TradeResponse(BaseModel):
     closed_at: Optional[datetime]
     comment: Optional[str]
     tags: Optional[list[str]] = None
+    realized_pnl: Optional[float] = None
+    pnl_pct: Optional[float] = None
 
     class Config:
         from_attributes = True  # чтобы можно было конвертить из ORM/объектов
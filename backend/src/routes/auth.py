@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, Cookie, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 from typing import Annotated
 from datetime import datetime, timezone
 
@@ -16,15 +17,46 @@ from ..auth import (
     create_email_verification_token
 )
 from ..domain import UserDomain
-from ..models import UserCreate, UserLogin, UserResponse, VerifyEmailRequest, ForgotPasswordRequest, ResetPasswordRequest
+from ..models import UserCreate, UserLogin, UserProfile, UserResponse, VerifyEmailRequest, ForgotPasswordRequest, ResetPasswordRequest
 from ..db import UserORM, RefreshTokenORM, EmailVerificationTokenORM, PasswordResetTokenORM
 from ..services import email_service
+from ..services.shared_cache import model_codec
+from ..services.trade_result_cache import build_result_cache
 from .. import database
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 db_dependency = Annotated[Session, Depends(database.get_db)]
 
+# /auth/me profile of active users only, so a hit also stands for "exists
+# and is active". Any update or delete of the user row (deactivation,
+# password change, email verification) and logout drop the entry; the
+# short TTL bounds changes made outside this app's sessions.
+USER_INFO_CACHE_TTL_SEC = 30
+user_info_cache = build_result_cache("users", model_codec(UserProfile), ttl_sec=USER_INFO_CACHE_TTL_SEC)
+
+_STALE_USER_INFO = "stale_user_info"
+
+
+@event.listens_for(UserORM, "after_update")
+@event.listens_for(UserORM, "after_delete")
+def _mark_user_info_stale(mapper, connection, target: UserORM) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_STALE_USER_INFO, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_user_info(session: Session) -> None:
+    # After commit, so a concurrent /me can't re-cache the old row
+    for user_id in session.info.pop(_STALE_USER_INFO, ()):
+        user_info_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_stale_user_info(session: Session) -> None:
+    session.info.pop(_STALE_USER_INFO, None)
+
 
 @router.post("/signup")
 async def signup(
@@ -179,21 +211,33 @@ def get_current_user_info(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid or expired tokens")
     
-    db_user = db.query(UserORM).filter(UserORM.id == user_id).first()
-    if not db_user or not db_user.is_active:
-        raise HTTPException(status_code=401, detail="User not found or inactive")
+    # App initialization calls this on every load: a cached profile means
+    # the user was active when cached and hasn't changed since. Rotation
+    # issues a new refresh token, so it always reads the user live
+    profile = None if should_rotate_refresh else user_info_cache.get(user_id)
+    if profile is None:
+        db_user = db.query(UserORM).filter(UserORM.id == user_id).first()
+        if db_user is None or not db_user.is_active:
+            raise HTTPException(status_code=401, detail="User not found or inactive")
+        profile = UserProfile(
+            username=db_user.username,
+            email=db_user.email,
+            is_verified=db_user.is_verified
+        )
+        user_info_cache.set(user_id, None, profile)
+    user_info = UserResponse(id=user_id, is_active=True, **profile.model_dump())
     
     # Only rotate refresh token if access token was expired
     if should_rotate_refresh and refresh_token:
         old_token = db.query(RefreshTokenORM).filter(
             RefreshTokenORM.token == refresh_token,
-            RefreshTokenORM.user_id == db_user.id
+            RefreshTokenORM.user_id == user_id
         ).first()
         if old_token:
             old_token.revoked = True
         
         new_refresh_token = create_auth_token(user_id, "refresh")
-        db_new_refresh_token = RefreshTokenORM(token=new_refresh_token, user_id=db_user.id)
+        db_new_refresh_token = RefreshTokenORM(token=new_refresh_token, user_id=user_id)
         db.add(db_new_refresh_token)
         db.commit()
         
@@ -217,13 +261,7 @@ def get_current_user_info(
         path="/",
     )
     
-    return UserResponse(
-        id=db_user.id,
-        username=db_user.username,
-        email=db_user.email,
-        is_active=db_user.is_active,
-        is_verified=db_user.is_verified
-    )
+    return user_info
 
 
 @router.post("/refresh")
@@ -296,6 +334,7 @@ def logout(
         if db_refresh_token:
             db_refresh_token.revoked = True
             db.commit()
+            user_info_cache.invalidate_user(db_refresh_token.user_id)
     
     response.delete_cookie(key="access_token", path="/", samesite="lax")
     response.delete_cookie(key="refresh_token", path="/", samesite="lax")
@@ -0,0 +1,275 @@
+"""Key-value backends behind the shared caches (see shared_cache.py).
+
+MemoryCacheBackend keeps entries in the current process. RedisCacheBackend
+talks to a Redis-compatible server (Redis, Valkey, KeyDB) over RESP, so
+every uvicorn worker and replica sees the same entries and the same
+invalidations. It only needs GET/MGET/SET PX/INCR/DEL, implemented here
+on a small connection pool instead of pulling in a client library.
+
+Configured with CACHE_URL: unset keeps the per-process object caches,
+`memory://` or `redis://[:password@]host[:port][/db]` select a backend.
+"""
+import asyncio
+import os
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from urllib.parse import unquote, urlparse
+
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+MEMORY_BACKEND_MAX_ENTRIES = 10_000
+REDIS_TIMEOUT_SEC = 0.5
+REDIS_MAX_IDLE_CONNECTIONS = 8
+
+
+class CacheBackendError(Exception):
+    """The backend could not be reached or rejected a command."""
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> list[bytes | None]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl_sec: float) -> None: ...
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Atomically increment an integer key (created at 0) without expiry."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Process-local backend: an LRU bounded by `max_entries`.
+
+    Counters from `incr` have no expiry but take part in LRU eviction
+    like any other key.
+    """
+
+    def __init__(self, max_entries: int = MEMORY_BACKEND_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float | None, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._get(key)
+
+    def get_many(self, keys: list[str]) -> list[bytes | None]:
+        with self._lock:
+            return [self._get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl_sec: float) -> None:
+        with self._lock:
+            self._put(key, value, time.monotonic() + ttl_sec)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._get(key) or 0) + 1
+            self._put(key, str(value).encode(), None)
+            return value
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put(self, key: str, value: bytes, expires_at: float | None) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class _RespConnection:
+    def __init__(self, host: str, port: int, timeout_sec: float):
+        self._sock = socket.create_connection((host, port), timeout=timeout_sec)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+
+    def command(self, *args: str | bytes | int):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed by the cache server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload
+        if kind == b"-":
+            raise CacheBackendError(payload.decode(errors="replace"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return self._reader.read(length + 2)[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"unexpected reply from the cache server: {line!r}")
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Backend on a Redis-compatible server, shared by all processes.
+
+    Connections are pooled per process; one that fails mid-command is
+    dropped and the error surfaces as CacheBackendError, which callers
+    treat as a cache miss. Run the server with a `volatile-*` eviction
+    policy so the TTL-less invalidation counters are never evicted.
+
+    Commands issued from AsyncSession.run_sync (the DB_STACK=async
+    handlers) run on the event loop thread; there the blocking round
+    trip is handed to a worker thread and awaited through SQLAlchemy's
+    greenlet bridge, so the loop keeps serving other requests.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: str | None = None,
+        timeout_sec: float = REDIS_TIMEOUT_SEC,
+        max_idle_connections: int = REDIS_MAX_IDLE_CONNECTIONS,
+    ):
+        self._host = host
+        self._port = port
+        self._db = db
+        self._password = password
+        self._timeout_sec = timeout_sec
+        self._max_idle_connections = max_idle_connections
+        self._idle: list[_RespConnection] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisCacheBackend":
+        parsed = urlparse(url)
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(parsed.path.lstrip("/") or 0),
+            password=unquote(parsed.password) if parsed.password else None,
+            **kwargs,
+        )
+
+    def get(self, key: str) -> bytes | None:
+        return self._command("GET", key)
+
+    def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return self._command("MGET", *keys)
+
+    def set(self, key: str, value: bytes, ttl_sec: float) -> None:
+        self._command("SET", key, value, "PX", max(1, int(ttl_sec * 1000)))
+
+    def incr(self, key: str) -> int:
+        return self._command("INCR", key)
+
+    def delete(self, key: str) -> None:
+        self._command("DEL", key)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def _command(self, *args):
+        if in_greenlet():
+            return await_only(asyncio.to_thread(self._blocking_command, *args))
+        return self._blocking_command(*args)
+
+    def _blocking_command(self, *args):
+        connection = self._acquire()
+        try:
+            reply = connection.command(*args)
+        except CacheBackendError:
+            self._release(connection)
+            raise
+        except (OSError, ValueError) as e:
+            connection.close()
+            raise CacheBackendError(str(e)) from e
+        self._release(connection)
+        return reply
+
+    def _acquire(self) -> _RespConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            connection = _RespConnection(self._host, self._port, self._timeout_sec)
+        except OSError as e:
+            raise CacheBackendError(str(e)) from e
+        try:
+            if self._password:
+                connection.command("AUTH", self._password)
+            if self._db:
+                connection.command("SELECT", self._db)
+        except (CacheBackendError, OSError, ValueError) as e:
+            connection.close()
+            raise CacheBackendError(str(e)) from e
+        return connection
+
+    def _release(self, connection: _RespConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self._max_idle_connections:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+
+def create_cache_backend(url: str) -> CacheBackend:
+    scheme = urlparse(url).scheme
+    if scheme == "memory":
+        return MemoryCacheBackend()
+    if scheme in ("redis", "valkey"):
+        return RedisCacheBackend.from_url(url)
+    raise ValueError(f"Unsupported CACHE_URL scheme: {scheme!r}")
+
+
+_shared_backend: CacheBackend | None = None
+_shared_backend_lock = threading.Lock()
+
+
+def shared_cache_backend() -> CacheBackend | None:
+    """Backend selected by CACHE_URL, created once per process; None if unset."""
+    global _shared_backend
+    url = os.getenv("CACHE_URL")
+    if not url:
+        return None
+    with _shared_backend_lock:
+        if _shared_backend is None:
+            _shared_backend = create_cache_backend(url)
+        return _shared_backend
@@ -0,0 +1,58 @@
+import hashlib
+import json
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..db import UserDataVersionORM
+from .sql_dialect import upsert_insert
+
+
+def bump_data_version(db: Session, user_id: int) -> None:
+    """Advance the user's data version in the caller's transaction."""
+    statement = upsert_insert(db)(UserDataVersionORM).values(user_id=user_id, version=1)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[UserDataVersionORM.user_id],
+            set_={"version": UserDataVersionORM.version + 1},
+        )
+    )
+
+
+def get_data_version(db: Session, user_id: int) -> int:
+    """Current data version; a primary-key read, 0 before the first write."""
+    version = db.execute(
+        select(UserDataVersionORM.version).where(UserDataVersionORM.user_id == user_id)
+    ).scalar()
+    return version or 0
+
+
+def make_etag(scope: str, user_id: int, version: int, *parts) -> str:
+    """Weak ETag for a response derived from (user, data version, parts).
+
+    `parts` carry whatever else the body depends on (normalized query
+    params, a time bucket); they are hashed so the tag stays short.
+    """
+    digest = hashlib.sha256(
+        json.dumps([scope, user_id, *parts], default=str).encode()
+    ).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match check with weak comparison (RFC 9110 §13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def query_etag_parts(items: Iterable[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Order-insensitive form of the request's query parameters."""
+    return sorted(items)
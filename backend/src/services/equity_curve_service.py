@@ -0,0 +1,154 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..db import TradeORM
+from ..models.trade.trade_equity_curve_response import (
+    EquityCurvePoint,
+    TradeEquityCurveResponse,
+)
+from ..models.trade.trade_list_query import TradeListQuery
+from .trade_query_service import STREAM_CHUNK_SIZE, build_filtered_query
+from .trade_sql_metrics import absolute_pnl_expr
+
+DEFAULT_MAX_POINTS = 1000
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> list[int]:
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that
+    keep the visual shape of the series.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previous
+    pick and the average of the next bucket.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        next_count = next_end - end
+        avg_x = sum(xs[end:next_end]) / next_count
+        avg_y = sum(ys[end:next_end]) / next_count
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def _max_drawdown_indices(
+    drawdown: Sequence[float],
+    peaks: Sequence[int | None],
+) -> list[int]:
+    """Trough of the deepest drawdown and the peak it fell from."""
+    if not drawdown:
+        return []
+    trough = min(range(len(drawdown)), key=drawdown.__getitem__)
+    if drawdown[trough] >= 0:
+        return []
+    peak = peaks[trough]
+    if peak is None:
+        # Peak was the starting balance, before the first trade
+        return [trough]
+    return [peak, trough]
+
+
+def downsample_indices(
+    xs: Sequence[float],
+    equity: Sequence[float],
+    drawdown: Sequence[float],
+    peaks: Sequence[int | None],
+    max_points: int,
+) -> list[int]:
+    """LTTB over the equity curve that always keeps the max drawdown.
+
+    `peaks[i]` is the index of the running peak at point i (None while
+    it is still the starting balance). LTTB picks points by area and can
+    skip the exact peak/trough of the worst drawdown; two slots are
+    reserved for them so the chart never understates it.
+    """
+    if len(xs) <= max_points:
+        return list(range(len(xs)))
+    extremes = _max_drawdown_indices(drawdown, peaks)
+    picked = set(lttb_indices(xs, equity, max(max_points - len(extremes), 3)))
+    picked.update(extremes)
+    return sorted(picked)
+
+
+def compute_equity_curve(
+    db: Session,
+    user_id: int,
+    query_params: TradeListQuery,
+    max_points: int = DEFAULT_MAX_POINTS,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> TradeEquityCurveResponse:
+    """Cumulative closed PnL of the filtered trades, ordered by closed_at.
+
+    Running equity is a window function over the filtered query; only
+    (id, time, equity) rows come back. The running peak (and where it
+    was reached) is tracked while streaming them, and the curve is
+    reduced to at most `max_points` points.
+    """
+    order = (TradeORM.closed_at.asc(), TradeORM.id.asc())
+    trades = (
+        build_filtered_query(db, user_id, query_params)
+        .filter(TradeORM.closed_at.isnot(None), TradeORM.close_price.isnot(None))
+        .order_by(None)
+        .with_entities(
+            TradeORM.id.label("id"),
+            TradeORM.closed_at.label("closed_at"),
+            func.sum(absolute_pnl_expr()).over(order_by=order).label("equity"),
+        )
+        .subquery()
+    )
+    statement = select(trades.c.id, trades.c.closed_at, trades.c.equity).order_by(
+        trades.c.closed_at.asc(), trades.c.id.asc()
+    )
+
+    ids: list[int] = []
+    times: list[datetime] = []
+    equity: list[float] = []
+    drawdown: list[float] = []
+    peaks: list[int | None] = []
+    peak_value, peak_index = 0.0, None  # the starting balance
+    result = db.execute(statement, execution_options={"yield_per": chunk_size})
+    for rows in result.partitions():
+        for trade_id, closed_at, value in rows:
+            if value >= peak_value:
+                peak_value, peak_index = value, len(equity)
+            ids.append(trade_id)
+            times.append(closed_at)
+            equity.append(value)
+            drawdown.append(value - peak_value)
+            peaks.append(peak_index)
+
+    xs = [closed_at.timestamp() for closed_at in times]
+    indices = downsample_indices(xs, equity, drawdown, peaks, max_points)
+    return TradeEquityCurveResponse(
+        points=[
+            EquityCurvePoint(
+                trade_id=ids[i],
+                closed_at=times[i],
+                equity=equity[i],
+                drawdown=drawdown[i],
+            )
+            for i in indices
+        ],
+        total_points=len(ids),
+        max_drawdown=min(drawdown, default=0.0),
+    )
@@ -0,0 +1,122 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import Date, case, cast, func, select
+from sqlalchemy.orm import Query, Session
+
+from ..db import TradeORM
+from ..errors.timezone_errors import unknown_timezone_error
+from ..models.trade.trade_list_query import TradeListQuery
+from ..models.trade.trade_pnl_buckets_response import (
+    PnlBucket,
+    PnlGranularity,
+    TradePnlBucketsResponse,
+)
+from .sql_dialect import dialect_name
+from .trade_query_service import STREAM_CHUNK_SIZE, build_filtered_query
+from .trade_sql_metrics import absolute_pnl_expr
+
+
+def _zone(tz: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise unknown_timezone_error()
+
+
+def period_start(value: datetime, granularity: PnlGranularity, zone: ZoneInfo) -> date:
+    """Local calendar day/ISO week/month that `value` falls into."""
+    local_day = value.astimezone(zone).date()
+    if granularity == "week":
+        return local_day - timedelta(days=local_day.weekday())
+    if granularity == "month":
+        return local_day.replace(day=1)
+    return local_day
+
+
+def _closed_trades(db: Session, user_id: int, query_params: TradeListQuery) -> Query:
+    return (
+        build_filtered_query(db, user_id, query_params)
+        .filter(TradeORM.closed_at.isnot(None), TradeORM.close_price.isnot(None))
+        .order_by(None)
+    )
+
+
+def _buckets_sql(
+    db: Session,
+    query: Query,
+    granularity: PnlGranularity,
+    tz: str,
+) -> list[PnlBucket]:
+    """Postgres: date_trunc on closed_at shifted into the requested zone.
+
+    The truncation is computed in a subquery and grouped by its column;
+    grouping by the expression itself would repeat its bind parameters,
+    which Postgres does not recognise as the same expression.
+    """
+    trades = query.with_entities(
+        cast(
+            func.date_trunc(granularity, func.timezone(tz, TradeORM.closed_at)), Date
+        ).label("period_start"),
+        absolute_pnl_expr().label("pnl"),
+    ).subquery()
+    statement = (
+        select(
+            trades.c.period_start,
+            func.sum(trades.c.pnl),
+            func.count(),
+            func.sum(case((trades.c.pnl > 0, 1), else_=0)),
+        )
+        .group_by(trades.c.period_start)
+        .order_by(trades.c.period_start)
+    )
+    return [
+        PnlBucket(period_start=start, pnl=total, trade_count=count, win_count=wins)
+        for start, total, count, wins in db.execute(statement)
+    ]
+
+
+def _buckets_python(
+    db: Session,
+    query: Query,
+    granularity: PnlGranularity,
+    zone: ZoneInfo,
+    chunk_size: int,
+) -> list[PnlBucket]:
+    """Fallback for databases without date_trunc/time zone support (SQLite)."""
+    totals: dict[date, list] = defaultdict(lambda: [0.0, 0, 0])
+    statement = query.with_entities(TradeORM.closed_at, absolute_pnl_expr()).statement
+    result = db.execute(statement, execution_options={"yield_per": chunk_size})
+    for rows in result.partitions():
+        for closed_at, pnl in rows:
+            bucket = totals[period_start(closed_at, granularity, zone)]
+            bucket[0] += pnl
+            bucket[1] += 1
+            bucket[2] += pnl > 0
+    return [
+        PnlBucket(period_start=start, pnl=total, trade_count=count, win_count=wins)
+        for start, (total, count, wins) in sorted(totals.items())
+    ]
+
+
+def compute_pnl_buckets(
+    db: Session,
+    user_id: int,
+    query_params: TradeListQuery,
+    granularity: PnlGranularity = "month",
+    tz: str = "UTC",
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> TradePnlBucketsResponse:
+    """Closed PnL of the filtered trades per day/week/month of closed_at.
+
+    Buckets follow the calendar of `tz` (an IANA zone name); periods
+    without closed trades are omitted.
+    """
+    zone = _zone(tz)
+    query = _closed_trades(db, user_id, query_params)
+    if dialect_name(db) == "postgresql":
+        buckets = _buckets_sql(db, query, granularity, tz)
+    else:
+        buckets = _buckets_python(db, query, granularity, zone, chunk_size)
+    return TradePnlBucketsResponse(granularity=granularity, tz=tz, buckets=buckets)
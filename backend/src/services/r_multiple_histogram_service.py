@@ -0,0 +1,96 @@
+import math
+from collections.abc import Sequence
+
+from sqlalchemy import Float, and_, case, cast, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.orm import Session
+
+from ..db import TradeORM
+from ..errors.histogram_errors import invalid_bin_edges_error
+from ..models.trade.trade_list_query import TradeListQuery
+from ..models.trade.trade_r_multiple_histogram_response import (
+    HistogramBin,
+    TradeRMultipleHistogramResponse,
+)
+from .sql_dialect import dialect_name
+from .trade_query_service import build_filtered_query
+from .trade_sql_metrics import absolute_pnl_expr
+
+# Bin edges of the dashboard's risk/reward distribution chart
+DEFAULT_R_EDGES = (-4.0, -2.0, -1.2, -0.8, 0.8, 1.2, 2.0, 4.0)
+MAX_EDGES = 50
+
+
+def validate_edges(edges: Sequence[float] | None) -> list[float]:
+    if not edges:
+        return list(DEFAULT_R_EDGES)
+    edges = [float(edge) for edge in edges]
+    if (
+        len(edges) > MAX_EDGES
+        or not all(math.isfinite(edge) for edge in edges)
+        or any(a >= b for a, b in zip(edges, edges[1:]))
+    ):
+        raise invalid_bin_edges_error()
+    return edges
+
+
+def planned_risk_expr():
+    """Loss at the stop: |stop_loss - open_price| * quantity."""
+    return func.abs(TradeORM.stop_loss - TradeORM.open_price) * TradeORM.quantity
+
+
+def _bucket_expr(dialect: str, value, edges: list[float]):
+    """Bin number of `value`: 0 below edges[0], i for [edges[i-1], edges[i]),
+    len(edges) from the last edge up."""
+    if dialect == "postgresql":
+        return func.width_bucket(value, cast(array(edges), ARRAY(Float)))
+    return case(
+        *((value < edge, index) for index, edge in enumerate(edges)),
+        else_=len(edges),
+    )
+
+
+def compute_r_multiple_histogram(
+    db: Session,
+    user_id: int,
+    query_params: TradeListQuery,
+    edges: Sequence[float] | None = None,
+) -> TradeRMultipleHistogramResponse:
+    """Histogram of realized R multiples (PnL / planned risk) for the
+    filtered closed trades that have a stop loss.
+
+    R multiples and bin numbers are computed in SQL (width_bucket on
+    Postgres, an equivalent CASE elsewhere) and only per-bin counts come
+    back.
+    """
+    edges = validate_edges(edges)
+    risk = planned_risk_expr()
+    trades = (
+        build_filtered_query(db, user_id, query_params)
+        .filter(
+            TradeORM.closed_at.isnot(None),
+            TradeORM.close_price.isnot(None),
+            and_(TradeORM.stop_loss.isnot(None), risk > 0),
+        )
+        .order_by(None)
+        .with_entities((absolute_pnl_expr() / risk).label("r_multiple"))
+        .subquery()
+    )
+    binned = select(
+        _bucket_expr(dialect_name(db), trades.c.r_multiple, edges).label("bucket")
+    ).subquery()
+    statement = select(binned.c.bucket, func.count()).group_by(binned.c.bucket)
+
+    counts = [0] * (len(edges) + 1)
+    for bucket, count in db.execute(statement):
+        counts[bucket] = count
+
+    bounds = [None, *edges, None]
+    return TradeRMultipleHistogramResponse(
+        edges=edges,
+        bins=[
+            HistogramBin(lower=bounds[i], upper=bounds[i + 1], count=count)
+            for i, count in enumerate(counts)
+        ],
+        total=sum(counts),
+    )
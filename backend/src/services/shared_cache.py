@@ -0,0 +1,171 @@
+"""Per-user caches stored in a CacheBackend, shared across processes.
+
+SharedResultCache has the same get/set/invalidate_user interface as the
+in-process TradeResultCache, so summary, facets, count and auth lookups
+can move onto a shared backend without changing their call sites.
+
+Invalidation fans out through version keys rather than messages: every
+data key embeds the namespace epoch and the user's generation, and
+`invalidate_user` / `clear` just INCR those counters. Other processes
+read the new counter on their next lookup (one MGET), and entries under
+old generations are never read again and expire by TTL.
+"""
+import hashlib
+import logging
+import time
+from collections.abc import Callable, Hashable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+
+from .cache_backend import CacheBackend, CacheBackendError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "logitrades"
+
+
+@dataclass(frozen=True, slots=True)
+class CacheCodec:
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+
+
+INT_CODEC = CacheCodec(encode=lambda value: str(value).encode(), decode=int)
+
+
+def model_codec(model: type[BaseModel]) -> CacheCodec:
+    return CacheCodec(
+        encode=lambda value: value.model_dump_json().encode(),
+        decode=model.model_validate_json,
+    )
+
+
+def key_digest(key: Hashable) -> str:
+    """Stable short form of a cache key tuple (repr of str/int/date parts)."""
+    return hashlib.sha256(repr(key).encode()).hexdigest()[:24]
+
+
+class SharedResultCache:
+    """Per-user cache on a CacheBackend (see module docstring).
+
+    Backend failures are logged and count as misses, so an unreachable
+    cache server slows requests down but never fails them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: CacheBackend,
+        codec: CacheCodec,
+        ttl_sec: float,
+    ):
+        self.name = name
+        self._backend = backend
+        self._codec = codec
+        self._ttl_sec = ttl_sec
+        # Counters seen by this request's last miss, see `set`
+        self._missed: ContextVar[tuple | None] = ContextVar(f"{name}_cache_missed", default=None)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def get(self, user_id: int, key: Hashable = None) -> Any | None:
+        try:
+            counters = self._counters(user_id)
+            data = self._backend.get(self._data_key(user_id, key, *counters))
+        except CacheBackendError as e:
+            self._failed("get", e)
+            self.misses += 1
+            return None
+        if data is None:
+            self._missed.set((user_id, key, counters))
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._codec.decode(data)
+
+    def set(
+        self,
+        user_id: int,
+        key: Hashable,
+        value: Any,
+        expires_at: float | None = None,
+    ) -> None:
+        """Store `value`; `expires_at` (time.monotonic() based) can only
+        shorten the TTL."""
+        ttl_sec = self._ttl_sec
+        if expires_at is not None:
+            ttl_sec = min(ttl_sec, expires_at - time.monotonic())
+        if ttl_sec <= 0:
+            return
+        # Store under the counters seen before the value was computed: if
+        # a write committed meanwhile, the entry lands under the old
+        # generation and is never read
+        missed = self._missed.get()
+        self._missed.set(None)
+        try:
+            if missed is not None and missed[:2] == (user_id, key):
+                counters = missed[2]
+            else:
+                counters = self._counters(user_id)
+            self._backend.set(
+                self._data_key(user_id, key, *counters),
+                self._codec.encode(value),
+                ttl_sec,
+            )
+        except CacheBackendError as e:
+            self._failed("set", e)
+
+    def invalidate_user(self, user_id: int) -> None:
+        try:
+            self._backend.incr(self._generation_key(user_id))
+            self.invalidations += 1
+        except CacheBackendError as e:
+            self._failed("invalidate", e)
+
+    def clear(self) -> None:
+        """Drop every user's entries, in all processes."""
+        try:
+            self._backend.incr(self._epoch_key())
+        except CacheBackendError as e:
+            self._failed("clear", e)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+    def _counters(self, user_id: int) -> tuple[bytes | None, bytes | None]:
+        epoch, generation = self._backend.get_many(
+            [self._epoch_key(), self._generation_key(user_id)]
+        )
+        return epoch, generation
+
+    def _epoch_key(self) -> str:
+        return f"{KEY_PREFIX}:{self.name}:epoch"
+
+    def _generation_key(self, user_id: int) -> str:
+        return f"{KEY_PREFIX}:{self.name}:gen:{user_id}"
+
+    def _data_key(
+        self,
+        user_id: int,
+        key: Hashable,
+        epoch: bytes | None,
+        generation: bytes | None,
+    ) -> str:
+        return (
+            f"{KEY_PREFIX}:{self.name}:{user_id}:"
+            f"{int(epoch or 0)}.{int(generation or 0)}:{key_digest(key)}"
+        )
+
+    def _failed(self, operation: str, error: CacheBackendError) -> None:
+        self.errors += 1
+        logger.warning("%s cache %s failed: %s", self.name, operation, error)
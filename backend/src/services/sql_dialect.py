@@ -0,0 +1,14 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+
+def dialect_name(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+def upsert_insert(db: Session):
+    """Dialect insert() supporting on_conflict_do_update (Postgres / SQLite)."""
+    if dialect_name(db) == "postgresql":
+        return pg_insert
+    return sqlite_insert
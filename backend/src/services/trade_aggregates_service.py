@@ -0,0 +1,214 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import Date, case, cast, delete, func, select
+from sqlalchemy.orm import Session
+
+from ..db import TradeORM, UserTradeAggregateORM, UserTradeDailyBucketORM
+from ..domain.trade.trade_domain import TradeDomain
+from ..utils.datetime_utils import ensure_utc
+from .sql_dialect import dialect_name, upsert_insert
+from .trade_metrics import (
+    SUMMARY_WINDOW,
+    calc_absolute_pnl,
+    calc_traded_volume,
+    is_closed_trade,
+    is_open_trade,
+    start_of_day_utc,
+)
+from .trade_sql_metrics import (
+    absolute_pnl_expr,
+    is_closed_expr,
+    is_open_expr,
+    traded_volume_expr,
+)
+
+AGGREGATE_FIELDS = (
+    "open_equity",
+    "realized_pnl",
+    "open_trades",
+    "closed_trades",
+    "traded_volume",
+)
+BUCKET_FIELDS = ("closed_pnl", "traded_volume", "trade_count")
+
+
+def _utc_day(trade: TradeDomain | TradeORM) -> date:
+    return ensure_utc(trade.opened_at).date()
+
+
+def _utc_day_expr(dialect: str):
+    if dialect == "postgresql":
+        return cast(func.timezone("UTC", TradeORM.opened_at), Date)
+    return func.date(TradeORM.opened_at)
+
+
+def apply_aggregate_changes(
+    db: Session,
+    user_id: int,
+    added: Iterable[TradeDomain | TradeORM] = (),
+    removed: Iterable[TradeDomain | TradeORM] = (),
+) -> None:
+    """Fold trade writes into the running totals and daily buckets.
+
+    Runs in the caller's transaction; an update is the old trade in
+    `removed` plus the new one in `added`. Each table gets one additive
+    upsert, and buckets left without trades are deleted.
+    """
+    totals = dict.fromkeys(AGGREGATE_FIELDS, 0)
+    buckets: dict[date, dict[str, float]] = defaultdict(
+        lambda: dict.fromkeys(BUCKET_FIELDS, 0)
+    )
+    changed = False
+    for sign, trades in ((1, added), (-1, removed)):
+        for trade in trades:
+            changed = True
+            pnl = calc_absolute_pnl(trade) or 0.0
+            volume = calc_traded_volume(trade)
+            if is_open_trade(trade):
+                totals["open_equity"] += sign * trade.open_price * trade.quantity
+                totals["open_trades"] += sign
+            else:
+                totals["realized_pnl"] += sign * pnl
+                totals["closed_trades"] += sign
+            totals["traded_volume"] += sign * volume
+
+            bucket = buckets[_utc_day(trade)]
+            if is_closed_trade(trade):
+                bucket["closed_pnl"] += sign * pnl
+            bucket["traded_volume"] += sign * volume
+            bucket["trade_count"] += sign
+    if not changed:
+        return
+
+    insert = upsert_insert(db)
+    statement = insert(UserTradeAggregateORM).values(user_id=user_id, **totals)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[UserTradeAggregateORM.user_id],
+            set_={
+                field: getattr(UserTradeAggregateORM, field)
+                + getattr(statement.excluded, field)
+                for field in AGGREGATE_FIELDS
+            },
+        )
+    )
+
+    rows = [
+        {"user_id": user_id, "day": day, **values}
+        for day, values in sorted(buckets.items())
+    ]
+    statement = insert(UserTradeDailyBucketORM).values(rows)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[UserTradeDailyBucketORM.user_id, UserTradeDailyBucketORM.day],
+            set_={
+                field: getattr(UserTradeDailyBucketORM, field)
+                + getattr(statement.excluded, field)
+                for field in BUCKET_FIELDS
+            },
+        )
+    )
+    if any(row["trade_count"] < 0 for row in rows):
+        db.execute(
+            delete(UserTradeDailyBucketORM).where(
+                UserTradeDailyBucketORM.user_id == user_id,
+                UserTradeDailyBucketORM.trade_count <= 0,
+            )
+        )
+
+
+def read_summary(
+    db: Session,
+    user_id: int,
+    now: datetime | None = None,
+) -> dict[str, float]:
+    """compute_summary from the aggregate tables.
+
+    Whole days after the pivot come from daily buckets; only the partial
+    pivot day is summed from trades, via the (user_id, opened_at) index.
+    """
+    pivot = (now or datetime.now(timezone.utc)) - SUMMARY_WINDOW
+    next_day = start_of_day_utc(pivot.date()) + timedelta(days=1)
+
+    aggregate = db.get(UserTradeAggregateORM, user_id)
+
+    bucket_pnl, bucket_volume = db.execute(
+        select(
+            func.coalesce(func.sum(UserTradeDailyBucketORM.closed_pnl), 0.0),
+            func.coalesce(func.sum(UserTradeDailyBucketORM.traded_volume), 0.0),
+        ).where(
+            UserTradeDailyBucketORM.user_id == user_id,
+            UserTradeDailyBucketORM.day >= next_day.date(),
+        )
+    ).one()
+
+    is_closed = is_closed_expr()
+    edge_pnl, edge_volume = db.execute(
+        select(
+            func.coalesce(func.sum(case((is_closed, absolute_pnl_expr()), else_=0.0)), 0.0),
+            func.coalesce(func.sum(traded_volume_expr()), 0.0),
+        ).where(
+            TradeORM.user_id == user_id,
+            TradeORM.opened_at >= pivot,
+            TradeORM.opened_at < next_day,
+        )
+    ).one()
+
+    return {
+        "open_equity": float(aggregate.open_equity) if aggregate else 0.0,
+        "pnl_last_7_days": float(bucket_pnl + edge_pnl),
+        "volume_last_7_days": float(bucket_volume + edge_volume),
+        "total_pnl": float(aggregate.realized_pnl) if aggregate else 0.0,
+    }
+
+
+def rebuild_trade_aggregates(db: Session, user_id: int | None = None) -> None:
+    """Recompute totals and daily buckets from trades (one user, or everyone).
+
+    Repair path for drift; runs in the caller's transaction.
+    """
+    for model in (UserTradeAggregateORM, UserTradeDailyBucketORM):
+        clear = delete(model)
+        if user_id is not None:
+            clear = clear.where(model.user_id == user_id)
+        db.execute(clear)
+
+    pnl = func.coalesce(absolute_pnl_expr(), 0.0)
+    volume = traded_volume_expr()
+    is_open = is_open_expr()
+    is_closed = is_closed_expr()
+
+    totals = select(
+        TradeORM.user_id,
+        func.sum(case((is_open, TradeORM.open_price * TradeORM.quantity), else_=0.0)),
+        func.sum(case((is_open, 0.0), else_=pnl)),
+        func.sum(case((is_open, 1), else_=0)),
+        func.sum(case((is_open, 0), else_=1)),
+        func.sum(volume),
+    ).group_by(TradeORM.user_id)
+
+    day = _utc_day_expr(dialect_name(db))
+    buckets = select(
+        TradeORM.user_id,
+        day,
+        func.sum(case((is_closed, pnl), else_=0.0)),
+        func.sum(volume),
+        func.count(),
+    ).group_by(TradeORM.user_id, day)
+
+    if user_id is not None:
+        totals = totals.where(TradeORM.user_id == user_id)
+        buckets = buckets.where(TradeORM.user_id == user_id)
+
+    db.execute(
+        UserTradeAggregateORM.__table__.insert().from_select(
+            ["user_id", *AGGREGATE_FIELDS], totals
+        )
+    )
+    db.execute(
+        UserTradeDailyBucketORM.__table__.insert().from_select(
+            ["user_id", "day", *BUCKET_FIELDS], buckets
+        )
+    )
@@ -0,0 +1,159 @@
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from ..db import TradeORM
+from ..models.trade.trade_analytics_response import TradeAnalyticsResponse
+from ..models.trade.trade_list_query import TradeListQuery
+from .trade_query_service import STREAM_CHUNK_SIZE, build_filtered_query
+from .trade_sql_metrics import absolute_pnl_expr
+
+# (pnl, opened_at, closed_at, open_price, stop_loss, quantity)
+AnalyticsRow = tuple[float, datetime, datetime, float, float | None, float]
+
+
+class TradeAnalyticsAccumulator:
+    """Dashboard statistics over closed trades, fed in closed_at order.
+
+    Mirrors the dashboard's calcFunctions: everything is kept as running
+    sums and extremes, so one pass over the trades is enough and no trade
+    list is held in memory.
+    """
+
+    def __init__(self) -> None:
+        self.closed_trades = 0
+        self.wins = 0
+        self.losses = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.best_trade: float | None = None
+        self.worst_trade: float | None = None
+        self.max_win_streak = 0
+        self.max_loss_streak = 0
+        self._win_streak = 0
+        self._loss_streak = 0
+        self._duration_seconds = 0.0
+        self._equity = 0.0
+        self._peak_equity = 0.0
+        self.max_drawdown = 0.0
+        self.max_drawdown_pct = 0.0
+        self._risk_reward_sum = 0.0
+        self._risk_reward_count = 0
+
+    def add(
+        self,
+        pnl: float,
+        opened_at: datetime,
+        closed_at: datetime,
+        open_price: float,
+        stop_loss: float | None,
+        quantity: float,
+    ) -> None:
+        self.closed_trades += 1
+        self._duration_seconds += (closed_at - opened_at).total_seconds()
+
+        if pnl > 0:
+            self.wins += 1
+            self.gross_profit += pnl
+            self._win_streak += 1
+            self._loss_streak = 0
+        elif pnl < 0:
+            self.losses += 1
+            self.gross_loss += pnl
+            self._loss_streak += 1
+            self._win_streak = 0
+        else:
+            self._win_streak = 0
+            self._loss_streak = 0
+        self.max_win_streak = max(self.max_win_streak, self._win_streak)
+        self.max_loss_streak = max(self.max_loss_streak, self._loss_streak)
+
+        if self.best_trade is None or pnl > self.best_trade:
+            self.best_trade = pnl
+        if self.worst_trade is None or pnl < self.worst_trade:
+            self.worst_trade = pnl
+
+        # Drawdown of the cumulative closed PnL from its running peak
+        self._equity += pnl
+        self._peak_equity = max(self._peak_equity, self._equity)
+        drawdown = self._peak_equity - self._equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+            self.max_drawdown_pct = (
+                drawdown / abs(self._peak_equity) if self._peak_equity else 0.0
+            )
+
+        # Realized PnL in units of the risk planned with the stop loss
+        if stop_loss is not None:
+            planned_risk = abs(stop_loss - open_price) * quantity
+            if planned_risk:
+                self._risk_reward_sum += pnl / planned_risk
+                self._risk_reward_count += 1
+
+    def result(self) -> TradeAnalyticsResponse:
+        count = self.closed_trades
+        if self.gross_loss:
+            profit_factor = self.gross_profit / abs(self.gross_loss)
+        else:
+            # No losing trades: unbounded when there is profit
+            profit_factor = None if self.gross_profit > 0 else 0.0
+        return TradeAnalyticsResponse(
+            closed_trades=count,
+            winrate=self.wins / count if count else 0.0,
+            average_win=self.gross_profit / self.wins if self.wins else 0.0,
+            average_loss=self.gross_loss / self.losses if self.losses else 0.0,
+            profit_factor=profit_factor,
+            expectancy=(self.gross_profit + self.gross_loss) / count if count else 0.0,
+            best_trade=self.best_trade,
+            worst_trade=self.worst_trade,
+            gross_profit=self.gross_profit,
+            gross_loss=self.gross_loss,
+            max_win_streak=self.max_win_streak,
+            max_loss_streak=self.max_loss_streak,
+            average_duration_seconds=self._duration_seconds / count if count else 0.0,
+            max_drawdown=0.0 - self.max_drawdown,
+            max_drawdown_pct=0.0 - self.max_drawdown_pct,
+            average_risk_reward=(
+                self._risk_reward_sum / self._risk_reward_count
+                if self._risk_reward_count
+                else None
+            ),
+        )
+
+
+def summarize_analytics(rows: Iterable[AnalyticsRow]) -> TradeAnalyticsResponse:
+    accumulator = TradeAnalyticsAccumulator()
+    for row in rows:
+        accumulator.add(*row)
+    return accumulator.result()
+
+
+def compute_trade_analytics(
+    db: Session,
+    user_id: int,
+    query_params: TradeListQuery,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> TradeAnalyticsResponse:
+    """Dashboard analytics for the closed trades matching the list filters.
+
+    PnL is computed in SQL and rows are streamed in closed_at order from
+    a server-side cursor (pagination and sort params are ignored), so the
+    response is a few hundred bytes however many trades match.
+    """
+    query = (
+        build_filtered_query(db, user_id, query_params)
+        .filter(TradeORM.closed_at.isnot(None), TradeORM.close_price.isnot(None))
+        .order_by(None)
+        .order_by(TradeORM.closed_at.asc(), TradeORM.id.asc())
+        .with_entities(
+            absolute_pnl_expr(),
+            TradeORM.opened_at,
+            TradeORM.closed_at,
+            TradeORM.open_price,
+            TradeORM.stop_loss,
+            TradeORM.quantity,
+        )
+    )
+    result = db.execute(query.statement, execution_options={"yield_per": chunk_size})
+    return summarize_analytics(row for rows in result.partitions() for row in rows)
@@ -0,0 +1,115 @@
+from sqlalchemy import case, func, literal, select, true, union_all
+from sqlalchemy.orm import Session
+
+from ..db import TradeORM
+from ..models.trade.trade_breakdown_response import (
+    TradeBreakdownResponse,
+    TradeGroupStats,
+)
+from ..models.trade.trade_list_query import TradeListQuery
+from .sql_dialect import dialect_name
+from .trade_query_service import build_filtered_query
+from .trade_sql_metrics import absolute_pnl_expr, traded_volume_expr
+from .user_facets_service import tag_elements
+
+DIMENSION_SYMBOL = "symbol"
+DIMENSION_SIDE = "side"
+DIMENSION_TAG = "tag"
+
+
+def _group_stats(trades):
+    return (
+        func.count().label("trade_count"),
+        func.count(trades.c.pnl).label("closed_trades"),
+        func.coalesce(func.sum(case((trades.c.pnl > 0, 1), else_=0)), 0).label("win_count"),
+        func.coalesce(func.sum(trades.c.pnl), 0.0).label("realized_pnl"),
+        func.coalesce(func.sum(trades.c.volume), 0.0).label("volume"),
+    )
+
+
+def compute_trade_breakdown(
+    db: Session,
+    user_id: int,
+    query_params: TradeListQuery,
+    top: int | None = None,
+) -> TradeBreakdownResponse:
+    """Trade count, win rate, PnL and volume per symbol, side and tag.
+
+    One statement: the filtered trades become a CTE, the three GROUP BYs
+    are UNION ALL'ed, and row_number() over volume keeps the `top` groups
+    of each dimension when a limit is given. A trade counts once for each
+    of its tags.
+    """
+    trades = (
+        build_filtered_query(db, user_id, query_params)
+        .order_by(None)
+        .with_entities(
+            func.upper(TradeORM.symbol).label("symbol"),
+            TradeORM.type.label("side"),
+            TradeORM.tags.label("tags"),
+            absolute_pnl_expr().label("pnl"),
+            traded_volume_expr().label("volume"),
+        )
+        .cte("filtered_trades")
+    )
+    tags = tag_elements(dialect_name(db), trades.c.tags)
+
+    by_symbol = select(
+        literal(DIMENSION_SYMBOL).label("dimension"),
+        trades.c.symbol.label("key"),
+        *_group_stats(trades),
+    ).group_by(trades.c.symbol)
+    by_side = select(
+        literal(DIMENSION_SIDE).label("dimension"),
+        trades.c.side.label("key"),
+        *_group_stats(trades),
+    ).group_by(trades.c.side)
+    by_tag = (
+        select(
+            literal(DIMENSION_TAG).label("dimension"),
+            tags.c.value.label("key"),
+            *_group_stats(trades),
+        )
+        .select_from(trades)
+        .join(tags, true())
+        .group_by(tags.c.value)
+    )
+    groups = union_all(by_symbol, by_side, by_tag).subquery()
+
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=groups.c.dimension,
+            order_by=(groups.c.volume.desc(), groups.c.key),
+        )
+        .label("rank")
+    )
+    ranked = select(groups, rank).subquery()
+    statement = select(ranked).order_by(ranked.c.dimension, ranked.c.rank)
+    if top is not None:
+        statement = statement.where(ranked.c.rank <= top)
+
+    result: dict[str, list[TradeGroupStats]] = {
+        DIMENSION_SYMBOL: [],
+        DIMENSION_SIDE: [],
+        DIMENSION_TAG: [],
+    }
+    for row in db.execute(statement):
+        closed = row.closed_trades
+        result[row.dimension].append(
+            TradeGroupStats(
+                key=row.key,
+                trade_count=row.trade_count,
+                closed_trades=closed,
+                win_count=row.win_count,
+                winrate=row.win_count / closed if closed else 0.0,
+                realized_pnl=row.realized_pnl,
+                volume=row.volume,
+                average_pnl=row.realized_pnl / closed if closed else 0.0,
+            )
+        )
+    return TradeBreakdownResponse(
+        by_symbol=result[DIMENSION_SYMBOL],
+        by_side=result[DIMENSION_SIDE],
+        by_tag=result[DIMENSION_TAG],
+    )
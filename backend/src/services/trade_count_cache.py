@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from .cache_backend import shared_cache_backend
+from .shared_cache import INT_CODEC, SharedResultCache
+
+COUNT_CACHE_TTL_SEC = 30
+COUNT_CACHE_MAX_KEYS_PER_USER = 32
+
+
+class TradeCountCache:
+    """Short-lived per-user cache of exact trade list totals.
+
+    Keys are normalized filter tuples; every trade write for a user
+    drops all of that user's entries via `invalidate_user`.
+    """
+
+    def __init__(
+        self,
+        ttl_sec: float = COUNT_CACHE_TTL_SEC,
+        max_keys_per_user: int = COUNT_CACHE_MAX_KEYS_PER_USER,
+    ):
+        self._ttl_sec = ttl_sec
+        self._max_keys_per_user = max_keys_per_user
+        self._entries: dict[int, OrderedDict[Hashable, tuple[float, int]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, key: Hashable) -> int | None:
+        with self._lock:
+            user_entries = self._entries.get(user_id)
+            if not user_entries or key not in user_entries:
+                return None
+            expires_at, total = user_entries[key]
+            if expires_at <= time.monotonic():
+                del user_entries[key]
+                return None
+            user_entries.move_to_end(key)
+            return total
+
+    def set(self, user_id: int, key: Hashable, total: int) -> None:
+        with self._lock:
+            user_entries = self._entries.setdefault(user_id, OrderedDict())
+            user_entries[key] = (time.monotonic() + self._ttl_sec, total)
+            user_entries.move_to_end(key)
+            while len(user_entries) > self._max_keys_per_user:
+                user_entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def build_count_cache() -> TradeCountCache | SharedResultCache:
+    """In-process cache, or a shared one when CACHE_URL selects a backend."""
+    backend = shared_cache_backend()
+    if backend is None:
+        return TradeCountCache()
+    return SharedResultCache("counts", backend, INT_CODEC, ttl_sec=COUNT_CACHE_TTL_SEC)
+
+
+trade_count_cache = build_count_cache()
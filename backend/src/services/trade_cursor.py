@@ -0,0 +1,48 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ValidationError
+
+from ..errors.cursor_errors import invalid_cursor_error
+from ..models.trade.trade_list_query import TradeListQuery
+
+CursorValue = datetime | float | None
+
+
+class TradeCursor(BaseModel):
+    """Keyset position: (sort column value, id) of a boundary row.
+
+    `direction` tells whether the page is read after ("next") or
+    before ("prev") that row. The sort settings are embedded so a
+    cursor cannot be replayed against a different ordering.
+    """
+
+    sort_by: str
+    sort_order: Literal["asc", "desc"]
+    value: CursorValue
+    id: int
+    direction: Literal["next", "prev"] = "next"
+
+
+def encode_cursor(cursor: TradeCursor) -> str:
+    raw = cursor.model_dump_json().encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, query_params: TradeListQuery) -> TradeCursor:
+    """Decode an opaque cursor and check it matches the requested sort."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii"))
+        cursor = TradeCursor.model_validate_json(raw)
+    except (ValueError, binascii.Error, ValidationError):
+        raise invalid_cursor_error()
+
+    if (
+        cursor.sort_by != query_params.sort_by
+        or cursor.sort_order != query_params.sort_order
+    ):
+        raise invalid_cursor_error()
+    return cursor
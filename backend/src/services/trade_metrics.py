@@ -1,4 +1,6 @@
+from collections.abc import Sequence
 from datetime import date, datetime, timedelta, timezone
+from typing import Literal
 
 from ..domain.trade.enums import TradeType
 from ..domain.trade.trade_domain import TradeDomain
@@ -11,6 +13,7 @@ def _parse_iso_datetime(value: str | None) -> datetime | None:
 
 
 def calc_absolute_pnl(trade: TradeDomain) -> float | None:
+    """Realized PnL; also accepts a TradeORM row (type stored as text)."""
     if trade.close_price is None:
         return None
 
@@ -18,7 +21,7 @@ def calc_absolute_pnl(trade: TradeDomain) -> float | None:
     open_price = trade.open_price
     close_price = trade.close_price
     quantity = trade.quantity
-    trade_type = trade.type
+    trade_type = TradeType(trade.type)
 
     if leverage > 1:
         liquidation_price_long = open_price * (1 - 1 / leverage)
@@ -34,6 +37,15 @@ def calc_absolute_pnl(trade: TradeDomain) -> float | None:
     return (close_price - open_price) * quantity * direction
 
 
+def calc_pnl_pct(trade: TradeDomain) -> float | None:
+    """Realized PnL relative to the posted margin (open notional / leverage)."""
+    pnl = calc_absolute_pnl(trade)
+    if pnl is None:
+        return None
+    margin = trade.open_price * trade.quantity / (trade.leverage or 1)
+    return pnl / margin if margin else None
+
+
 def calc_closed_pnl(trade: TradeDomain) -> float:
     return calc_absolute_pnl(trade) or 0.0
 
@@ -48,7 +60,13 @@ def is_open_trade(trade: TradeDomain) -> bool:
 
 
 def is_closed_trade(trade: TradeDomain) -> bool:
-    return trade.close_price is not None and trade.closed_at is not None
+    """A close price makes a trade closed, with or without closed_at.
+
+    Legacy rows can have close_price set and closed_at NULL; every
+    open/closed split (list status filter, summary, aggregates) uses
+    this rule so they agree on those rows.
+    """
+    return trade.close_price is not None
 
 
 def start_of_day_utc(d: date) -> datetime:
@@ -91,8 +109,32 @@ def matches_tags(trade_tags: list[str] | None, filter_tags: list[str] | None) ->
     return any(tag in trade_tags for tag in filter_tags)
 
 
-def compute_summary(trades: list[TradeDomain]) -> dict[str, float]:
-    pivot = datetime.now(timezone.utc) - timedelta(days=7)
+SUMMARY_WINDOW = timedelta(days=7)
+
+
+def compute_summary(
+    trades: Sequence[TradeDomain] | Sequence[tuple],
+    now: datetime | None = None,
+    engine: Literal["python", "numpy"] = "python",
+) -> dict[str, float]:
+    """Reference implementation of the dashboard summary.
+
+    get_summary serves the same numbers from the running aggregates
+    (trade_aggregates_service) and trade_sql_metrics.compute_summary_sql
+    is the one-query SQL twin; keep them in step.
+
+    engine="python" takes TradeDomain objects. engine="numpy" (needs
+    NumPy) takes query rows shaped like trade_metrics_numpy.TRADE_COLUMNS,
+    or the TradeColumns that load_trade_columns builds from them.
+    """
+    if engine == "numpy":
+        from .trade_metrics_numpy import TradeColumns, compute_summary_columns
+
+        if not isinstance(trades, TradeColumns):
+            trades = TradeColumns.from_rows(trades)
+        return compute_summary_columns(trades, now=now)
+
+    pivot = (now or datetime.now(timezone.utc)) - SUMMARY_WINDOW
 
     open_equity = sum(
         t.open_price * t.quantity for t in trades if is_open_trade(t)
@@ -103,7 +145,7 @@ def compute_summary(trades: list[TradeDomain]) -> dict[str, float]:
     pnl_last_7_days = sum(
         calc_closed_pnl(t)
         for t in last_7_days
-        if t.close_price is not None and t.closed_at is not None
+        if is_closed_trade(t)
     )
 
     volume_last_7_days = sum(calc_traded_volume(t) for t in last_7_days)
@@ -0,0 +1,175 @@
+"""Columnar (NumPy) twin of the trade_metrics helpers.
+
+Trade columns are selected straight from the database into parallel
+arrays (no ORM entities or TradeDomain objects in between) and every
+metric is an array expression over them, instead of calling
+calc_absolute_pnl per trade. NumPy is an optional dependency
+(`poetry install --extras metrics`); compute_summary(..., engine="numpy")
+imports this module lazily.
+
+Open trades carry NaN close prices, so masks built from comparisons
+against them are simply False.
+"""
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..db import TradeORM
+from ..domain.trade.enums import TradeType
+from ..utils.datetime_utils import ensure_utc
+from .trade_metrics import SUMMARY_WINDOW
+
+
+# Selected in this order by load_trade_columns; TradeColumns.from_rows
+# takes rows of the same shape.
+TRADE_COLUMNS = (
+    TradeORM.open_price,
+    TradeORM.close_price,
+    TradeORM.quantity,
+    TradeORM.leverage,
+    TradeORM.type,
+    TradeORM.opened_at,
+)
+
+_NAT = np.datetime64("NaT", "us").astype(np.int64)
+
+
+def to_datetime64(value: datetime) -> np.datetime64:
+    """A datetime as a naive-UTC datetime64[us] scalar."""
+    return np.datetime64(ensure_utc(value).replace(tzinfo=None), "us")
+
+
+def _floats(values: Iterable[float | None], count: int) -> np.ndarray:
+    """float64 array; None becomes NaN."""
+    return np.fromiter(
+        (np.nan if value is None else value for value in values),
+        dtype=np.float64,
+        count=count,
+    )
+
+
+def _datetimes(values: Iterable[datetime | None], count: int) -> np.ndarray:
+    """datetime64[us] (naive UTC) array; None becomes NaT.
+
+    Goes through POSIX timestamps, which is several times faster than
+    handing numpy a list of datetime objects.
+    """
+    seconds = np.fromiter(
+        (
+            np.nan if value is None
+            else (value if value.tzinfo else ensure_utc(value)).timestamp()
+            for value in values
+        ),
+        dtype=np.float64,
+        count=count,
+    )
+    micros = np.full(count, _NAT, dtype=np.int64)
+    known = ~np.isnan(seconds)
+    micros[known] = np.rint(seconds[known] * 1_000_000).astype(np.int64)
+    return micros.view("datetime64[us]")
+
+
+@dataclass(frozen=True, slots=True)
+class TradeColumns:
+    open_price: np.ndarray  # float64
+    close_price: np.ndarray  # float64, NaN while open
+    quantity: np.ndarray  # float64
+    leverage: np.ndarray  # float64, `leverage or 1`
+    is_buy: np.ndarray  # bool
+    opened_at: np.ndarray  # datetime64[us], naive UTC
+
+    def __len__(self) -> int:
+        return len(self.open_price)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple]) -> "TradeColumns":
+        """Build from rows shaped like TRADE_COLUMNS (open_price,
+        close_price, quantity, leverage, type, opened_at)."""
+        count = len(rows)
+        if count:
+            open_price, close_price, quantity, leverage, types, opened_at = zip(*rows)
+        else:
+            open_price = close_price = quantity = leverage = types = opened_at = ()
+
+        leverage = _floats(leverage, count)
+        leverage[np.isnan(leverage) | (leverage == 0)] = 1.0
+        buy = TradeType.buy.value
+        return cls(
+            open_price=_floats(open_price, count),
+            close_price=_floats(close_price, count),
+            quantity=_floats(quantity, count),
+            leverage=leverage,
+            is_buy=np.fromiter(
+                ((getattr(t, "value", t) == buy) for t in types),
+                dtype=np.bool_,
+                count=count,
+            ),
+            opened_at=_datetimes(opened_at, count),
+        )
+
+
+def load_trade_columns(db: Session, user_id: int) -> TradeColumns:
+    """One user's trades straight from the database into arrays."""
+    rows = db.execute(
+        select(*TRADE_COLUMNS).where(TradeORM.user_id == user_id)
+    ).all()
+    return TradeColumns.from_rows(rows)
+
+
+def open_mask(cols: TradeColumns) -> np.ndarray:
+    """is_open_trade: no close price."""
+    return np.isnan(cols.close_price)
+
+
+def closed_mask(cols: TradeColumns) -> np.ndarray:
+    """is_closed_trade: close price set, with or without closed_at."""
+    return ~np.isnan(cols.close_price)
+
+
+def absolute_pnl(cols: TradeColumns) -> np.ndarray:
+    """calc_absolute_pnl over all trades; NaN for open trades.
+
+    Leveraged positions closed beyond the liquidation price lose the
+    posted margin (open notional / leverage) and nothing more.
+    """
+    direction = np.where(cols.is_buy, 1.0, -1.0)
+    pnl = (cols.close_price - cols.open_price) * cols.quantity * direction
+    leveraged = cols.leverage > 1
+    liquidated = leveraged & np.where(
+        cols.is_buy,
+        cols.close_price <= cols.open_price * (1 - 1 / cols.leverage),
+        cols.close_price >= cols.open_price * (1 + 1 / cols.leverage),
+    )
+    margin_loss = (-cols.open_price * cols.quantity) / cols.leverage
+    return np.where(liquidated, margin_loss, pnl)
+
+
+def traded_volume(cols: TradeColumns) -> np.ndarray:
+    """calc_traded_volume over all trades."""
+    return (cols.open_price + np.nan_to_num(cols.close_price, nan=0.0)) * cols.quantity
+
+
+def opened_since_mask(cols: TradeColumns, since: datetime) -> np.ndarray:
+    return cols.opened_at >= to_datetime64(since)
+
+
+def compute_summary_columns(
+    cols: TradeColumns,
+    now: datetime | None = None,
+) -> dict[str, float]:
+    """compute_summary over TradeColumns."""
+    pivot = (now or datetime.now(timezone.utc)) - SUMMARY_WINDOW
+    is_closed = closed_mask(cols)
+    pnl = absolute_pnl(cols)
+    in_window = opened_since_mask(cols, pivot)
+
+    return {
+        "open_equity": float(np.sum(cols.open_price * cols.quantity, where=open_mask(cols))),
+        "pnl_last_7_days": float(np.sum(pnl, where=in_window & is_closed)),
+        "volume_last_7_days": float(np.sum(traded_volume(cols), where=in_window)),
+        "total_pnl": float(np.sum(pnl, where=is_closed)),
+    }
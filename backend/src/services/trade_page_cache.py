@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+PAGE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+PAGE_CACHE_MAX_ENTRY_BYTES = 1024 * 1024
+PAGE_CACHE_TTL_SEC = 600
+
+
+class TradePageCache:
+    """Per-process LRU of encoded JSON response bodies, bounded by bytes.
+
+    Keys are (endpoint, user_id, data version, normalized query). The
+    data version makes a write invalidate everything cached for the user
+    without any fan-out, so processes can't serve each other's stale
+    pages; entries under older versions are dropped as soon as a newer
+    one is stored. Bodies over `max_entry_bytes` are not cached.
+
+    Endpoints can be switched off with `disable(endpoint)` or the
+    comma-separated PAGE_CACHE_DISABLED env variable.
+    """
+
+    def __init__(
+        self,
+        name: str = "pages",
+        max_bytes: int = PAGE_CACHE_MAX_BYTES,
+        max_entry_bytes: int = PAGE_CACHE_MAX_ENTRY_BYTES,
+        ttl_sec: float = PAGE_CACHE_TTL_SEC,
+        disabled_endpoints: set[str] | None = None,
+    ):
+        self.name = name
+        self._max_bytes = max_bytes
+        self._max_entry_bytes = max_entry_bytes
+        self._ttl_sec = ttl_sec
+        self._disabled = set(disabled_endpoints or ())
+        self._entries: OrderedDict[tuple, tuple[float, bytes]] = OrderedDict()
+        # user_id -> (latest data version seen, keys stored under it)
+        self._user_keys: dict[int, tuple[int, set[tuple]]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def enabled(self, endpoint: str) -> bool:
+        return endpoint not in self._disabled
+
+    def disable(self, endpoint: str) -> None:
+        self._disabled.add(endpoint)
+
+    def enable(self, endpoint: str) -> None:
+        self._disabled.discard(endpoint)
+
+    def get(self, endpoint: str, user_id: int, version: int, key: Hashable) -> bytes | None:
+        if endpoint in self._disabled:
+            return None
+        entry_key = (endpoint, user_id, version, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, body = entry
+            if expires_at <= time.monotonic():
+                self._remove(entry_key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return body
+
+    def set(self, endpoint: str, user_id: int, version: int, key: Hashable, body: bytes) -> None:
+        if endpoint in self._disabled or len(body) > self._max_entry_bytes:
+            return
+        entry_key = (endpoint, user_id, version, key)
+        with self._lock:
+            latest, keys = self._user_keys.get(user_id, (version, set()))
+            if version < latest:
+                return  # computed before a write we've already seen
+            if version > latest:
+                for stale in keys:
+                    self._drop(stale)
+                    self.invalidations += 1
+                keys = set()
+            if entry_key in self._entries:
+                self._drop(entry_key)
+            self._entries[entry_key] = (time.monotonic() + self._ttl_sec, body)
+            self._bytes += len(body)
+            keys.add(entry_key)
+            self._user_keys[user_id] = (version, keys)
+            while self._bytes > self._max_bytes:
+                oldest, _ = next(iter(self._entries.items()))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, entry_key: tuple) -> None:
+        _, body = self._entries.pop(entry_key)
+        self._bytes -= len(body)
+
+    def _remove(self, entry_key: tuple) -> None:
+        self._drop(entry_key)
+        user_id = entry_key[1]
+        _, keys = self._user_keys[user_id]
+        keys.discard(entry_key)
+        if not keys:
+            del self._user_keys[user_id]
+
+
+def _disabled_from_env() -> set[str]:
+    value = os.getenv("PAGE_CACHE_DISABLED", "")
+    return {endpoint.strip() for endpoint in value.split(",") if endpoint.strip()}
+
+
+trade_page_cache = TradePageCache(disabled_endpoints=_disabled_from_env())
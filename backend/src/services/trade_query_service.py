@@ -1,24 +1,37 @@
+import json
+import operator
+import time
+from collections.abc import Iterator
 from datetime import date, datetime, timedelta, timezone
 
-from sqlalchemy import String, cast
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy import String, and_, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Query, Session
 
-from ..db import TradeORM
+from ..db import FACET_KIND_SYMBOL, FACET_KIND_TAG, TradeORM, UserFacetORM
 from ..domain.trade.enums import TradeType
 from ..models.trade.trade_facets_response import TradeFacetsResponse
 from ..models.trade.trade_list_query import TradeListQuery
 from ..models.trade.trade_list_response import TradeListResponse
 from ..models.trade.trade_response import TradeResponse
 from ..models.trade.trade_summary_response import TradeSummaryResponse
+from ..utils.datetime_utils import ensure_utc
+from .trade_count_cache import trade_count_cache
+from .trade_result_cache import facets_cache, summary_cache
+from .trade_cursor import TradeCursor, decode_cursor, encode_cursor
 from .trade_metrics import (
-    compute_summary,
+    SUMMARY_WINDOW,
     end_of_day_utc,
     start_of_day_utc,
 )
+from .trade_aggregates_service import read_summary
+from .trade_sql_metrics import compute_summary_sql, is_closed_expr, is_open_expr
 
 FilterDate = str | date | datetime | None
 
+STREAM_CHUNK_SIZE = 1000
+
 
 def _is_date_only(value: str) -> bool:
     return len(value) == 10 and value[4] == "-" and value[7] == "-"
@@ -45,15 +58,12 @@ def _to_utc_datetime(value: FilterDate) -> datetime | None:
     return start_of_day_utc(value)
 
 
-def _lower_bound_iso(value: FilterDate) -> str | None:
+def _lower_bound(value: FilterDate) -> datetime | None:
     """Inclusive lower bound. Date-only → start of UTC day; ISO → as-is."""
-    dt = _to_utc_datetime(value)
-    if dt is None:
-        return None
-    return dt.isoformat().replace("+00:00", "Z")
+    return _to_utc_datetime(value)
 
 
-def _upper_bound_iso(value: FilterDate) -> str | None:
+def _upper_bound(value: FilterDate) -> datetime | None:
     """Inclusive upper bound.
 
     YYYY-MM-DD / date → end of that UTC day.
@@ -67,19 +77,14 @@ def _upper_bound_iso(value: FilterDate) -> str | None:
         if not text:
             return None
         if _is_date_only(text):
-            return (
-                end_of_day_utc(date.fromisoformat(text))
-                .isoformat()
-                .replace("+00:00", "Z")
-            )
+            return end_of_day_utc(date.fromisoformat(text))
     elif isinstance(value, date) and not isinstance(value, datetime):
-        return end_of_day_utc(value).isoformat().replace("+00:00", "Z")
+        return end_of_day_utc(value)
 
     dt = _to_utc_datetime(value)
     if dt is None:
         return None
-    end = dt + timedelta(days=1) - timedelta(milliseconds=1)
-    return end.isoformat().replace("+00:00", "Z")
+    return dt + timedelta(days=1) - timedelta(milliseconds=1)
 
 
 def _base_query(db: Session, user_id: int) -> Query:
@@ -87,23 +92,44 @@ def _base_query(db: Session, user_id: int) -> Query:
 
 
 def _apply_status_filter(query: Query, status: str | None) -> Query:
+    """Filter by open/closed on close_price, like the summary and aggregates.
+
+    TradeDomain only accepts close_price and closed_at together, but
+    legacy rows can have a close price without closed_at; they count as
+    closed everywhere (trade_metrics.is_closed_trade). `close_price IS
+    NULL` is also the predicate of the open-trades partial indexes,
+    which keeps open listings proportional to the number of open trades.
+    """
     if status == "open":
-        return query.filter(
-            TradeORM.close_price.is_(None),
-            TradeORM.closed_at.is_(None),
-        )
+        return query.filter(is_open_expr())
     if status == "closed":
-        return query.filter(
-            TradeORM.close_price.isnot(None),
-            TradeORM.closed_at.isnot(None),
-        )
+        return query.filter(is_closed_expr())
     return query
 
 
-def _apply_symbol_filter(query: Query, symbol: str | None) -> Query:
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _apply_symbol_filter(
+    query: Query,
+    symbol: str | None,
+    symbol_match: str = "contains",
+) -> Query:
+    """Case-insensitive symbol match.
+
+    "contains" is served on Postgres by the (user_id, symbol gin_trgm_ops)
+    GIN index (ILIKE with a leading wildcard); "prefix" by the
+    (user_id, upper(symbol) text_pattern_ops) btree index.
+    """
     if not symbol:
         return query
-    return query.filter(TradeORM.symbol.ilike(f"%{symbol}%"))
+    pattern = _escape_like(symbol)
+    if symbol_match == "prefix":
+        return query.filter(
+            func.upper(TradeORM.symbol).like(f"{pattern.upper()}%", escape="\\")
+        )
+    return query.filter(TradeORM.symbol.ilike(f"%{pattern}%", escape="\\"))
 
 
 def _apply_type_filter(query: Query, trade_type: TradeType | None) -> Query:
@@ -112,15 +138,44 @@ def _apply_type_filter(query: Query, trade_type: TradeType | None) -> Query:
     return query.filter(TradeORM.type == trade_type.value)
 
 
+def _dialect_name(query: Query) -> str:
+    return query.session.get_bind().dialect.name
+
+
 def _apply_tags_filter(query: Query, tags: list[str] | None) -> Query:
     if not tags:
         return query
-    # Postgres ?| expects jsonb ?| text[] (any key/array-element match)
+    if _dialect_name(query) == "postgresql":
+        # jsonb ?| text[] (any array-element match) on the bare column so
+        # the GIN index on trades.tags can serve it
+        return query.filter(TradeORM.tags.op("?|")(cast(tags, ARRAY(String))))
+
+    elements = func.json_each(TradeORM.tags).table_valued("value")
     return query.filter(
-        cast(TradeORM.tags, JSONB).op("?|")(cast(tags, ARRAY(String)))
+        select(literal(1))
+        .select_from(elements)
+        .where(elements.c.value.in_(tags))
+        .exists()
     )
 
 
+def _apply_pnl_filters(query: Query, query_params: TradeListQuery) -> Query:
+    """Range/sign filters on the stored realized_pnl.
+
+    Open trades have NULL realized_pnl and never match. Served by the
+    (user_id, realized_pnl, id) index.
+    """
+    if query_params.pnl_min is not None:
+        query = query.filter(TradeORM.realized_pnl >= query_params.pnl_min)
+    if query_params.pnl_max is not None:
+        query = query.filter(TradeORM.realized_pnl <= query_params.pnl_max)
+    if query_params.outcome == "win":
+        query = query.filter(TradeORM.realized_pnl > 0)
+    elif query_params.outcome == "loss":
+        query = query.filter(TradeORM.realized_pnl < 0)
+    return query
+
+
 def _date_column_for_status(status: str | None):
     if status == "closed":
         return TradeORM.closed_at
@@ -138,27 +193,73 @@ def _apply_date_filters(
 
     date_column = _date_column_for_status(status)
 
-    start_iso = _lower_bound_iso(date_from)
-    if start_iso:
-        query = query.filter(date_column >= start_iso)
+    start = _lower_bound(date_from)
+    if start:
+        query = query.filter(date_column >= start)
 
-    end_iso = _upper_bound_iso(date_to)
-    if end_iso:
-        query = query.filter(date_column <= end_iso)
+    end = _upper_bound(date_to)
+    if end:
+        query = query.filter(date_column <= end)
 
     return query
 
 
-def _apply_sort(query: Query, query_params: TradeListQuery) -> Query:
-    sort_column = {
-        "opened_at": TradeORM.opened_at,
-        "closed_at": TradeORM.closed_at,
-        "created_at": TradeORM.created_at,
-    }[query_params.sort_by]
+_SORT_COLUMNS = {
+    "opened_at": TradeORM.opened_at,
+    "closed_at": TradeORM.closed_at,
+    "created_at": TradeORM.created_at,
+    "pnl": TradeORM.realized_pnl,
+}
 
-    if query_params.sort_order == "asc":
-        return query.order_by(sort_column.asc())
-    return query.order_by(sort_column.desc())
+
+def _apply_sort(
+    query: Query,
+    query_params: TradeListQuery,
+    reverse: bool = False,
+) -> Query:
+    """Order by (sort column, id); NULL sort values always trail the page.
+
+    The id tie-breaker makes the order total, which keyset pagination
+    relies on. `reverse` flips the whole ordering (including NULL
+    placement) to walk backwards from a "prev" cursor.
+    """
+    sort_column = _SORT_COLUMNS[query_params.sort_by]
+    ascending = (query_params.sort_order == "asc") != reverse
+
+    if ascending:
+        order = [sort_column.asc(), TradeORM.id.asc()]
+    else:
+        order = [sort_column.desc(), TradeORM.id.desc()]
+    order[0] = order[0].nulls_first() if reverse else order[0].nulls_last()
+    return query.order_by(*order)
+
+
+def _apply_cursor_filter(
+    query: Query,
+    query_params: TradeListQuery,
+    cursor: TradeCursor,
+) -> Query:
+    """Keep only rows strictly past the cursor row in walking order."""
+    sort_column = _SORT_COLUMNS[query_params.sort_by]
+    forward = cursor.direction == "next"
+    ascending = (query_params.sort_order == "asc") == forward
+    beyond = operator.gt if ascending else operator.lt
+    id_beyond = beyond(TradeORM.id, cursor.id)
+
+    if cursor.value is None:
+        # NULLs sit at the end of the natural order
+        null_tail = and_(sort_column.is_(None), id_beyond)
+        if forward:
+            return query.filter(null_tail)
+        return query.filter(or_(sort_column.isnot(None), null_tail))
+
+    past_cursor = or_(
+        beyond(sort_column, cursor.value),
+        and_(sort_column == cursor.value, id_beyond),
+    )
+    if forward:
+        past_cursor = or_(past_cursor, sort_column.is_(None))
+    return query.filter(past_cursor)
 
 
 def build_filtered_query(
@@ -168,9 +269,12 @@ def build_filtered_query(
 ) -> Query:
     query = _base_query(db, user_id)
     query = _apply_status_filter(query, query_params.status)
-    query = _apply_symbol_filter(query, query_params.symbol)
+    query = _apply_symbol_filter(
+        query, query_params.symbol, query_params.symbol_match
+    )
     query = _apply_type_filter(query, query_params.type)
     query = _apply_tags_filter(query, query_params.tags)
+    query = _apply_pnl_filters(query, query_params)
     query = _apply_date_filters(
         query,
         query_params.status,
@@ -180,35 +284,265 @@ def build_filtered_query(
     return _apply_sort(query, query_params)
 
 
+# Columns in TradeResponse field order; list pages select only these
+_LIST_COLUMNS = (
+    TradeORM.id,
+    TradeORM.created_at,
+    TradeORM.symbol,
+    TradeORM.type,
+    TradeORM.open_price,
+    TradeORM.quantity,
+    TradeORM.opened_at,
+    TradeORM.take_profit,
+    TradeORM.stop_loss,
+    TradeORM.leverage,
+    TradeORM.close_price,
+    TradeORM.closed_at,
+    TradeORM.comment,
+    TradeORM.tags,
+    TradeORM.realized_pnl,
+    TradeORM.pnl_pct,
+)
+
+
+def _row_to_response(row: Row) -> TradeResponse:
+    """Build a TradeResponse from a projected row without validation.
+
+    Rows were validated by TradeDomain when written, so the list path
+    skips to_domain() and pydantic validation; the driver already returns
+    the response field types apart from the trade type enum.
+    """
+    (
+        trade_id,
+        created_at,
+        symbol,
+        trade_type,
+        open_price,
+        quantity,
+        opened_at,
+        take_profit,
+        stop_loss,
+        leverage,
+        close_price,
+        closed_at,
+        comment,
+        tags,
+        realized_pnl,
+        pnl_pct,
+    ) = row
+    return TradeResponse.model_construct(
+        id=trade_id,
+        created_at=created_at,
+        symbol=symbol,
+        type=TradeType(trade_type),
+        open_price=open_price,
+        quantity=quantity,
+        opened_at=opened_at,
+        take_profit=take_profit,
+        stop_loss=stop_loss,
+        leverage=leverage,
+        close_price=close_price,
+        closed_at=closed_at,
+        comment=comment,
+        tags=tags or None,
+        realized_pnl=realized_pnl,
+        pnl_pct=pnl_pct,
+    )
+
+
+def _page_cursor(
+    row: Row,
+    query_params: TradeListQuery,
+    direction: str,
+) -> str:
+    return encode_cursor(
+        TradeCursor(
+            sort_by=query_params.sort_by,
+            sort_order=query_params.sort_order,
+            value=getattr(row, _SORT_COLUMNS[query_params.sort_by].key),
+            id=row.id,
+            direction=direction,
+        )
+    )
+
+
+def _fetch_keyset_page(
+    query: Query,
+    query_params: TradeListQuery,
+    cursor: TradeCursor,
+) -> tuple[list[Row], bool, bool]:
+    """Fetch one page after/before `cursor` without OFFSET.
+
+    Reads limit + 1 rows to learn whether another page exists in the
+    walking direction. Returns (rows, has_prev, has_next).
+    """
+    limit = query_params.limit
+    page_query = _apply_cursor_filter(query, query_params, cursor)
+    if cursor.direction == "prev":
+        page_query = _apply_sort(page_query.order_by(None), query_params, reverse=True)
+
+    rows = page_query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if cursor.direction == "prev":
+        rows.reverse()
+        return rows, has_more, True
+    return rows, True, has_more
+
+
+def _fetch_offset_page(
+    query: Query,
+    query_params: TradeListQuery,
+) -> tuple[list[Row], bool]:
+    """Fetch one OFFSET page; the extra row tells whether a next page exists."""
+    limit = query_params.limit
+    rows = query.offset(query_params.offset).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
+
+
+def _count_cache_key(query_params: TradeListQuery) -> tuple:
+    """Filter identity of a list query; paging and sort don't change the total."""
+    return (
+        query_params.status,
+        query_params.symbol.lower() if query_params.symbol else None,
+        query_params.symbol_match,
+        query_params.type.value if query_params.type else None,
+        tuple(sorted(set(query_params.tags))) if query_params.tags else None,
+        query_params.pnl_min,
+        query_params.pnl_max,
+        query_params.outcome,
+        _lower_bound(query_params.date_from),
+        _upper_bound(query_params.date_to),
+    )
+
+
+def list_query_key(query_params: TradeListQuery) -> tuple:
+    """Full identity of a list request: filters plus paging, sort and count mode."""
+    return _count_cache_key(query_params) + (
+        query_params.limit,
+        query_params.offset,
+        query_params.cursor,
+        query_params.paginate,
+        query_params.sort_by,
+        query_params.sort_order,
+        query_params.count,
+    )
+
+
+def _estimate_count(db: Session, query: Query) -> int:
+    """Planner row estimate on Postgres; exact count elsewhere."""
+    count_query = query.order_by(None)
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return count_query.count()
+
+    compiled = count_query.statement.compile(dialect=bind.dialect)
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _resolve_total(
+    db: Session,
+    user_id: int,
+    query: Query,
+    query_params: TradeListQuery,
+    rows: list[Row],
+    has_next: bool,
+) -> int | None:
+    if query_params.count in ("none", "has_more"):
+        return None
+
+    # An OFFSET page that reached the end already knows the exact total
+    reached_end = not has_next and (rows or query_params.offset == 0)
+    if reached_end and not query_params.cursor:
+        return query_params.offset + len(rows)
+
+    if query_params.count == "estimated":
+        return _estimate_count(db, query)
+
+    key = _count_cache_key(query_params)
+    total = trade_count_cache.get(user_id, key)
+    if total is None:
+        total = query.order_by(None).count()
+        trade_count_cache.set(user_id, key, total)
+    return total
+
+
 def list_trades(
     db: Session,
     user_id: int,
     query_params: TradeListQuery,
 ) -> TradeListResponse:
-    query = build_filtered_query(db, user_id, query_params)
-    total = query.count()
-
-    if query_params.paginate:
-        rows = (
-            query.offset(query_params.offset)
-            .limit(query_params.limit)
-            .all()
+    """List a page of trades.
+
+    The result is assembled with model_construct from projected rows and
+    is not re-validated; serialize it with model_dump_json().
+    """
+    query = build_filtered_query(db, user_id, query_params).with_entities(
+        *_LIST_COLUMNS
+    )
+
+    if not query_params.paginate:
+        rows = query.all()
+        return TradeListResponse.model_construct(
+            items=[_row_to_response(row) for row in rows],
+            total=len(rows),
+            limit=None,
+            offset=0,
         )
-        limit = query_params.limit
+
+    if query_params.cursor:
+        cursor = decode_cursor(query_params.cursor, query_params)
+        rows, has_prev, has_next = _fetch_keyset_page(query, query_params, cursor)
     else:
-        rows = query.all()
-        limit = None
+        rows, has_next = _fetch_offset_page(query, query_params)
+        has_prev = query_params.offset > 0
+
+    total = _resolve_total(db, user_id, query, query_params, rows, has_next)
 
-    items = [TradeResponse(**t.to_domain().__dict__) for t in rows]
+    next_cursor = None
+    prev_cursor = None
+    if rows and has_next:
+        next_cursor = _page_cursor(rows[-1], query_params, "next")
+    if rows and has_prev:
+        prev_cursor = _page_cursor(rows[0], query_params, "prev")
 
-    return TradeListResponse(
-        items=items,
+    return TradeListResponse.model_construct(
+        items=[_row_to_response(row) for row in rows],
         total=total,
-        limit=limit,
-        offset=query_params.offset if query_params.paginate else 0,
+        limit=query_params.limit,
+        offset=None if query_params.cursor else query_params.offset,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        has_more=has_next if query_params.count == "has_more" else None,
     )
 
 
+def iter_trade_chunks(
+    db: Session,
+    user_id: int,
+    query_params: TradeListQuery,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[list[TradeResponse]]:
+    """Yield every matching trade (ignoring pagination) in chunks.
+
+    Rows come from a server-side cursor (yield_per → stream_results on
+    Postgres), so memory stays bounded by `chunk_size` regardless of how
+    many trades the user has.
+    """
+    query = build_filtered_query(db, user_id, query_params).with_entities(
+        *_LIST_COLUMNS
+    )
+    result = db.execute(query.statement, execution_options={"yield_per": chunk_size})
+    for rows in result.partitions():
+        yield [_row_to_response(row) for row in rows]
+
+
 def get_trade_by_id(db: Session, user_id: int, trade_id: int) -> TradeORM | None:
     return (
         db.query(TradeORM)
@@ -218,30 +552,103 @@ def get_trade_by_id(db: Session, user_id: int, trade_id: int) -> TradeORM | None
 
 
 def get_facets(db: Session, user_id: int) -> TradeFacetsResponse:
+    """Distinct symbols/tags with trade counts from the user_facets dictionary.
+
+    Cached per user in `facets_cache` until the next trade write.
+    """
+    cached = facets_cache.get(user_id)
+    if cached is not None:
+        return cached
+
     rows = (
-        db.query(TradeORM.symbol, TradeORM.tags)
-        .filter(TradeORM.user_id == user_id)
+        db.query(UserFacetORM.kind, UserFacetORM.value, UserFacetORM.trade_count)
+        .filter(UserFacetORM.user_id == user_id, UserFacetORM.trade_count > 0)
         .all()
     )
 
-    symbols: set[str] = set()
-    tags: set[str] = set()
+    symbol_counts: dict[str, int] = {}
+    tag_counts: dict[str, int] = {}
+    for kind, value, trade_count in sorted(rows):
+        if kind == FACET_KIND_SYMBOL:
+            symbol_counts[value] = trade_count
+        elif kind == FACET_KIND_TAG:
+            tag_counts[value] = trade_count
+
+    facets = TradeFacetsResponse(
+        symbols=list(symbol_counts),
+        tags=list(tag_counts),
+        symbol_counts=symbol_counts,
+        tag_counts=tag_counts,
+    )
+    facets_cache.set(user_id, None, facets)
+    return facets
+
+
+def has_filters(query_params: TradeListQuery) -> bool:
+    """Whether the query narrows the trade set (paging and sort don't)."""
+    return bool(
+        query_params.status
+        or query_params.symbol
+        or query_params.type
+        or query_params.tags
+        or query_params.pnl_min is not None
+        or query_params.pnl_max is not None
+        or query_params.outcome
+        or query_params.date_from
+        or query_params.date_to
+    )
 
-    for symbol, trade_tags in rows:
-        if symbol:
-            symbols.add(symbol.upper())
-        if trade_tags:
-            for tag in trade_tags:
-                tags.add(tag)
 
-    return TradeFacetsResponse(
-        symbols=sorted(symbols),
-        tags=sorted(tags),
-    )
+def get_summary(
+    db: Session,
+    user_id: int,
+    query_params: TradeListQuery | None = None,
+) -> TradeSummaryResponse:
+    """Dashboard summary, over the trades matching `query_params` if given.
 
+    Unfiltered summaries come from the running aggregates; filtered ones
+    are aggregated in SQL over build_filtered_query, so they describe the
+    same trades as the list with those filters.
 
-def get_summary(db: Session, user_id: int) -> TradeSummaryResponse:
-    rows = db.query(TradeORM).filter(TradeORM.user_id == user_id).all()
-    domains = [t.to_domain() for t in rows]
-    metrics = compute_summary(domains)
-    return TradeSummaryResponse(**metrics)
+    Results are cached per user and filter set in `summary_cache` until the
+    next trade write, or until the oldest trade inside the 7-day window
+    drops out of it, whichever comes first.
+    """
+    filtered = query_params is not None and has_filters(query_params)
+    key = _count_cache_key(query_params) if filtered else None
+    cached = summary_cache.get(user_id, key)
+    if cached is not None:
+        return cached
+
+    now = datetime.now(timezone.utc)
+    if not filtered:
+        metrics = read_summary(db, user_id, now=now)
+    else:
+        metrics = compute_summary_sql(
+            db, user_id, now=now, query=build_filtered_query(db, user_id, query_params)
+        )
+    summary = TradeSummaryResponse(**metrics)
+
+    window_edge = _summary_window_edge(db, user_id, now)
+    expires_at = None
+    if window_edge is not None:
+        expires_at = time.monotonic() + (window_edge - now).total_seconds()
+    summary_cache.set(user_id, key, summary, expires_at=expires_at)
+    return summary
+
+
+def _summary_window_edge(db: Session, user_id: int, now: datetime) -> datetime | None:
+    """When the oldest trade opened inside the 7-day window leaves it.
+
+    The "last 7 days" metrics can only change at that moment (or on a
+    write), so it bounds how long a cached summary stays correct. Uses
+    all of the user's trades, which is conservative for filtered ones.
+    """
+    oldest = (
+        db.query(func.min(TradeORM.opened_at))
+        .filter(TradeORM.user_id == user_id, TradeORM.opened_at >= now - SUMMARY_WINDOW)
+        .scalar()
+    )
+    if oldest is None:
+        return None
+    return ensure_utc(oldest) + SUMMARY_WINDOW
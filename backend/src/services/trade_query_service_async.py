@@ -0,0 +1,72 @@
+"""AsyncSession counterparts of the trade read services.
+
+Query building, caching and row handling stay in the sync functions:
+each one here runs its twin through AsyncSession.run_sync, which drives
+the same ORM code on the event loop (psycopg in async mode, via
+greenlet) instead of a threadpool thread. Streaming uses
+AsyncSession.stream with the statement build_filtered_query produces.
+"""
+from collections.abc import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db import TradeORM
+from ..models.trade.trade_facets_response import TradeFacetsResponse
+from ..models.trade.trade_list_query import TradeListQuery
+from ..models.trade.trade_list_response import TradeListResponse
+from ..models.trade.trade_response import TradeResponse
+from ..models.trade.trade_summary_response import TradeSummaryResponse
+from .data_version_service import get_data_version
+from .trade_query_service import (
+    _LIST_COLUMNS,
+    STREAM_CHUNK_SIZE,
+    _row_to_response,
+    build_filtered_query,
+    get_facets,
+    get_summary,
+    get_trade_by_id,
+    list_trades,
+)
+
+
+async def get_data_version_async(db: AsyncSession, user_id: int) -> int:
+    return await db.run_sync(get_data_version, user_id)
+
+
+async def list_trades_async(
+    db: AsyncSession,
+    user_id: int,
+    query_params: TradeListQuery,
+) -> TradeListResponse:
+    return await db.run_sync(list_trades, user_id, query_params)
+
+
+async def get_trade_by_id_async(db: AsyncSession, user_id: int, trade_id: int) -> TradeORM | None:
+    return await db.run_sync(get_trade_by_id, user_id, trade_id)
+
+
+async def get_facets_async(db: AsyncSession, user_id: int) -> TradeFacetsResponse:
+    return await db.run_sync(get_facets, user_id)
+
+
+async def get_summary_async(
+    db: AsyncSession,
+    user_id: int,
+    query_params: TradeListQuery | None = None,
+) -> TradeSummaryResponse:
+    return await db.run_sync(get_summary, user_id, query_params)
+
+
+async def aiter_trade_chunks(
+    db: AsyncSession,
+    user_id: int,
+    query_params: TradeListQuery,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AsyncIterator[list[TradeResponse]]:
+    """iter_trade_chunks over an async server-side cursor."""
+    query = build_filtered_query(db.sync_session, user_id, query_params).with_entities(
+        *_LIST_COLUMNS
+    )
+    result = await db.stream(query.statement, execution_options={"yield_per": chunk_size})
+    async for rows in result.partitions():
+        yield [_row_to_response(row) for row in rows]
@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from contextvars import ContextVar
+from typing import Any
+
+from ..models.trade.trade_facets_response import TradeFacetsResponse
+from ..models.trade.trade_summary_response import TradeSummaryResponse
+from .cache_backend import shared_cache_backend
+from .shared_cache import CacheCodec, SharedResultCache, model_codec
+
+RESULT_CACHE_TTL_SEC = 300
+RESULT_CACHE_MAX_ENTRIES = 4096
+
+
+class TradeResultCache:
+    """Per-process LRU cache of per-user read results (summary, facets).
+
+    Entries are keyed by (user_id, key) and bounded by `max_entries`
+    across all users; the least recently used entry is evicted first.
+    Each entry expires after `ttl_sec` or at an earlier `expires_at`
+    passed to `set`. Trade writes drop a user's entries through
+    `invalidate_user`.
+
+    A value computed from data read before a concurrent write must not
+    be stored after that write's invalidation: a miss records the
+    user's generation (bumped by `invalidate_user` and `clear`), and
+    `set` drops the value if it has moved on since.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_sec: float = RESULT_CACHE_TTL_SEC,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+    ):
+        self.name = name
+        self._ttl_sec = ttl_sec
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[int, Hashable], tuple[float, Any]] = OrderedDict()
+        self._user_keys: dict[int, set[Hashable]] = {}
+        self._epoch = 0
+        self._generations: dict[int, int] = {}
+        # Generation seen by this request's last miss, see `set`
+        self._missed: ContextVar[tuple | None] = ContextVar(f"{name}_cache_missed", default=None)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int, key: Hashable = None) -> Any | None:
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is None:
+                self._miss(user_id, key)
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(user_id, key)
+                self.expirations += 1
+                self._miss(user_id, key)
+                return None
+            self._entries.move_to_end((user_id, key))
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        user_id: int,
+        key: Hashable,
+        value: Any,
+        expires_at: float | None = None,
+    ) -> None:
+        """Store `value`; `expires_at` (time.monotonic() based) can only
+        shorten the default TTL."""
+        deadline = time.monotonic() + self._ttl_sec
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        missed = self._missed.get()
+        self._missed.set(None)
+        with self._lock:
+            if (
+                missed is not None
+                and missed[:2] == (user_id, key)
+                and missed[2] != self._generation(user_id)
+            ):
+                return  # computed before a write that has since committed
+            self._entries[(user_id, key)] = (deadline, value)
+            self._entries.move_to_end((user_id, key))
+            self._user_keys.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self._max_entries:
+                (evicted_user, evicted_key), _ = self._entries.popitem(last=False)
+                self._discard_key(evicted_user, evicted_key)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            for key in self._user_keys.pop(user_id, ()):
+                del self._entries[(user_id, key)]
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+            self._epoch += 1
+            self._generations.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _generation(self, user_id: int) -> tuple[int, int]:
+        return self._epoch, self._generations.get(user_id, 0)
+
+    def _miss(self, user_id: int, key: Hashable) -> None:
+        self.misses += 1
+        self._missed.set((user_id, key, self._generation(user_id)))
+
+    def _remove(self, user_id: int, key: Hashable) -> None:
+        del self._entries[(user_id, key)]
+        self._discard_key(user_id, key)
+
+    def _discard_key(self, user_id: int, key: Hashable) -> None:
+        keys = self._user_keys.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[user_id]
+
+
+def build_result_cache(
+    name: str,
+    codec: CacheCodec,
+    ttl_sec: float = RESULT_CACHE_TTL_SEC,
+    max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+) -> TradeResultCache | SharedResultCache:
+    """In-process cache, or a shared one when CACHE_URL selects a backend.
+
+    `codec` serializes values for the shared backend; `max_entries` only
+    bounds the in-process cache (the backend has its own memory limit).
+    """
+    backend = shared_cache_backend()
+    if backend is None:
+        return TradeResultCache(name, ttl_sec=ttl_sec, max_entries=max_entries)
+    return SharedResultCache(name, backend, codec, ttl_sec=ttl_sec)
+
+
+summary_cache = build_result_cache("summary", model_codec(TradeSummaryResponse))
+facets_cache = build_result_cache("facets", model_codec(TradeFacetsResponse))
+
+
+def render_cache_metrics(caches: tuple = (summary_cache, facets_cache)) -> str:
+    """Counters of the given caches in the Prometheus text format.
+
+    Shared caches report no entries, evictions or expirations: those are
+    the cache server's.
+    """
+    all_stats = [cache.stats() for cache in caches]
+    lines = []
+    for stat, kind, help_text in (
+        ("hits", "counter", "Cache lookups served from the cache."),
+        ("misses", "counter", "Cache lookups that had to be recomputed."),
+        ("evictions", "counter", "Entries evicted to stay within the size bound."),
+        ("expirations", "counter", "Entries dropped because their TTL had passed."),
+        ("invalidations", "counter", "Entries dropped by trade writes."),
+        ("errors", "counter", "Cache backend operations that failed."),
+        ("entries", "gauge", "Entries currently cached."),
+        ("bytes", "gauge", "Bytes of cached response bodies."),
+    ):
+        name = f"logitrades_result_cache_{stat}" + ("_total" if kind == "counter" else "")
+        samples = [
+            f'{name}{{cache="{cache.name}"}} {stats[stat]}'
+            for cache, stats in zip(caches, all_stats)
+            if stat in stats
+        ]
+        if samples:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+    return "\n".join(lines) + "\n"
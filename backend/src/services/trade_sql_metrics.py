@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.orm import Query, Session
+
+from ..db import TradeORM
+from ..domain.trade.enums import TradeType
+from .trade_metrics import SUMMARY_WINDOW
+
+
+def effective_leverage():
+    """`trade.leverage or 1` as SQL."""
+    return func.coalesce(func.nullif(TradeORM.leverage, 0), 1.0)
+
+
+def absolute_pnl_expr():
+    """SQL twin of trade_metrics.calc_absolute_pnl (NULL for open trades).
+
+    Leveraged positions closed beyond the liquidation price lose the
+    posted margin (open notional / leverage) and nothing more.
+    """
+    leverage = effective_leverage()
+    open_price = TradeORM.open_price
+    close_price = TradeORM.close_price
+    quantity = TradeORM.quantity
+    is_buy = TradeORM.type == TradeType.buy.value
+    is_sell = TradeORM.type == TradeType.sell.value
+
+    liquidated = and_(
+        leverage > 1,
+        or_(
+            and_(is_buy, close_price <= open_price * (1 - 1 / leverage)),
+            and_(is_sell, close_price >= open_price * (1 + 1 / leverage)),
+        ),
+    )
+    return case(
+        (close_price.is_(None), None),
+        (liquidated, (-open_price * quantity) / leverage),
+        (is_buy, (close_price - open_price) * quantity),
+        else_=(open_price - close_price) * quantity,
+    )
+
+
+def is_open_expr():
+    """SQL twin of trade_metrics.is_open_trade: no close price yet."""
+    return TradeORM.close_price.is_(None)
+
+
+def is_closed_expr():
+    """SQL twin of trade_metrics.is_closed_trade."""
+    return TradeORM.close_price.isnot(None)
+
+
+def traded_volume_expr():
+    """SQL twin of trade_metrics.calc_traded_volume."""
+    return (TradeORM.open_price + func.coalesce(TradeORM.close_price, 0)) * TradeORM.quantity
+
+
+def _sum(expression):
+    return func.coalesce(func.sum(expression), 0.0)
+
+
+def compute_summary_sql(
+    db: Session,
+    user_id: int,
+    now: datetime | None = None,
+    query: Query | None = None,
+) -> dict[str, float]:
+    """compute_summary for one user as a single SUM(CASE ...) query.
+
+    `query` narrows the trades to a filtered trades Query (as built by
+    trade_query_service.build_filtered_query); the sums are then taken
+    over exactly the rows a list request with the same filters returns.
+    """
+    pivot = (now or datetime.now(timezone.utc)) - SUMMARY_WINDOW
+    pnl = absolute_pnl_expr()
+    in_window = TradeORM.opened_at >= pivot
+    is_open = is_open_expr()
+    is_closed = is_closed_expr()
+
+    columns = (
+        _sum(case((is_open, TradeORM.open_price * TradeORM.quantity), else_=0.0)),
+        _sum(case((and_(in_window, is_closed), pnl), else_=0.0)),
+        _sum(case((in_window, traded_volume_expr()), else_=0.0)),
+        _sum(func.coalesce(pnl, 0.0)),
+    )
+    if query is None:
+        row = db.execute(select(*columns).where(TradeORM.user_id == user_id)).one()
+    else:
+        row = query.order_by(None).with_entities(*columns).one()
+
+    open_equity, pnl_last_7_days, volume_last_7_days, total_pnl = row
+    return {
+        "open_equity": float(open_equity),
+        "pnl_last_7_days": float(pnl_last_7_days),
+        "volume_last_7_days": float(volume_last_7_days),
+        "total_pnl": float(total_pnl),
+    }
@@ -0,0 +1,82 @@
+from collections.abc import AsyncIterator, Iterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.trade.trade_list_query import TradeListQuery
+from ..models.trade.trade_response import TradeResponse
+from .trade_query_service import iter_trade_chunks
+from .trade_query_service_async import aiter_trade_chunks
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_LIST_JSON_HEAD = b'{"items":['
+
+
+def _list_json_tail(total: int) -> bytes:
+    return (
+        b'],"total":%d,"limit":null,"offset":0,'
+        b'"next_cursor":null,"prev_cursor":null,"has_more":null}' % total
+    )
+
+
+def _json_items(chunk: list[TradeResponse]) -> bytes:
+    return b",".join(item.model_dump_json().encode() for item in chunk)
+
+
+def _ndjson_lines(chunk: list[TradeResponse]) -> bytes:
+    return b"".join(item.model_dump_json().encode() + b"\n" for item in chunk)
+
+
+def iter_trade_list_json(
+    db: Session,
+    user_id: int,
+    query_params: TradeListQuery,
+) -> Iterator[bytes]:
+    """Stream an unpaginated TradeListResponse body chunk by chunk.
+
+    Items are written first and `total` last, so the bytes form the same
+    JSON object the buffered endpoint returns.
+    """
+    total = 0
+    yield _LIST_JSON_HEAD
+    for chunk in iter_trade_chunks(db, user_id, query_params):
+        body = _json_items(chunk)
+        yield (b"," + body) if total else body
+        total += len(chunk)
+    yield _list_json_tail(total)
+
+
+def iter_trade_ndjson(
+    db: Session,
+    user_id: int,
+    query_params: TradeListQuery,
+) -> Iterator[bytes]:
+    """Stream matching trades as newline-delimited JSON, one trade per line."""
+    for chunk in iter_trade_chunks(db, user_id, query_params):
+        yield _ndjson_lines(chunk)
+
+
+async def aiter_trade_list_json(
+    db: AsyncSession,
+    user_id: int,
+    query_params: TradeListQuery,
+) -> AsyncIterator[bytes]:
+    """iter_trade_list_json on an AsyncSession."""
+    total = 0
+    yield _LIST_JSON_HEAD
+    async for chunk in aiter_trade_chunks(db, user_id, query_params):
+        body = _json_items(chunk)
+        yield (b"," + body) if total else body
+        total += len(chunk)
+    yield _list_json_tail(total)
+
+
+async def aiter_trade_ndjson(
+    db: AsyncSession,
+    user_id: int,
+    query_params: TradeListQuery,
+) -> AsyncIterator[bytes]:
+    """iter_trade_ndjson on an AsyncSession."""
+    async for chunk in aiter_trade_chunks(db, user_id, query_params):
+        yield _ndjson_lines(chunk)
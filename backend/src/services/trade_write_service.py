@@ -0,0 +1,48 @@
+from collections.abc import Iterable
+
+from sqlalchemy.orm import Session
+
+from ..db import TradeORM
+from ..domain.trade.trade_domain import TradeDomain
+from .data_version_service import bump_data_version
+from .trade_aggregates_service import apply_aggregate_changes
+from .trade_count_cache import trade_count_cache
+from .trade_result_cache import facets_cache, summary_cache
+from .user_facets_service import apply_facet_changes, trade_facet_keys
+
+
+def apply_trade_changes(
+    db: Session,
+    user_id: int,
+    added: Iterable[TradeDomain | TradeORM] = (),
+    removed: Iterable[TradeDomain | TradeORM] = (),
+) -> None:
+    """Keep every derived per-user table in step with a trade write.
+
+    Call in the write's transaction, before commit. An update passes the
+    previous state in `removed` and the new state in `added`. Stored
+    trades are passed as their (row-locked) TradeORM rows, read before
+    they are modified: rows written before the current validators must
+    still be removable. Also bumps the user's data version, which
+    invalidates the read endpoints' ETags.
+    """
+    added = list(added)
+    removed = list(removed)
+    apply_facet_changes(
+        db,
+        user_id,
+        added=[key for t in added for key in trade_facet_keys(t.symbol, t.tags)],
+        removed=[key for t in removed for key in trade_facet_keys(t.symbol, t.tags)],
+    )
+    apply_aggregate_changes(db, user_id, added=added, removed=removed)
+    bump_data_version(db, user_id)
+
+
+def invalidate_trade_caches(user_id: int) -> None:
+    """Drop the user's cached counts, summaries and facets.
+
+    Call after the write commits, so no reader re-caches the old state.
+    """
+    trade_count_cache.invalidate_user(user_id)
+    summary_cache.invalidate_user(user_id)
+    facets_cache.invalidate_user(user_id)
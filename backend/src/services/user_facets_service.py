@@ -0,0 +1,114 @@
+from collections import Counter
+from collections.abc import Iterable
+
+from sqlalchemy import case, delete, func, literal, select, true
+from sqlalchemy.orm import Session
+
+from ..db import FACET_KIND_SYMBOL, FACET_KIND_TAG, TradeORM, UserFacetORM
+from .sql_dialect import dialect_name, upsert_insert
+
+FacetKey = tuple[str, str]
+
+
+def tag_elements(dialect: str, tags=TradeORM.tags):
+    """Table-valued expansion of a tags JSON column into one `value` row
+    per tag (TradeORM.tags unless another column is given).
+
+    Non-array JSON (a stored JSON null) expands to no rows.
+    """
+    if dialect == "postgresql":
+        tags_array = case((func.jsonb_typeof(tags) == "array", tags))
+        return func.jsonb_array_elements_text(tags_array).table_valued("value")
+    tags_array = case((func.json_type(tags) == "array", tags))
+    return func.json_each(tags_array).table_valued("value")
+
+
+def trade_facet_keys(symbol: str | None, tags: list[str] | None) -> list[FacetKey]:
+    """Facet entries one trade contributes to its owner's dictionary."""
+    keys: list[FacetKey] = []
+    if symbol:
+        keys.append((FACET_KIND_SYMBOL, symbol.upper()))
+    for tag in tags or ():
+        keys.append((FACET_KIND_TAG, tag))
+    return keys
+
+
+def apply_facet_changes(
+    db: Session,
+    user_id: int,
+    added: Iterable[FacetKey] = (),
+    removed: Iterable[FacetKey] = (),
+) -> None:
+    """Adjust reference counts in the caller's transaction.
+
+    Call before committing the trade write so both land atomically.
+    Counts are changed with a single upsert (ordered by key, so
+    concurrent writers lock rows in the same order); entries that drop
+    to zero are deleted.
+    """
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    rows = [
+        {"user_id": user_id, "kind": kind, "value": value, "trade_count": delta}
+        for (kind, value), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+
+    statement = upsert_insert(db)(UserFacetORM).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[UserFacetORM.user_id, UserFacetORM.kind, UserFacetORM.value],
+        set_={"trade_count": UserFacetORM.trade_count + statement.excluded.trade_count},
+    )
+    db.execute(statement)
+
+    if any(row["trade_count"] < 0 for row in rows):
+        db.execute(
+            delete(UserFacetORM).where(
+                UserFacetORM.user_id == user_id,
+                UserFacetORM.trade_count <= 0,
+            )
+        )
+
+
+def rebuild_user_facets(db: Session, user_id: int | None = None) -> None:
+    """Recompute the facet dictionary from trades (one user, or everyone).
+
+    Repair path for drift; runs in the caller's transaction.
+    """
+    clear = delete(UserFacetORM)
+    if user_id is not None:
+        clear = clear.where(UserFacetORM.user_id == user_id)
+    db.execute(clear)
+
+    symbol = func.upper(TradeORM.symbol)
+    symbol_counts = (
+        select(
+            TradeORM.user_id,
+            literal(FACET_KIND_SYMBOL).label("kind"),
+            symbol.label("value"),
+            func.count().label("trade_count"),
+        )
+        .where(TradeORM.symbol.isnot(None), TradeORM.symbol != "")
+        .group_by(TradeORM.user_id, symbol)
+    )
+
+    tag = tag_elements(dialect_name(db))
+    tag_counts = (
+        select(
+            TradeORM.user_id,
+            literal(FACET_KIND_TAG).label("kind"),
+            tag.c.value.label("value"),
+            func.count().label("trade_count"),
+        )
+        .select_from(TradeORM)
+        .join(tag, true())
+        .group_by(TradeORM.user_id, tag.c.value)
+    )
+
+    columns = ["user_id", "kind", "value", "trade_count"]
+    for counts in (symbol_counts, tag_counts):
+        if user_id is not None:
+            counts = counts.where(TradeORM.user_id == user_id)
+        db.execute(UserFacetORM.__table__.insert().from_select(columns, counts))
@@ -2,11 +2,31 @@ import os
 
 import pytest
 
-os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-pytest")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-pytest-0123456789")
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 os.environ.setdefault("ALLOWED_ORIGINS", "http://localhost:5173")
 
 
+def _clear_process_caches() -> None:
+    from ..routes.auth import user_info_cache
+    from ..services.trade_count_cache import trade_count_cache
+    from ..services.trade_page_cache import trade_page_cache
+    from ..services.trade_result_cache import facets_cache, summary_cache
+
+    for cache in (summary_cache, facets_cache, trade_count_cache, trade_page_cache, user_info_cache):
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """Every per-process cache, including the page cache's per-user data
+    versions: tests reuse user ids (and restart data versions) across
+    databases, so nothing may carry over from one test to the next."""
+    _clear_process_caches()
+    yield
+    _clear_process_caches()
+
+
 @pytest.fixture
 def fields_mapping() -> dict[str, str]:
     """Common fields mapping matching CSV headers to model fields."""
@@ -0,0 +1,176 @@
+"""Tests for /auth/me and its cached user profile."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from ..auth import create_auth_token
+from ..db import (
+    Base,
+    EmailVerificationTokenORM,
+    PasswordResetTokenORM,
+    RefreshTokenORM,
+    UserORM,
+)
+from ..models import ResetPasswordRequest, VerifyEmailRequest
+from ..routes.auth import (
+    get_current_user_info,
+    logout,
+    reset_password,
+    user_info_cache,
+    verify_email,
+)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db_session):
+    db_user = UserORM(username="trader", email="trader@example.com", hashed_password="x")
+    db_session.add(db_user)
+    db_session.commit()
+    return db_user
+
+
+def _me(db_session, access_token=None, refresh_token=None, response=None):
+    return get_current_user_info(
+        response or Response(),
+        db_session,
+        access_token=access_token,
+        refresh_token=refresh_token,
+    )
+
+
+def _refresh_token(db_session, user_id):
+    token = create_auth_token(user_id, "refresh")
+    db_session.add(RefreshTokenORM(token=token, user_id=user_id))
+    db_session.commit()
+    return token
+
+
+class TestCurrentUserInfo:
+    def test_profile_is_cached(self, db_session, user):
+        access_token = create_auth_token(user.id, "access")
+        first = _me(db_session, access_token)
+        assert (first.username, first.is_active, first.is_verified) == ("trader", True, False)
+        assert _me(db_session, access_token) == first
+        assert user_info_cache.stats()["hits"] == 1
+
+    def test_cache_hit_runs_no_query(self, db_session, user):
+        access_token = create_auth_token(user.id, "access")
+        _me(db_session, access_token)
+
+        statements = []
+        event.listen(
+            db_session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        assert _me(db_session, access_token).username == "trader"
+        assert statements == []
+
+    def test_deactivated_user_is_refused_despite_cache(self, db_session, user):
+        access_token = create_auth_token(user.id, "access")
+        _me(db_session, access_token)
+
+        user.is_active = False
+        db_session.commit()
+        with pytest.raises(HTTPException) as error:
+            _me(db_session, access_token)
+        assert error.value.status_code == 401
+
+    def test_deleted_user_is_refused_despite_cache(self, db_session, user):
+        access_token = create_auth_token(user.id, "access")
+        _me(db_session, access_token)
+
+        db_session.delete(user)
+        db_session.commit()
+        with pytest.raises(HTTPException) as error:
+            _me(db_session, access_token)
+        assert error.value.status_code == 401
+
+    def test_rotation_rechecks_the_user(self, db_session, user):
+        _me(db_session, create_auth_token(user.id, "access"))
+        user.is_active = False
+        db_session.commit()
+
+        refresh_token = _refresh_token(db_session, user.id)
+        response = Response()
+        with pytest.raises(HTTPException) as error:
+            _me(db_session, refresh_token=refresh_token, response=response)
+        assert error.value.status_code == 401
+        assert "set-cookie" not in response.headers
+        revoked = db_session.query(RefreshTokenORM).filter_by(token=refresh_token).one()
+        assert not revoked.revoked
+
+    def test_rotation_issues_new_tokens(self, db_session, user):
+        _me(db_session, create_auth_token(user.id, "access"))
+        refresh_token = _refresh_token(db_session, user.id)
+
+        response = Response()
+        assert _me(db_session, refresh_token=refresh_token, response=response).id == user.id
+        cookies = response.headers.getlist("set-cookie")
+        assert any(cookie.startswith("refresh_token=") for cookie in cookies)
+        assert any(cookie.startswith("access_token=") for cookie in cookies)
+        assert db_session.query(RefreshTokenORM).filter_by(token=refresh_token).one().revoked
+
+    def test_verify_email_invalidates_profile(self, db_session, user):
+        access_token = create_auth_token(user.id, "access")
+        assert not _me(db_session, access_token).is_verified
+
+        # Held in the session, not reloaded: SQLite hands datetimes back naive
+        token = EmailVerificationTokenORM(
+            token="verify-me",
+            user_id=user.id,
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        )
+        db_session.add(token)
+        db_session.flush()
+        verify_email(VerifyEmailRequest(token="verify-me"), db_session)
+
+        assert _me(db_session, access_token).is_verified
+
+    def test_logout_invalidates_profile(self, db_session, user):
+        access_token = create_auth_token(user.id, "access")
+        _me(db_session, access_token)
+
+        logout(Response(), db_session, refresh_token=_refresh_token(db_session, user.id))
+
+        assert user_info_cache.get(user.id) is None
+
+    def test_password_reset_invalidates_profile(self, db_session, user):
+        access_token = create_auth_token(user.id, "access")
+        _me(db_session, access_token)
+
+        token = PasswordResetTokenORM(
+            token="reset-me",
+            user_id=user.id,
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        )
+        db_session.add(token)
+        db_session.flush()
+        reset_password(ResetPasswordRequest(token="reset-me", password="N3w-password!"), db_session)
+
+        assert user_info_cache.get(user.id) is None
+
+    def test_rolled_back_update_keeps_profile(self, db_session, user):
+        access_token = create_auth_token(user.id, "access")
+        _me(db_session, access_token)
+
+        user.is_active = False
+        db_session.flush()
+        db_session.rollback()
+
+        assert user_info_cache.get(user.id) is not None
+        assert _me(db_session, access_token).is_active
@@ -0,0 +1,245 @@
+"""Tests for the cache backends and the shared per-user cache.
+
+The networked backend runs against StandInServer, a minimal in-process
+server speaking the subset of the Redis protocol the backend uses.
+"""
+
+import socketserver
+import threading
+import time
+
+import pytest
+from sqlalchemy.util.concurrency import greenlet_spawn
+
+from ..models.trade.trade_summary_response import TradeSummaryResponse
+from ..services.cache_backend import (
+    CacheBackendError,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    create_cache_backend,
+)
+from ..services.shared_cache import INT_CODEC, SharedResultCache, model_codec
+from ..services.trade_result_cache import render_cache_metrics
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2])
+            self.wfile.write(self.server.execute(args))
+
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password: str | None = None):
+        super().__init__(("127.0.0.1", 0), _RespHandler)
+        self.password = password
+        self.data: dict[bytes, tuple[float | None, bytes]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"redis://{host}:{port}/0"
+
+    def execute(self, args: list[bytes]) -> bytes:
+        name, *params = args
+        name = name.upper()
+        with self._lock:
+            if name == b"AUTH":
+                return b"+OK\r\n" if params[0].decode() == self.password else b"-WRONGPASS\r\n"
+            if name == b"SELECT":
+                return b"+OK\r\n"
+            if name == b"GET":
+                return self._bulk(self._get(params[0]))
+            if name == b"MGET":
+                return b"*%d\r\n" % len(params) + b"".join(self._bulk(self._get(k)) for k in params)
+            if name == b"SET":
+                key, value, _, ttl_ms = params
+                self.data[key] = (time.monotonic() + int(ttl_ms) / 1000, value)
+                return b"+OK\r\n"
+            if name == b"INCR":
+                value = int(self._get(params[0]) or 0) + 1
+                self.data[params[0]] = (None, str(value).encode())
+                return b":%d\r\n" % value
+            if name == b"DEL":
+                return b":%d\r\n" % (self.data.pop(params[0], None) is not None)
+            return b"-ERR unknown command\r\n"
+
+    def _get(self, key: bytes) -> bytes | None:
+        expires_at, value = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    @staticmethod
+    def _bulk(value: bytes | None) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+@pytest.fixture
+def server():
+    server = StandInServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request, server):
+    backend = MemoryCacheBackend() if request.param == "memory" else RedisCacheBackend.from_url(server.url)
+    yield backend
+    backend.close()
+
+
+def _unreachable_backend() -> RedisCacheBackend:
+    server = StandInServer()
+    port = server.server_address[1]
+    server.server_close()
+    return RedisCacheBackend(port=port, timeout_sec=0.2)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class TestBackends:
+    def test_get_set_delete(self, backend):
+        assert backend.get("a") is None
+        backend.set("a", b"1", ttl_sec=60)
+        backend.set("b", b"\r\n$-1\r\n", ttl_sec=60)
+        assert backend.get("a") == b"1"
+        assert backend.get_many(["a", "missing", "b"]) == [b"1", None, b"\r\n$-1\r\n"]
+        backend.delete("a")
+        assert backend.get("a") is None
+
+    def test_ttl(self, backend):
+        backend.set("a", b"1", ttl_sec=0.05)
+        time.sleep(0.1)
+        assert backend.get("a") is None
+
+    def test_incr(self, backend):
+        assert backend.incr("n") == 1
+        assert backend.incr("n") == 2
+        assert backend.get("n") == b"2"
+
+    def test_memory_lru_eviction(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set("a", b"1", ttl_sec=60)
+        backend.set("b", b"2", ttl_sec=60)
+        backend.get("a")
+        backend.set("c", b"3", ttl_sec=60)
+        assert backend.get_many(["a", "b", "c"]) == [b"1", None, b"3"]
+
+    def test_redis_reuses_connections(self, server):
+        backend = RedisCacheBackend.from_url(server.url)
+        for _ in range(5):
+            backend.get("a")
+        assert backend._idle and len(backend._idle) == 1
+        backend.close()
+
+    def test_redis_auth(self, server):
+        server.password = "s3cret"
+        assert RedisCacheBackend.from_url(server.url.replace("//", "//:s3cret@")).incr("n") == 1
+        with pytest.raises(CacheBackendError, match="WRONGPASS"):
+            RedisCacheBackend.from_url(server.url.replace("//", "//:wrong@")).incr("n")
+
+    def test_redis_unreachable(self):
+        with pytest.raises(CacheBackendError):
+            _unreachable_backend().get("a")
+
+    @pytest.mark.anyio
+    async def test_redis_leaves_the_event_loop_inside_run_sync(self, server, monkeypatch):
+        backend = RedisCacheBackend.from_url(server.url)
+        threads = []
+        blocking_command = backend._blocking_command
+
+        def record_thread(*args):
+            threads.append(threading.get_ident())
+            return blocking_command(*args)
+
+        monkeypatch.setattr(backend, "_blocking_command", record_thread)
+
+        def work():
+            backend.set("a", b"1", ttl_sec=60)
+            return backend.get("a")
+
+        # greenlet_spawn is what AsyncSession.run_sync runs its callable in
+        assert await greenlet_spawn(work) == b"1"
+        assert len(threads) == 2 and threading.get_ident() not in threads
+
+        threads.clear()
+        assert backend.get("a") == b"1"
+        assert threads == [threading.get_ident()]
+        backend.close()
+
+    def test_create_from_url(self):
+        assert isinstance(create_cache_backend("memory://"), MemoryCacheBackend)
+        assert isinstance(create_cache_backend("redis://cache:6380/2"), RedisCacheBackend)
+        with pytest.raises(ValueError):
+            create_cache_backend("memcached://cache")
+
+
+class TestSharedResultCache:
+    def test_round_trip_through_codec(self, backend):
+        cache = SharedResultCache("summary", backend, model_codec(TradeSummaryResponse), ttl_sec=60)
+        summary = TradeSummaryResponse(
+            open_equity=1.5, pnl_last_7_days=-2.0, volume_last_7_days=3.0, total_pnl=4.0
+        )
+        assert cache.get(1) is None
+        cache.set(1, None, summary)
+        assert cache.get(1) == summary
+        assert cache.get(2) is None
+
+    def test_invalidation_reaches_other_workers(self, server):
+        # Two workers: separate connections and caches on one server
+        first = SharedResultCache("counts", RedisCacheBackend.from_url(server.url), INT_CODEC, ttl_sec=60)
+        second = SharedResultCache("counts", RedisCacheBackend.from_url(server.url), INT_CODEC, ttl_sec=60)
+        first.set(1, ("closed",), 7)
+        first.set(2, ("closed",), 3)
+        assert second.get(1, ("closed",)) == 7
+
+        second.invalidate_user(1)
+        assert first.get(1, ("closed",)) is None
+        assert first.get(2, ("closed",)) == 3
+
+        first.clear()
+        assert second.get(2, ("closed",)) is None
+
+    def test_value_computed_before_a_write_is_not_served(self, backend):
+        cache = SharedResultCache("counts", backend, INT_CODEC, ttl_sec=60)
+        assert cache.get(1, "k") is None  # request starts computing
+        cache.invalidate_user(1)  # a write commits meanwhile
+        cache.set(1, "k", 5)  # the stale result is stored...
+        assert cache.get(1, "k") is None  # ...but never read
+
+    def test_expires_at_shortens_ttl(self, backend):
+        cache = SharedResultCache("counts", backend, INT_CODEC, ttl_sec=60)
+        cache.set(1, "past", 1, expires_at=time.monotonic() - 1)
+        cache.set(1, "soon", 2, expires_at=time.monotonic() + 0.05)
+        assert cache.get(1, "past") is None
+        assert cache.get(1, "soon") == 2
+        time.sleep(0.1)
+        assert cache.get(1, "soon") is None
+
+    def test_backend_failures_are_misses(self):
+        cache = SharedResultCache("counts", _unreachable_backend(), INT_CODEC, ttl_sec=60)
+        cache.set(1, "k", 5)
+        cache.invalidate_user(1)
+        assert cache.get(1, "k") is None
+        assert cache.stats() == {"hits": 0, "misses": 1, "invalidations": 0, "errors": 3}
+        assert 'logitrades_result_cache_errors_total{cache="counts"} 3' in render_cache_metrics((cache,))
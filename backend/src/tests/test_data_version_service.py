@@ -0,0 +1,93 @@
+"""Tests for the per-user data version and the ETags derived from it."""
+
+import random
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..db import Base, TradeORM
+from ..services.data_version_service import (
+    bump_data_version,
+    etag_matches,
+    get_data_version,
+    make_etag,
+    query_etag_parts,
+)
+from ..services.trade_write_service import apply_trade_changes
+from .test_trade_sql_metrics import _random_trade
+
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+class TestDataVersion:
+    def test_missing_row_reads_as_zero(self, db_session):
+        assert get_data_version(db_session, 1) == 0
+
+    def test_bump_is_per_user(self, db_session):
+        bump_data_version(db_session, 1)
+        bump_data_version(db_session, 1)
+        bump_data_version(db_session, 2)
+        db_session.commit()
+        assert get_data_version(db_session, 1) == 2
+        assert get_data_version(db_session, 2) == 1
+
+    def test_every_trade_write_bumps(self, db_session):
+        rng = random.Random(3)
+        trade = _random_trade(rng)
+        db_trade = TradeORM(**trade.to_dict())
+        db_trade.user_id = 1
+        db_session.add(db_trade)
+        apply_trade_changes(db_session, 1, added=[trade])
+        db_session.commit()
+        assert get_data_version(db_session, 1) == 1
+
+        apply_trade_changes(db_session, 1, removed=[trade])
+        db_session.delete(db_trade)
+        db_session.commit()
+        assert get_data_version(db_session, 1) == 2
+
+    def test_rollback_discards_bump(self, db_session):
+        bump_data_version(db_session, 1)
+        db_session.rollback()
+        assert get_data_version(db_session, 1) == 0
+
+
+class TestEtag:
+    def test_depends_on_version_user_scope_and_parts(self):
+        base = make_etag("trades", 1, 5, [("limit", "50")])
+        assert make_etag("trades", 1, 5, [("limit", "50")]) == base
+        assert make_etag("trades", 1, 6, [("limit", "50")]) != base
+        assert make_etag("trades", 2, 5, [("limit", "50")]) != base
+        assert make_etag("facets", 1, 5, [("limit", "50")]) != base
+        assert make_etag("trades", 1, 5, [("limit", "20")]) != base
+        assert base.startswith('W/"5-')
+
+    def test_query_parts_ignore_order(self):
+        assert query_etag_parts([("b", "2"), ("a", "1"), ("a", "0")]) == query_etag_parts(
+            [("a", "0"), ("b", "2"), ("a", "1")]
+        )
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            (None, False),
+            ("", False),
+            ("*", True),
+            ('W/"5-abc"', True),
+            ('"5-abc"', True),
+            ('"4-abc", W/"5-abc"', True),
+            ('W/"4-abc"', False),
+        ],
+    )
+    def test_if_none_match(self, header, expected):
+        assert etag_matches(header, 'W/"5-abc"') is expected
@@ -0,0 +1,149 @@
+"""Tests for the equity curve endpoint service."""
+
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..db import Base, TradeORM
+from ..models.trade.trade_list_query import TradeListQuery
+from ..services.equity_curve_service import (
+    compute_equity_curve,
+    downsample_indices,
+    lttb_indices,
+)
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+def _add_closed(session, pnls, user_id=1, symbol="BTCUSDT", start=START):
+    """Closed qty-1 buys with the given PnLs, closed one hour apart."""
+    for i, pnl in enumerate(pnls):
+        session.add(
+            TradeORM(
+                user_id=user_id,
+                symbol=symbol,
+                type="buy",
+                open_price=1000,
+                quantity=1,
+                opened_at=start + timedelta(hours=i),
+                close_price=1000 + pnl,
+                closed_at=start + timedelta(hours=i, minutes=30),
+            )
+        )
+    session.commit()
+
+
+class TestLttb:
+    def test_short_series_is_untouched(self):
+        assert lttb_indices([0, 1, 2], [1, 2, 3], 10) == [0, 1, 2]
+
+    def test_keeps_endpoints_and_threshold(self):
+        xs = list(range(1000))
+        ys = [math.sin(x / 50) for x in xs]
+        picked = lttb_indices(xs, ys, 100)
+        assert len(picked) == 100
+        assert picked[0] == 0 and picked[-1] == 999
+        assert picked == sorted(set(picked))
+
+    def test_keeps_a_spike(self):
+        xs = list(range(500))
+        ys = [0.0] * 500
+        ys[321] = 50.0
+        assert 321 in lttb_indices(xs, ys, 20)
+
+    def test_reserves_drawdown_extremes(self):
+        rng = random.Random(4)
+        equity = []
+        value = 0.0
+        for _ in range(5000):
+            value += rng.gauss(0.1, 1)
+            equity.append(value)
+        peak, peak_index = 0.0, None
+        drawdown, peaks = [], []
+        for i, value in enumerate(equity):
+            if value >= peak:
+                peak, peak_index = value, i
+            drawdown.append(value - peak)
+            peaks.append(peak_index)
+        trough = drawdown.index(min(drawdown))
+
+        picked = downsample_indices(list(range(5000)), equity, drawdown, peaks, 50)
+
+        assert len(picked) <= 50
+        assert trough in picked
+        assert peaks[trough] in picked
+
+    def test_peak_is_found_without_comparing_floats(self):
+        # equity[trough] - drawdown[trough] rounds away from the peak
+        # value, so the peak must come from where the running peak was set
+        equity = [0.0] * 10 + [0.1 + 0.2] + [0.0] * 9 + [-1000.0] + [0.0] * 9
+        peaks = [9] * 10 + [10] * 20
+        drawdown = [0.0] * 10 + [value - equity[10] for value in equity[10:]]
+        assert equity[20] - drawdown[20] != equity[10]
+
+        picked = downsample_indices(list(range(30)), equity, drawdown, peaks, 5)
+
+        assert 10 in picked and 20 in picked
+
+
+class TestEquityCurve:
+    def test_cumulative_equity_and_drawdown(self, db_session):
+        _add_closed(db_session, [10, 20, -5, -20, 15])
+        db_session.add(TradeORM(
+            user_id=1, symbol="X", type="buy", open_price=1, quantity=1,
+            opened_at=START,
+        ))
+        db_session.commit()
+
+        result = compute_equity_curve(db_session, 1, TradeListQuery())
+
+        assert result.total_points == 5
+        assert [p.equity for p in result.points] == pytest.approx([10, 30, 25, 5, 20])
+        assert [p.drawdown for p in result.points] == pytest.approx([0, 0, -5, -25, -10])
+        assert result.max_drawdown == pytest.approx(-25)
+        assert result.points[0].closed_at == START + timedelta(minutes=30)
+        assert result.points[0].closed_at.tzinfo is not None
+
+    def test_losses_from_the_start_count_as_drawdown(self, db_session):
+        _add_closed(db_session, [-10, 5])
+        result = compute_equity_curve(db_session, 1, TradeListQuery())
+        assert [p.drawdown for p in result.points] == pytest.approx([-10, -5])
+
+    def test_honors_filters(self, db_session):
+        _add_closed(db_session, [10, 10])
+        _add_closed(db_session, [-3, -4], symbol="ETHUSDT")
+        _add_closed(db_session, [100], user_id=2)
+
+        result = compute_equity_curve(db_session, 1, TradeListQuery(symbol="eth"))
+
+        assert [p.equity for p in result.points] == pytest.approx([-3, -7])
+
+    def test_downsamples_to_max_points(self, db_session):
+        rng = random.Random(9)
+        _add_closed(db_session, [round(rng.uniform(-10, 10), 2) for _ in range(600)])
+
+        full = compute_equity_curve(db_session, 1, TradeListQuery(), max_points=10_000)
+        small = compute_equity_curve(
+            db_session, 1, TradeListQuery(), max_points=40, chunk_size=64
+        )
+
+        assert small.total_points == full.total_points == 600
+        assert len(small.points) <= 40
+        assert small.points[0] == full.points[0]
+        assert small.points[-1] == full.points[-1]
+        assert small.max_drawdown == full.max_drawdown
+        assert min(p.drawdown for p in small.points) == small.max_drawdown
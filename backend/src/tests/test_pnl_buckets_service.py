@@ -0,0 +1,123 @@
+"""Tests for the bucketed PnL service."""
+
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from pydantic_core import PydanticCustomError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..db import Base, TradeORM
+from ..models.trade.trade_list_query import TradeListQuery
+from ..services.pnl_buckets_service import compute_pnl_buckets, period_start
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+def _add_closed(session, closed_at, pnl, user_id=1, symbol="BTCUSDT"):
+    session.add(
+        TradeORM(
+            user_id=user_id,
+            symbol=symbol,
+            type="buy",
+            open_price=1000,
+            quantity=1,
+            opened_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            close_price=1000 + pnl,
+            closed_at=closed_at,
+        )
+    )
+
+
+@pytest.fixture
+def trades(db_session):
+    # Wednesday 2025-01-29 23:30 UTC is Thursday 00:30 in Berlin
+    _add_closed(db_session, datetime(2025, 1, 29, 23, 30, tzinfo=timezone.utc), 10)
+    _add_closed(db_session, datetime(2025, 1, 31, 12, tzinfo=timezone.utc), -4)
+    # Sunday 2025-02-02 23:30 UTC is Monday 00:30 in Berlin
+    _add_closed(db_session, datetime(2025, 2, 2, 23, 30, tzinfo=timezone.utc), 6)
+    _add_closed(db_session, datetime(2025, 2, 3, 9, tzinfo=timezone.utc), 1, symbol="ETHUSDT")
+    _add_closed(db_session, datetime(2025, 2, 3, 9, tzinfo=timezone.utc), 100, user_id=2)
+    # Open trade is ignored
+    db_session.add(TradeORM(
+        user_id=1, symbol="X", type="buy", open_price=1, quantity=1,
+        opened_at=datetime(2025, 2, 1, tzinfo=timezone.utc),
+    ))
+    db_session.commit()
+    return db_session
+
+
+def _as_tuples(response):
+    return [(b.period_start, b.pnl, b.trade_count, b.win_count) for b in response.buckets]
+
+
+class TestPeriodStart:
+    def test_granularities(self):
+        value = datetime(2025, 3, 15, 12, tzinfo=timezone.utc)  # Saturday
+        utc = ZoneInfo("UTC")
+        assert period_start(value, "day", utc) == date(2025, 3, 15)
+        assert period_start(value, "week", utc) == date(2025, 3, 10)
+        assert period_start(value, "month", utc) == date(2025, 3, 1)
+
+
+class TestPnlBuckets:
+    def test_monthly_utc(self, trades):
+        result = compute_pnl_buckets(trades, 1, TradeListQuery(), granularity="month")
+        assert result.granularity == "month" and result.tz == "UTC"
+        assert _as_tuples(result) == [
+            (date(2025, 1, 1), pytest.approx(6), 2, 1),
+            (date(2025, 2, 1), pytest.approx(7), 2, 2),
+        ]
+
+    def test_daily_follows_time_zone(self, trades):
+        utc = compute_pnl_buckets(trades, 1, TradeListQuery(), granularity="day")
+        berlin = compute_pnl_buckets(
+            trades, 1, TradeListQuery(), granularity="day", tz="Europe/Berlin"
+        )
+        assert [b.period_start for b in utc.buckets] == [
+            date(2025, 1, 29), date(2025, 1, 31), date(2025, 2, 2), date(2025, 2, 3),
+        ]
+        assert [b.period_start for b in berlin.buckets] == [
+            date(2025, 1, 30), date(2025, 1, 31), date(2025, 2, 3),
+        ]
+
+    def test_weeks_start_on_monday(self, trades):
+        utc = compute_pnl_buckets(trades, 1, TradeListQuery(), granularity="week")
+        berlin = compute_pnl_buckets(
+            trades, 1, TradeListQuery(), granularity="week", tz="Europe/Berlin"
+        )
+        assert _as_tuples(utc) == [
+            (date(2025, 1, 27), pytest.approx(12), 3, 2),
+            (date(2025, 2, 3), pytest.approx(1), 1, 1),
+        ]
+        assert _as_tuples(berlin) == [
+            (date(2025, 1, 27), pytest.approx(6), 2, 1),
+            (date(2025, 2, 3), pytest.approx(7), 2, 2),
+        ]
+
+    def test_honors_filters(self, trades):
+        result = compute_pnl_buckets(
+            trades, 1, TradeListQuery(symbol="eth"), granularity="day"
+        )
+        assert _as_tuples(result) == [(date(2025, 2, 3), pytest.approx(1), 1, 1)]
+
+        result = compute_pnl_buckets(
+            trades,
+            1,
+            TradeListQuery(status="closed", date_from="2025-02-01"),
+            granularity="month",
+        )
+        assert _as_tuples(result) == [(date(2025, 2, 1), pytest.approx(7), 2, 2)]
+
+    def test_unknown_time_zone(self, trades):
+        with pytest.raises(PydanticCustomError):
+            compute_pnl_buckets(trades, 1, TradeListQuery(), tz="Mars/Olympus")
@@ -0,0 +1,86 @@
+"""Tests for the R-multiple histogram service."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic_core import PydanticCustomError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..db import Base, TradeORM
+from ..models.trade.trade_list_query import TradeListQuery
+from ..services.r_multiple_histogram_service import (
+    DEFAULT_R_EDGES,
+    compute_r_multiple_histogram,
+)
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    def add(r_multiple, stop_loss=90.0, symbol="BTCUSDT", user_id=1, closed=True):
+        # Long from 100 with 10 of planned risk per unit
+        session.add(
+            TradeORM(
+                user_id=user_id,
+                symbol=symbol,
+                type="buy",
+                open_price=100,
+                quantity=2,
+                opened_at=START,
+                stop_loss=stop_loss,
+                close_price=100 + 10 * r_multiple if closed else None,
+                closed_at=START + timedelta(hours=1) if closed else None,
+            )
+        )
+
+    for r_multiple in (-5, -1, -0.8, 0, 0.5, 1.5, 4, 7):
+        add(r_multiple)
+    add(3, symbol="ETHUSDT")
+    add(2, stop_loss=None)  # no stop loss
+    add(2, stop_loss=100.0)  # zero planned risk
+    add(0, closed=False)  # still open
+    add(1, user_id=2)
+    session.commit()
+    yield session
+    session.close()
+
+
+def _counts(result):
+    return [b.count for b in result.bins]
+
+
+class TestRMultipleHistogram:
+    def test_default_edges(self, db_session):
+        result = compute_r_multiple_histogram(db_session, 1, TradeListQuery())
+
+        assert result.edges == list(DEFAULT_R_EDGES)
+        assert result.bins[0].lower is None and result.bins[0].upper == -4
+        assert result.bins[-1].lower == 4 and result.bins[-1].upper is None
+        # <-4, [-4,-2), [-2,-1.2), [-1.2,-0.8), [-0.8,0.8), [0.8,1.2), [1.2,2), [2,4), >=4
+        assert _counts(result) == [1, 0, 0, 1, 3, 0, 1, 1, 2]
+        assert result.total == 9
+
+    def test_custom_edges(self, db_session):
+        result = compute_r_multiple_histogram(
+            db_session, 1, TradeListQuery(), edges=[0, 2]
+        )
+        assert [(b.lower, b.upper) for b in result.bins] == [(None, 0), (0, 2), (2, None)]
+        assert _counts(result) == [3, 3, 3]
+
+    def test_honors_filters(self, db_session):
+        result = compute_r_multiple_histogram(
+            db_session, 1, TradeListQuery(symbol="eth"), edges=[0]
+        )
+        assert _counts(result) == [0, 1]
+
+    @pytest.mark.parametrize("edges", [[1, 1], [2, 1], [float("nan")], list(range(51))])
+    def test_rejects_bad_edges(self, db_session, edges):
+        with pytest.raises(PydanticCustomError):
+            compute_r_multiple_histogram(db_session, 1, TradeListQuery(), edges=edges)
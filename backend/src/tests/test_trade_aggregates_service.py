@@ -0,0 +1,179 @@
+"""Tests for the running per-user summary aggregates."""
+
+import random
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from .. import main
+from ..db import Base, TradeORM, UserTradeAggregateORM, UserTradeDailyBucketORM
+from ..models.trade.trade_form import TradeForm
+from ..services.trade_aggregates_service import (
+    read_summary,
+    rebuild_trade_aggregates,
+)
+from ..services.trade_metrics import compute_summary
+from ..services.trade_write_service import apply_trade_changes
+from .test_trade_sql_metrics import NOW, _random_trade
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+def _create(session, user_id, trade):
+    db_trade = TradeORM(**trade.to_dict())
+    db_trade.user_id = user_id
+    session.add(db_trade)
+    apply_trade_changes(session, user_id, added=[trade])
+    session.commit()
+    return db_trade
+
+
+def _assert_summary(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-6), key
+
+
+def _snapshot(session):
+    aggregates = {
+        row.user_id: (
+            pytest.approx(row.open_equity),
+            pytest.approx(row.realized_pnl),
+            row.open_trades,
+            row.closed_trades,
+            pytest.approx(row.traded_volume),
+        )
+        for row in session.query(UserTradeAggregateORM)
+    }
+    buckets = {
+        (row.user_id, row.day): (
+            pytest.approx(row.closed_pnl, abs=1e-6),
+            pytest.approx(row.traded_volume, abs=1e-6),
+            row.trade_count,
+        )
+        for row in session.query(UserTradeDailyBucketORM)
+    }
+    return aggregates, buckets
+
+
+class TestIncrementalAggregates:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_writes_keep_summary_in_step(self, db_session, seed):
+        rng = random.Random(seed)
+        live = {}
+        for _ in range(60):
+            trade = _random_trade(rng)
+            live[_create(db_session, 1, trade).id] = trade
+
+        # Update a few trades (old state out, new state in)
+        for trade_id in rng.sample(sorted(live), 10):
+            db_trade = db_session.get(TradeORM, trade_id)
+            replacement = _random_trade(rng)
+            apply_trade_changes(db_session, 1, added=[replacement], removed=[db_trade])
+            for key, value in replacement.to_dict().items():
+                if key not in ("id", "created_at"):
+                    setattr(db_trade, key, value)
+            db_session.commit()
+            live[trade_id] = replacement
+
+        # And delete some
+        for trade_id in rng.sample(sorted(live), 15):
+            db_trade = db_session.get(TradeORM, trade_id)
+            apply_trade_changes(db_session, 1, removed=[db_trade])
+            db_session.delete(db_trade)
+            db_session.commit()
+            del live[trade_id]
+
+        expected = compute_summary(list(live.values()), now=NOW)
+        _assert_summary(read_summary(db_session, 1, now=NOW), expected)
+
+    def test_rebuild_matches_incremental(self, db_session):
+        rng = random.Random(42)
+        for user_id in (1, 2):
+            for _ in range(40):
+                _create(db_session, user_id, _random_trade(rng))
+        incremental = _snapshot(db_session)
+
+        rebuild_trade_aggregates(db_session)
+        db_session.commit()
+
+        assert _snapshot(db_session) == incremental
+
+    def test_empty_buckets_are_removed(self, db_session):
+        rng = random.Random(7)
+        trade = _random_trade(rng)
+        db_trade = _create(db_session, 1, trade)
+        apply_trade_changes(db_session, 1, removed=[db_trade])
+        db_session.delete(db_trade)
+        db_session.commit()
+        assert db_session.query(UserTradeDailyBucketORM).count() == 0
+
+    def test_pivot_day_is_split_exactly(self, db_session):
+        rng = random.Random(3)
+        pivot = NOW - timedelta(days=7)
+        trades = []
+        for minutes in (-30, -1, 1, 30):
+            trade = _random_trade(rng)
+            trade.opened_at = pivot + timedelta(minutes=minutes)
+            trade.close_price = trade.open_price * 1.1
+            trade.closed_at = trade.opened_at + timedelta(hours=1)
+            trades.append(trade)
+            _create(db_session, 1, trade)
+
+        expected = compute_summary(trades, now=NOW)
+        _assert_summary(read_summary(db_session, 1, now=NOW), expected)
+
+    def test_user_without_trades(self, db_session):
+        _assert_summary(read_summary(db_session, 9, now=NOW), compute_summary([], now=NOW))
+
+
+class TestLegacyRows:
+    """Rows stored before the current validators must stay editable."""
+
+    @pytest.fixture
+    def legacy_trade(self, db_session):
+        # Closed without a close time: rejected by TradeDomain today
+        db_trade = TradeORM(
+            user_id=1,
+            symbol="BTCUSDT",
+            type="buy",
+            open_price=100.0,
+            quantity=2.0,
+            opened_at=NOW - timedelta(days=2),
+            close_price=110.0,
+            closed_at=None,
+            created_at=NOW - timedelta(days=2),
+        )
+        db_session.add(db_trade)
+        db_session.flush()
+        rebuild_trade_aggregates(db_session)
+        db_session.commit()
+        with pytest.raises(ValueError):
+            db_trade.to_domain()
+        return db_trade
+
+    def test_delete(self, db_session, legacy_trade):
+        main.delete_trade(legacy_trade.id, db_session, user_id=1)
+        assert db_session.query(TradeORM).count() == 0
+        _assert_summary(read_summary(db_session, 1, now=NOW), compute_summary([], now=NOW))
+
+    def test_update(self, db_session, legacy_trade, valid_trade_form):
+        updated = main.update_trade(
+            legacy_trade.id, TradeForm(**valid_trade_form), db_session, user_id=1
+        )
+        assert updated.close_price is None
+        incremental = _snapshot(db_session)
+
+        rebuild_trade_aggregates(db_session)
+        db_session.commit()
+        assert _snapshot(db_session) == incremental
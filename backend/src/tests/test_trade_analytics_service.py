@@ -0,0 +1,170 @@
+"""Tests for the dashboard analytics service."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..db import Base, TradeORM
+from ..domain.trade.enums import TradeType
+from ..models.trade.trade_list_query import TradeListQuery
+from ..services.trade_analytics_service import compute_trade_analytics
+from ..services.trade_metrics import calc_absolute_pnl
+from .test_trade_sql_metrics import _random_trade
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+def _add_closed(session, pnl_per_unit, hours, **overrides):
+    """Closed buy trades (qty 1) whose PnL is each value, closed hourly."""
+    for i, pnl in enumerate(pnl_per_unit):
+        fields = dict(
+            user_id=1,
+            symbol="BTCUSDT",
+            type="buy",
+            open_price=100,
+            quantity=1,
+            opened_at=START + timedelta(hours=hours * i),
+            close_price=100 + pnl,
+            closed_at=START + timedelta(hours=hours * i + hours),
+            stop_loss=90,
+        )
+        fields.update(overrides)
+        session.add(TradeORM(**fields))
+    session.commit()
+
+
+def _reference(trades):
+    """Straight port of the dashboard's calcFunctions."""
+    closed = sorted(
+        (t for t in trades if t.close_price is not None and t.closed_at is not None),
+        key=lambda t: t.closed_at,
+    )
+    pnls = [calc_absolute_pnl(t) for t in closed]
+    wins = [p for p in pnls if p > 0]
+    losses = [p for p in pnls if p < 0]
+    equity = peak = max_dd = 0.0
+    for p in pnls:
+        equity += p
+        peak = max(peak, equity)
+        max_dd = max(max_dd, peak - equity)
+    ratios = [
+        calc_absolute_pnl(t) / (abs(t.stop_loss - t.open_price) * t.quantity)
+        for t in closed
+        if t.stop_loss is not None and t.stop_loss != t.open_price
+    ]
+    return {
+        "closed_trades": len(closed),
+        "winrate": len(wins) / len(closed),
+        "gross_profit": sum(wins),
+        "gross_loss": sum(losses),
+        "expectancy": sum(pnls) / len(closed),
+        "best_trade": max(pnls),
+        "worst_trade": min(pnls),
+        "max_drawdown": -max_dd,
+        "average_risk_reward": sum(ratios) / len(ratios) if ratios else None,
+        "average_duration_seconds": sum(
+            (t.closed_at - t.opened_at).total_seconds() for t in closed
+        ) / len(closed),
+    }
+
+
+class TestTradeAnalytics:
+    def test_empty(self, db_session):
+        result = compute_trade_analytics(db_session, 1, TradeListQuery())
+        assert result.closed_trades == 0
+        assert result.winrate == 0
+        assert result.profit_factor == 0
+        assert result.best_trade is None
+        assert result.average_risk_reward is None
+
+    def test_streaks_drawdown_and_ratios(self, db_session):
+        # equity: 10, 30, 25, 15, 10, 10, 40 -> peak 30, trough 10
+        _add_closed(db_session, [10, 20, -5, -10, -5, 0, 30], hours=2)
+        # Open trades are ignored
+        db_session.add(TradeORM(
+            user_id=1, symbol="X", type="buy", open_price=1, quantity=1,
+            opened_at=START,
+        ))
+        db_session.commit()
+
+        result = compute_trade_analytics(db_session, 1, TradeListQuery())
+
+        assert result.closed_trades == 7
+        assert result.winrate == pytest.approx(3 / 7)
+        assert result.average_win == pytest.approx(20)
+        assert result.average_loss == pytest.approx(-20 / 3)
+        assert result.gross_profit == pytest.approx(60)
+        assert result.gross_loss == pytest.approx(-20)
+        assert result.profit_factor == pytest.approx(3)
+        assert result.expectancy == pytest.approx(40 / 7)
+        assert result.best_trade == pytest.approx(30)
+        assert result.worst_trade == pytest.approx(-10)
+        assert result.max_win_streak == 2
+        assert result.max_loss_streak == 3
+        assert result.average_duration_seconds == pytest.approx(2 * 3600)
+        assert result.max_drawdown == pytest.approx(-20)
+        assert result.max_drawdown_pct == pytest.approx(-20 / 30)
+        # Planned risk is 10 per trade
+        assert result.average_risk_reward == pytest.approx(40 / 7 / 10)
+
+    def test_profit_factor_without_losses(self, db_session):
+        _add_closed(db_session, [5, 5], hours=1)
+        result = compute_trade_analytics(db_session, 1, TradeListQuery())
+        assert result.profit_factor is None
+
+    def test_honors_list_filters(self, db_session):
+        _add_closed(db_session, [10, 10], hours=1)
+        _add_closed(db_session, [-5], hours=1, symbol="ETHUSDT", tags=["scalp"])
+        _add_closed(db_session, [7], hours=1, user_id=2)
+
+        by_symbol = compute_trade_analytics(db_session, 1, TradeListQuery(symbol="eth"))
+        by_tag = compute_trade_analytics(db_session, 1, TradeListQuery(tags=["scalp"]))
+        open_only = compute_trade_analytics(db_session, 1, TradeListQuery(status="open"))
+        by_type = compute_trade_analytics(
+            db_session, 1, TradeListQuery(type=TradeType.sell)
+        )
+
+        assert by_symbol.closed_trades == 1
+        assert by_symbol.gross_loss == pytest.approx(-5)
+        assert by_tag.closed_trades == 1
+        assert open_only.closed_trades == 0
+        assert by_type.closed_trades == 0
+
+    def test_ignores_pagination(self, db_session):
+        _add_closed(db_session, [1] * 5, hours=1)
+        result = compute_trade_analytics(
+            db_session, 1, TradeListQuery(limit=2, offset=3, sort_order="asc")
+        )
+        assert result.closed_trades == 5
+
+    def test_matches_reference_on_random_trades(self, db_session):
+        rng = random.Random(8)
+        trades = []
+        for _ in range(300):
+            trade = _random_trade(rng)
+            if rng.random() < 0.5:
+                below = trade.type == TradeType.buy
+                trade.stop_loss = trade.open_price * (0.9 if below else 1.1)
+            trades.append(trade)
+            db_trade = TradeORM(**trade.to_dict())
+            db_trade.user_id = 1
+            db_session.add(db_trade)
+        db_session.commit()
+
+        result = compute_trade_analytics(db_session, 1, TradeListQuery(), chunk_size=7)
+
+        for key, value in _reference(trades).items():
+            assert getattr(result, key) == pytest.approx(value), key
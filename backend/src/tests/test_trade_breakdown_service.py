@@ -0,0 +1,99 @@
+"""Tests for the per-symbol/side/tag statistics service."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..db import Base, TradeORM
+from ..models.trade.trade_list_query import TradeListQuery
+from ..services.trade_breakdown_service import compute_trade_breakdown
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    def add(symbol, type_, pnl=None, tags=None, user_id=1):
+        closed = pnl is not None
+        session.add(
+            TradeORM(
+                user_id=user_id,
+                symbol=symbol,
+                type=type_,
+                open_price=100,
+                quantity=1,
+                opened_at=START,
+                close_price=(100 + pnl if type_ == "buy" else 100 - pnl) if closed else None,
+                closed_at=START + timedelta(hours=1) if closed else None,
+                tags=tags,
+            )
+        )
+
+    add("btcusdt", "buy", 10, ["breakout"])
+    add("BTCUSDT", "sell", -4, ["breakout", "news"])
+    add("BTCUSDT", "buy", None, ["news"])
+    add("ETHUSDT", "buy", 2)
+    add("SOLUSDT", "sell", 0, [])
+    add("BTCUSDT", "buy", 50, ["breakout"], user_id=2)
+    session.commit()
+    yield session
+    session.close()
+
+
+def _by_key(groups):
+    return {group.key: group for group in groups}
+
+
+class TestTradeBreakdown:
+    def test_groups_by_symbol_side_and_tag(self, db_session):
+        result = compute_trade_breakdown(db_session, 1, TradeListQuery())
+
+        symbols = _by_key(result.by_symbol)
+        assert list(symbols) == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+        btc = symbols["BTCUSDT"]
+        assert (btc.trade_count, btc.closed_trades, btc.win_count) == (3, 2, 1)
+        assert btc.winrate == pytest.approx(0.5)
+        assert btc.realized_pnl == pytest.approx(6)
+        assert btc.average_pnl == pytest.approx(3)
+        # (open + close) * qty, open trades count the open leg only
+        assert btc.volume == pytest.approx(210 + 204 + 100)
+
+        sides = _by_key(result.by_side)
+        assert sides["buy"].trade_count == 3
+        assert sides["buy"].realized_pnl == pytest.approx(12)
+        assert sides["sell"].closed_trades == 2
+        assert sides["sell"].win_count == 0
+
+        tags = _by_key(result.by_tag)
+        assert set(tags) == {"breakout", "news"}
+        assert tags["breakout"].trade_count == 2
+        assert tags["breakout"].realized_pnl == pytest.approx(6)
+        assert tags["news"].trade_count == 2
+        assert tags["news"].closed_trades == 1
+
+    def test_top_limits_each_dimension_by_volume(self, db_session):
+        result = compute_trade_breakdown(db_session, 1, TradeListQuery(), top=1)
+
+        assert [g.key for g in result.by_symbol] == ["BTCUSDT"]
+        assert [g.key for g in result.by_side] == ["buy"]
+        assert [g.key for g in result.by_tag] == ["breakout"]
+
+    def test_honors_filters(self, db_session):
+        result = compute_trade_breakdown(db_session, 1, TradeListQuery(status="closed"))
+        assert _by_key(result.by_symbol)["BTCUSDT"].trade_count == 2
+        assert set(_by_key(result.by_tag)) == {"breakout", "news"}
+
+        result = compute_trade_breakdown(db_session, 1, TradeListQuery(tags=["news"]))
+        assert [g.key for g in result.by_symbol] == ["BTCUSDT"]
+        assert _by_key(result.by_tag)["breakout"].trade_count == 1
+
+    def test_empty(self, db_session):
+        result = compute_trade_breakdown(db_session, 3, TradeListQuery())
+        assert result.by_symbol == result.by_side == result.by_tag == []
@@ -0,0 +1,142 @@
+"""Parity tests: NumPy metrics engine vs the scalar reference implementation."""
+
+import math
+import random
+from datetime import timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from ..db import Base
+from ..domain.trade.enums import TradeType
+from ..domain.trade.trade_domain import TradeDomain
+from ..services.trade_metrics import calc_absolute_pnl, calc_traded_volume, compute_summary
+from ..services.trade_metrics_numpy import (
+    TRADE_COLUMNS,
+    TradeColumns,
+    absolute_pnl,
+    load_trade_columns,
+    traded_volume,
+)
+from .test_trade_sql_metrics import NOW, _random_trade, _store
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+def _rows(trades: list[TradeDomain]) -> list[tuple]:
+    """Trades as the rows load_trade_columns selects."""
+    return [
+        (t.open_price, t.close_price, t.quantity, t.leverage, t.type, t.opened_at)
+        for t in trades
+    ]
+
+
+def _assert_summary(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-6), key
+
+
+class TestColumnarPnl:
+    @pytest.mark.parametrize(
+        ("trade_type", "leverage", "close_price"),
+        [
+            (TradeType.buy, None, 120.0),
+            (TradeType.sell, 1, 120.0),
+            (TradeType.buy, 10, 90.0),  # exactly at long liquidation
+            (TradeType.buy, 10, 95.0),
+            (TradeType.sell, 5, 120.0),  # exactly at short liquidation
+            (TradeType.sell, 5, 119.0),
+            (TradeType.buy, 0, 50.0),  # 0 leverage behaves like 1
+        ],
+    )
+    def test_matches_scalar(self, trade_type, leverage, close_price):
+        trade = TradeDomain(
+            symbol="BTC",
+            type=trade_type,
+            open_price=100.0,
+            quantity=2.0,
+            opened_at=NOW - timedelta(hours=1),
+            leverage=leverage,
+            close_price=close_price,
+            closed_at=NOW,
+        )
+        pnl = absolute_pnl(TradeColumns.from_rows(_rows([trade])))
+        assert pnl[0] == pytest.approx(calc_absolute_pnl(trade))
+
+    def test_random_trades_match_scalar(self):
+        rng = random.Random(11)
+        trades = [_random_trade(rng) for _ in range(500)]
+        cols = TradeColumns.from_rows(_rows(trades))
+        pnl = absolute_pnl(cols)
+        volume = traded_volume(cols)
+        for i, trade in enumerate(trades):
+            expected = calc_absolute_pnl(trade)
+            if expected is None:
+                assert math.isnan(pnl[i])
+            else:
+                assert pnl[i] == pytest.approx(expected)
+            assert volume[i] == pytest.approx(calc_traded_volume(trade))
+
+
+class TestColumnarSummary:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_reference(self, seed):
+        rng = random.Random(seed)
+        trades = [_random_trade(rng) for _ in range(300)]
+        _assert_summary(
+            compute_summary(_rows(trades), now=NOW, engine="numpy"),
+            compute_summary(trades, now=NOW),
+        )
+
+    def test_empty(self):
+        _assert_summary(
+            compute_summary([], now=NOW, engine="numpy"),
+            compute_summary([], now=NOW),
+        )
+
+    def test_legacy_row_counts_as_closed(self):
+        # close_price without closed_at; TradeDomain rejects such rows
+        rows = [(100.0, 110.0, 1.0, None, "buy", NOW - timedelta(days=1))]
+        summary = compute_summary(rows, now=NOW, engine="numpy")
+        assert summary["open_equity"] == 0
+        assert summary["pnl_last_7_days"] == pytest.approx(10.0)
+        assert summary["total_pnl"] == pytest.approx(10.0)
+
+    def test_loads_user_trades_from_db(self, db_session):
+        rng = random.Random(5)
+        mine = [_random_trade(rng) for _ in range(100)]
+        _store(db_session, 1, mine)
+        _store(db_session, 2, [_random_trade(rng) for _ in range(50)])
+
+        cols = load_trade_columns(db_session, 1)
+
+        assert len(cols) == 100
+        _assert_summary(
+            compute_summary(cols, now=NOW, engine="numpy"),
+            compute_summary(mine, now=NOW),
+        )
+
+    def test_accepts_query_rows(self, db_session):
+        rng = random.Random(6)
+        trades = [_random_trade(rng) for _ in range(50)]
+        _store(db_session, 1, trades)
+
+        rows = db_session.execute(select(*TRADE_COLUMNS)).all()
+
+        _assert_summary(
+            compute_summary(rows, now=NOW, engine="numpy"),
+            compute_summary(trades, now=NOW),
+        )
@@ -0,0 +1,109 @@
+"""Tests for the encoded /trades page cache."""
+
+import time
+
+import pytest
+
+from ..models.trade.trade_list_query import TradeListQuery
+from ..services.trade_page_cache import TradePageCache
+from ..services.trade_query_service import list_query_key
+
+
+class TestTradePageCache:
+    def test_hit_requires_same_version_and_key(self):
+        cache = TradePageCache()
+        cache.set("trades", 1, 3, ("k",), b"page")
+        assert cache.get("trades", 1, 3, ("k",)) == b"page"
+        assert cache.get("trades", 1, 4, ("k",)) is None
+        assert cache.get("trades", 2, 3, ("k",)) is None
+        assert cache.get("trades", 1, 3, ("other",)) is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 3
+
+    def test_newer_version_drops_older_entries(self):
+        cache = TradePageCache()
+        cache.set("trades", 1, 3, "a", b"aaaa")
+        cache.set("trades", 1, 3, "b", b"bb")
+        cache.set("trades", 2, 7, "a", b"x")
+        cache.set("trades", 1, 4, "a", b"new")
+        assert cache.get("trades", 1, 3, "b") is None
+        assert cache.get("trades", 2, 7, "a") == b"x"
+        assert cache.stats() == {
+            "entries": 2,
+            "bytes": 4,
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 2,
+        }
+
+    def test_page_from_before_a_seen_write_is_not_stored(self):
+        cache = TradePageCache()
+        cache.set("trades", 1, 5, "a", b"new")
+        cache.set("trades", 1, 4, "a", b"old")
+        assert cache.get("trades", 1, 4, "a") is None
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        cache = TradePageCache(max_bytes=10)
+        cache.set("trades", 1, 0, "a", b"1234")
+        cache.set("trades", 2, 0, "b", b"1234")
+        cache.get("trades", 1, 0, "a")
+        cache.set("trades", 3, 0, "c", b"1234")
+        assert cache.get("trades", 2, 0, "b") is None
+        assert cache.get("trades", 1, 0, "a") == b"1234"
+        assert cache.stats()["bytes"] == 8
+        assert cache.stats()["evictions"] == 1
+
+    def test_skips_oversized_bodies(self):
+        cache = TradePageCache(max_entry_bytes=3)
+        cache.set("trades", 1, 0, "a", b"1234")
+        assert cache.get("trades", 1, 0, "a") is None
+        assert cache.stats()["bytes"] == 0
+
+    def test_ttl(self, monkeypatch):
+        cache = TradePageCache(ttl_sec=10)
+        cache.set("trades", 1, 0, "a", b"1")
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+        assert cache.get("trades", 1, 0, "a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_disable_per_endpoint(self):
+        cache = TradePageCache(disabled_endpoints={"trades"})
+        cache.set("trades", 1, 0, "a", b"1")
+        cache.set("analytics", 1, 0, "a", b"2")
+        assert cache.get("trades", 1, 0, "a") is None
+        assert cache.get("analytics", 1, 0, "a") == b"2"
+        assert not cache.enabled("trades")
+
+        cache.enable("trades")
+        cache.set("trades", 1, 0, "a", b"1")
+        assert cache.get("trades", 1, 0, "a") == b"1"
+
+
+class TestListQueryKey:
+    def test_equivalent_queries_share_a_key(self):
+        assert list_query_key(TradeListQuery(symbol="BTC", tags=["b", "a", "a"])) == list_query_key(
+            TradeListQuery(symbol="btc", tags=["a", "b"])
+        )
+        assert list_query_key(TradeListQuery(date_from="2025-01-01")) == list_query_key(
+            TradeListQuery(date_from="2025-01-01T00:00:00Z")
+        )
+
+    @pytest.mark.parametrize(
+        "update",
+        [
+            {"limit": 20},
+            {"offset": 50},
+            {"cursor": "abc"},
+            {"paginate": False},
+            {"sort_by": "pnl"},
+            {"sort_order": "asc"},
+            {"count": "none"},
+            {"status": "open"},
+        ],
+    )
+    def test_page_params_change_the_key(self, update):
+        query = TradeListQuery()
+        assert list_query_key(query) != list_query_key(query.model_copy(update=update))
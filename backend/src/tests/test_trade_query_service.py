@@ -1,19 +1,35 @@
 """Tests for trade list query service."""
 
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+
+import json
 
 import pytest
+from pydantic_core import PydanticCustomError
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from ..db import Base, TradeORM
 from ..domain.trade.enums import TradeType
 from ..models.trade.trade_list_query import TradeListQuery
+from ..models.trade.trade_response import TradeResponse
+from ..services.trade_count_cache import TradeCountCache, trade_count_cache
+from ..services.user_facets_service import (
+    apply_facet_changes,
+    rebuild_user_facets,
+    trade_facet_keys,
+)
+from ..services.trade_aggregates_service import rebuild_trade_aggregates
+from ..services.trade_write_service import apply_trade_changes
+from ..services.trade_stream import iter_trade_list_json, iter_trade_ndjson
 from ..services.trade_query_service import (
-    _lower_bound_iso,
-    _upper_bound_iso,
+    iter_trade_chunks,
+    _apply_status_filter,
+    _lower_bound,
+    _upper_bound,
     get_facets,
     get_summary,
+    has_filters,
     list_trades,
 )
 
@@ -32,10 +48,10 @@ def db_session():
             type="buy",
             open_price=100,
             quantity=10,
-            opened_at="2025-06-01T10:00:00Z",
+            opened_at=datetime(2025, 6, 1, 10, tzinfo=timezone.utc),
             close_price=None,
             closed_at=None,
-            created_at="2025-06-01T10:00:00Z",
+            created_at=datetime(2025, 6, 1, 10, tzinfo=timezone.utc),
             tags=["breakout"],
         )
     )
@@ -46,10 +62,10 @@ def db_session():
             type="sell",
             open_price=200,
             quantity=5,
-            opened_at="2025-05-01T10:00:00Z",
+            opened_at=datetime(2025, 5, 1, 10, tzinfo=timezone.utc),
             close_price=180,
-            closed_at="2025-05-10T10:00:00Z",
-            created_at="2025-05-01T10:00:00Z",
+            closed_at=datetime(2025, 5, 10, 10, tzinfo=timezone.utc),
+            created_at=datetime(2025, 5, 1, 10, tzinfo=timezone.utc),
             tags=["scalp", "eth"],
         )
     )
@@ -60,12 +76,14 @@ def db_session():
             type="buy",
             open_price=50,
             quantity=1,
-            opened_at="2025-01-01T10:00:00Z",
+            opened_at=datetime(2025, 1, 1, 10, tzinfo=timezone.utc),
             close_price=None,
             closed_at=None,
-            created_at="2025-01-01T10:00:00Z",
+            created_at=datetime(2025, 1, 1, 10, tzinfo=timezone.utc),
         )
     )
+    rebuild_user_facets(session)
+    rebuild_trade_aggregates(session)
     session.commit()
     yield session
     session.close()
@@ -81,6 +99,11 @@ class TestListTrades:
         assert result.total == 1
         assert result.items[0].symbol == "btcusdt"
 
+    def test_open_status_matches_partial_index_predicate(self, db_session):
+        query = _apply_status_filter(db_session.query(TradeORM), "open")
+        where = str(query.statement.whereclause)
+        assert where == "trades.close_price IS NULL"
+
     def test_status_closed(self, db_session):
         result = list_trades(
             db_session,
@@ -98,6 +121,20 @@ class TestListTrades:
         )
         assert result.total == 1
 
+    def test_symbol_prefix_match(self, db_session):
+        prefix = list_trades(
+            db_session, 1, TradeListQuery(symbol="eth", symbol_match="prefix")
+        )
+        assert [t.symbol for t in prefix.items] == ["ETHUSDT"]
+        not_prefix = list_trades(
+            db_session, 1, TradeListQuery(symbol="USDT", symbol_match="prefix")
+        )
+        assert not_prefix.total == 0
+
+    def test_symbol_wildcards_are_literal(self, db_session):
+        assert list_trades(db_session, 1, TradeListQuery(symbol="%")).total == 0
+        assert list_trades(db_session, 1, TradeListQuery(symbol="BTC_SDT")).total == 0
+
     def test_type_filter(self, db_session):
         result = list_trades(
             db_session,
@@ -106,6 +143,14 @@ class TestListTrades:
         )
         assert result.total == 1
 
+    def test_tags_filter_any_match(self, db_session):
+        result = list_trades(db_session, 1, TradeListQuery(tags=["eth", "missing"]))
+        assert [t.symbol for t in result.items] == ["ETHUSDT"]
+
+    def test_tags_filter_no_match(self, db_session):
+        result = list_trades(db_session, 1, TradeListQuery(tags=["missing"]))
+        assert result.total == 0
+
     def test_pagination(self, db_session):
         result = list_trades(
             db_session,
@@ -148,6 +193,41 @@ class TestListTrades:
         )
         assert result.total == 0
 
+    def test_timestamps_round_trip_as_utc(self, db_session):
+        msk = timezone(timedelta(hours=3))
+        db_session.add(
+            TradeORM(
+                user_id=3,
+                symbol="TZ",
+                type="buy",
+                open_price=1,
+                quantity=1,
+                opened_at=datetime(2025, 6, 1, 13, tzinfo=msk),
+            )
+        )
+        db_session.commit()
+        db_session.expire_all()
+        item = list_trades(db_session, 3, TradeListQuery()).items[0]
+        assert item.opened_at == datetime(2025, 6, 1, 10, tzinfo=timezone.utc)
+        assert item.opened_at.utcoffset() == timedelta(0)
+        assert item.created_at.tzinfo is not None
+
+    def test_projection_matches_validated_serialization(self, db_session):
+        """Unvalidated list items must serialize exactly like validated ones."""
+        result = list_trades(db_session, 1, TradeListQuery(paginate=False))
+        expected = [
+            TradeResponse.model_validate(t).model_dump_json()
+            for t in (
+                db_session.query(TradeORM)
+                .filter(TradeORM.user_id == 1)
+                .order_by(TradeORM.opened_at.desc())
+                .all()
+            )
+        ]
+        assert [item.model_dump_json() for item in result.items] == expected
+        # Whole page must round-trip through the declared response model
+        result.model_validate_json(result.model_dump_json())
+
     def test_date_filter_accepts_iso_datetime(self, db_session):
         """Client DateTimePicker sends UTC ISO; backend must accept it."""
         result = list_trades(
@@ -162,15 +242,308 @@ class TestListTrades:
         assert result.total == 1
 
 
+def _add_keyset_trades(session) -> None:
+    """Trades with duplicate timestamps and NULL closed_at to stress ordering."""
+    for i in range(7):
+        closed = i % 3 != 0
+        session.add(
+            TradeORM(
+                user_id=1,
+                symbol=f"SYM{i}",
+                type="buy",
+                open_price=100,
+                quantity=1,
+                opened_at=datetime(2025, 4, 1 + i // 2, 10, tzinfo=timezone.utc),
+                close_price=110 if closed else None,
+                closed_at=(
+                    datetime(2025, 4, 10 + i // 3, 10, tzinfo=timezone.utc)
+                    if closed
+                    else None
+                ),
+                created_at=datetime(2025, 4, 1, 10, tzinfo=timezone.utc),
+            )
+        )
+    session.commit()
+
+
+class TestKeysetPagination:
+    @pytest.mark.parametrize("sort_by", ["opened_at", "closed_at", "created_at", "pnl"])
+    @pytest.mark.parametrize("sort_order", ["asc", "desc"])
+    def test_cursor_walk_matches_full_ordering(self, db_session, sort_by, sort_order):
+        _add_keyset_trades(db_session)
+        expected = [
+            t.id
+            for t in list_trades(
+                db_session,
+                1,
+                TradeListQuery(paginate=False, sort_by=sort_by, sort_order=sort_order),
+            ).items
+        ]
+
+        pages = []
+        page = list_trades(
+            db_session, 1, TradeListQuery(limit=2, sort_by=sort_by, sort_order=sort_order)
+        )
+        assert page.prev_cursor is None
+        pages.append([t.id for t in page.items])
+        while page.next_cursor:
+            page = list_trades(
+                db_session,
+                1,
+                TradeListQuery(
+                    limit=2,
+                    cursor=page.next_cursor,
+                    sort_by=sort_by,
+                    sort_order=sort_order,
+                ),
+            )
+            pages.append([t.id for t in page.items])
+
+        assert [i for p in pages for i in p] == expected
+
+        # Walk back from the last page using prev cursors
+        back = [[t.id for t in page.items]]
+        while page.prev_cursor:
+            page = list_trades(
+                db_session,
+                1,
+                TradeListQuery(
+                    limit=2,
+                    cursor=page.prev_cursor,
+                    sort_by=sort_by,
+                    sort_order=sort_order,
+                ),
+            )
+            back.append([t.id for t in page.items])
+        assert list(reversed(back)) == pages
+
+    def test_cursor_page_has_no_offset(self, db_session):
+        _add_keyset_trades(db_session)
+        page = list_trades(db_session, 1, TradeListQuery(limit=2, offset=2))
+        assert page.offset == 2
+        page = list_trades(db_session, 1, TradeListQuery(limit=2, cursor=page.next_cursor))
+        assert page.offset is None
+        assert '"offset":null' in page.model_dump_json()
+
+    def test_offset_page_exposes_cursors(self, db_session):
+        _add_keyset_trades(db_session)
+        page = list_trades(db_session, 1, TradeListQuery(limit=3, offset=3))
+        assert page.prev_cursor is not None
+        assert page.next_cursor is not None
+
+    def test_last_page_has_no_next_cursor(self, db_session):
+        page = list_trades(db_session, 1, TradeListQuery(limit=50))
+        assert page.next_cursor is None
+        assert page.prev_cursor is None
+
+    def test_cursor_rejected_for_different_sort(self, db_session):
+        _add_keyset_trades(db_session)
+        page = list_trades(db_session, 1, TradeListQuery(limit=2))
+        with pytest.raises(PydanticCustomError):
+            list_trades(
+                db_session,
+                1,
+                TradeListQuery(limit=2, cursor=page.next_cursor, sort_order="asc"),
+            )
+
+    def test_garbage_cursor_rejected(self, db_session):
+        with pytest.raises(PydanticCustomError):
+            list_trades(db_session, 1, TradeListQuery(cursor="not-a-cursor"))
+
+
+class TestStoredPnl:
+    def test_pnl_columns_follow_writes(self, db_session):
+        trade = db_session.query(TradeORM).filter_by(symbol="ETHUSDT").one()
+        # sell 5 @ 200 -> 180
+        assert trade.realized_pnl == pytest.approx(100)
+        assert trade.pnl_pct == pytest.approx(0.1)
+
+        trade.leverage = 10
+        trade.close_price = 190
+        db_session.commit()
+        assert trade.realized_pnl == pytest.approx(50)
+        assert trade.pnl_pct == pytest.approx(0.5)
+
+        trade.close_price = None
+        trade.closed_at = None
+        db_session.commit()
+        assert trade.realized_pnl is None
+        assert trade.pnl_pct is None
+
+    def test_liquidated_trade_loses_margin(self, db_session):
+        trade = TradeORM(
+            user_id=3, symbol="X", type="buy", open_price=100, quantity=2,
+            leverage=5, opened_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            close_price=50, closed_at=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        )
+        db_session.add(trade)
+        db_session.commit()
+        assert trade.realized_pnl == pytest.approx(-40)
+        assert trade.pnl_pct == pytest.approx(-1)
+
+    def _add_pnls(self, session, pnls):
+        for i, pnl in enumerate(pnls):
+            session.add(
+                TradeORM(
+                    user_id=1, symbol=f"P{i}", type="buy", open_price=1000,
+                    quantity=1, opened_at=datetime(2025, 3, 1, tzinfo=timezone.utc),
+                    close_price=1000 + pnl,
+                    closed_at=datetime(2025, 3, 2, tzinfo=timezone.utc),
+                )
+            )
+        session.commit()
+
+    def test_sort_by_pnl_puts_open_trades_last(self, db_session):
+        self._add_pnls(db_session, [-600, 250, 0])
+        items = list_trades(
+            db_session, 1, TradeListQuery(sort_by="pnl", sort_order="desc")
+        ).items
+        assert [t.realized_pnl for t in items] == [250, 100, 0, -600, None]
+        assert items[-1].symbol == "btcusdt"
+
+    def test_pnl_range_and_outcome_filters(self, db_session):
+        self._add_pnls(db_session, [-600, -500, -20, 0, 250])
+
+        def symbols(**filters):
+            result = list_trades(db_session, 1, TradeListQuery(**filters))
+            assert result.total == len(result.items)
+            return sorted(t.symbol for t in result.items)
+
+        assert symbols(outcome="loss", pnl_max=-500) == ["P0", "P1"]
+        assert symbols(outcome="win") == ["ETHUSDT", "P4"]
+        assert symbols(pnl_min=0, pnl_max=100) == ["ETHUSDT", "P3"]
+        # Open trades have no realized PnL
+        assert symbols(status="open", pnl_min=-1000) == []
+
+    def test_pnl_filters_are_part_of_count_key(self, db_session):
+        self._add_pnls(db_session, [-600, 250])
+        assert list_trades(db_session, 1, TradeListQuery(outcome="win", limit=1)).total == 2
+        assert list_trades(db_session, 1, TradeListQuery(outcome="loss", limit=1)).total == 1
+
+
+class TestCountModes:
+    def test_none_skips_total(self, db_session):
+        _add_keyset_trades(db_session)
+        page = list_trades(db_session, 1, TradeListQuery(limit=2, count="none"))
+        assert page.total is None
+        assert page.has_more is None
+        assert len(page.items) == 2
+
+    def test_has_more(self, db_session):
+        _add_keyset_trades(db_session)
+        first = list_trades(db_session, 1, TradeListQuery(limit=5, count="has_more"))
+        assert first.total is None
+        assert first.has_more is True
+        last = list_trades(
+            db_session, 1, TradeListQuery(limit=5, offset=5, count="has_more")
+        )
+        assert last.has_more is False
+
+    def test_estimated_falls_back_to_exact_on_sqlite(self, db_session):
+        _add_keyset_trades(db_session)
+        page = list_trades(db_session, 1, TradeListQuery(limit=2, count="estimated"))
+        assert page.total == 9
+
+    def test_exact_total_is_cached_until_invalidated(self, db_session):
+        _add_keyset_trades(db_session)
+        assert list_trades(db_session, 1, TradeListQuery(limit=2)).total == 9
+
+        db_session.add(
+            TradeORM(
+                user_id=1,
+                symbol="NEW",
+                type="buy",
+                open_price=1,
+                quantity=1,
+                opened_at=datetime(2025, 7, 1, 10, tzinfo=timezone.utc),
+            )
+        )
+        db_session.commit()
+        assert list_trades(db_session, 1, TradeListQuery(limit=2)).total == 9
+
+        trade_count_cache.invalidate_user(1)
+        assert list_trades(db_session, 1, TradeListQuery(limit=2)).total == 10
+
+    def test_cache_key_ignores_paging_and_normalizes_filters(self, db_session):
+        _add_keyset_trades(db_session)
+        list_trades(db_session, 1, TradeListQuery(limit=2, symbol="sym", tags=None))
+        db_session.query(TradeORM).filter(TradeORM.symbol == "SYM0").delete()
+        db_session.commit()
+        page = list_trades(
+            db_session, 1, TradeListQuery(limit=3, offset=0, symbol="SYM")
+        )
+        assert page.total == 7
+
+    def test_last_offset_page_counts_without_query(self, db_session):
+        page = list_trades(db_session, 1, TradeListQuery(limit=50))
+        assert page.total == 2
+
+
+class TestTradeCountCache:
+    def test_expired_entries_are_dropped(self):
+        cache = TradeCountCache(ttl_sec=0)
+        cache.set(1, ("k",), 5)
+        assert cache.get(1, ("k",)) is None
+
+    def test_per_user_key_limit(self):
+        cache = TradeCountCache(max_keys_per_user=2)
+        cache.set(1, "a", 1)
+        cache.set(1, "b", 2)
+        cache.set(1, "c", 3)
+        assert cache.get(1, "a") is None
+        assert cache.get(1, "c") == 3
+
+    def test_invalidate_user_is_scoped(self):
+        cache = TradeCountCache()
+        cache.set(1, "a", 1)
+        cache.set(2, "a", 2)
+        cache.invalidate_user(1)
+        assert cache.get(1, "a") is None
+        assert cache.get(2, "a") == 2
+
+
+class TestStreaming:
+    def test_chunks_respect_chunk_size(self, db_session):
+        _add_keyset_trades(db_session)
+        chunks = list(
+            iter_trade_chunks(db_session, 1, TradeListQuery(paginate=False), chunk_size=4)
+        )
+        assert [len(c) for c in chunks] == [4, 4, 1]
+
+    def test_json_stream_matches_buffered_response(self, db_session):
+        _add_keyset_trades(db_session)
+        query = TradeListQuery(status="closed", paginate=False)
+        streamed = b"".join(iter_trade_list_json(db_session, 1, query))
+        buffered = list_trades(db_session, 1, query).model_dump_json()
+        assert json.loads(streamed) == json.loads(buffered)
+
+    def test_json_stream_empty(self, db_session):
+        query = TradeListQuery(symbol="NOPE", paginate=False)
+        body = json.loads(b"".join(iter_trade_list_json(db_session, 1, query)))
+        assert body["items"] == []
+        assert body["total"] == 0
+
+    def test_ndjson_one_trade_per_line(self, db_session):
+        query = TradeListQuery(paginate=False)
+        lines = b"".join(iter_trade_ndjson(db_session, 1, query)).splitlines()
+        assert [json.loads(line)["symbol"] for line in lines] == ["btcusdt", "ETHUSDT"]
+
+
 class TestDateBoundNormalization:
     def test_date_only_bounds(self):
-        assert _lower_bound_iso("2025-05-10") == "2025-05-10T00:00:00Z"
-        assert _upper_bound_iso("2025-05-10") == "2025-05-10T23:59:59.999000Z"
+        assert _lower_bound("2025-05-10") == datetime(2025, 5, 10, tzinfo=timezone.utc)
+        assert _upper_bound("2025-05-10") == datetime(
+            2025, 5, 10, 23, 59, 59, 999000, tzinfo=timezone.utc
+        )
 
     def test_iso_datetime_bounds(self):
         # Local midnight expressed as UTC — use as-is for from, +1 day for to
-        assert _lower_bound_iso("2025-05-09T21:00:00.000Z") == "2025-05-09T21:00:00Z"
-        assert _upper_bound_iso("2025-05-09T21:00:00.000Z") == "2025-05-10T20:59:59.999000Z"
+        assert _lower_bound("2025-05-09T21:00:00.000Z") == datetime(
+            2025, 5, 9, 21, tzinfo=timezone.utc
+        )
+        assert _upper_bound("2025-05-09T21:00:00.000Z") == datetime(
+            2025, 5, 10, 20, 59, 59, 999000, tzinfo=timezone.utc
+        )
 
 
 class TestFacetsAndSummary:
@@ -179,21 +552,54 @@ class TestFacetsAndSummary:
         assert facets.symbols == ["BTCUSDT", "ETHUSDT"]
         assert facets.tags == ["breakout", "eth", "scalp"]
 
-    def test_summary_buy_trade_pnl(self, db_session):
-        """Summary total_pnl must be correct for long (buy) closed trades."""
-        db_session.add(
+    def test_facet_counts(self, db_session):
+        new_trades = [
             TradeORM(
                 user_id=1,
-                symbol="LONG",
+                symbol="ethusdt",
                 type="buy",
-                open_price=100,
-                quantity=10,
-                opened_at="2025-06-01T10:00:00Z",
-                close_price=120,
-                closed_at="2025-06-02T10:00:00Z",
-                created_at="2025-06-01T10:00:00Z",
-            )
+                open_price=1,
+                quantity=1,
+                opened_at=datetime(2025, 6, 3, tzinfo=timezone.utc),
+                tags=["eth"],
+            ),
+            TradeORM(
+                user_id=1,
+                symbol="SOLUSDT",
+                type="buy",
+                open_price=1,
+                quantity=1,
+                opened_at=datetime(2025, 6, 3, tzinfo=timezone.utc),
+                tags=None,
+            ),
+        ]
+        db_session.add_all(new_trades)
+        apply_facet_changes(
+            db_session,
+            1,
+            added=[k for t in new_trades for k in trade_facet_keys(t.symbol, t.tags)],
+        )
+        db_session.commit()
+        facets = get_facets(db_session, 1)
+        assert facets.symbol_counts == {"BTCUSDT": 1, "ETHUSDT": 2, "SOLUSDT": 1}
+        assert facets.tag_counts == {"breakout": 1, "eth": 2, "scalp": 1}
+        assert facets.symbols == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+    def test_summary_buy_trade_pnl(self, db_session):
+        """Summary total_pnl must be correct for long (buy) closed trades."""
+        trade = TradeORM(
+            user_id=1,
+            symbol="LONG",
+            type="buy",
+            open_price=100,
+            quantity=10,
+            opened_at=datetime(2025, 6, 1, 10, tzinfo=timezone.utc),
+            close_price=120,
+            closed_at=datetime(2025, 6, 2, 10, tzinfo=timezone.utc),
+            created_at=datetime(2025, 6, 1, 10, tzinfo=timezone.utc),
         )
+        db_session.add(trade)
+        apply_trade_changes(db_session, 1, added=[trade.to_domain()])
         db_session.commit()
         summary = get_summary(db_session, 1)
         # Existing closed sell +100, new closed buy +200 → total +300
@@ -203,3 +609,62 @@ class TestFacetsAndSummary:
         summary = get_summary(db_session, 1)
         assert summary.open_equity == 1000
         assert summary.total_pnl == 100.0
+
+    def test_summary_honors_list_filters(self, db_session):
+        closed = get_summary(db_session, 1, TradeListQuery(status="closed"))
+        assert closed.open_equity == 0
+        assert closed.total_pnl == 100.0
+
+        btc = get_summary(db_session, 1, TradeListQuery(symbol="btc"))
+        assert btc.open_equity == 1000
+        assert btc.total_pnl == 0
+
+        none = get_summary(db_session, 1, TradeListQuery(tags=["missing"]))
+        assert none.model_dump() == dict.fromkeys(none.model_dump(), 0.0)
+
+    def test_filtered_summary_matches_list(self, db_session):
+        query = TradeListQuery(tags=["eth"], limit=1, offset=5)
+        items = list_trades(db_session, 1, query.model_copy(update={"paginate": False})).items
+        summary = get_summary(db_session, 1, query)
+        assert summary.total_pnl == sum(
+            (t.open_price - t.close_price) * t.quantity for t in items
+        )
+
+    def test_legacy_row_is_closed_everywhere(self, db_session):
+        """A close_price without closed_at is closed for list, summary and aggregates."""
+        db_session.add(
+            TradeORM(
+                user_id=1,
+                symbol="LEGACY",
+                type="buy",
+                open_price=10,
+                quantity=2,
+                opened_at=datetime(2025, 4, 1, 10, tzinfo=timezone.utc),
+                close_price=15,
+                closed_at=None,
+                created_at=datetime(2025, 4, 1, 10, tzinfo=timezone.utc),
+            )
+        )
+        rebuild_trade_aggregates(db_session)
+        db_session.commit()
+
+        open_symbols = [
+            t.symbol for t in list_trades(db_session, 1, TradeListQuery(status="open")).items
+        ]
+        closed_symbols = [
+            t.symbol for t in list_trades(db_session, 1, TradeListQuery(status="closed")).items
+        ]
+        assert "LEGACY" not in open_symbols
+        assert "LEGACY" in closed_symbols
+
+        # Aggregate path and filtered SQL path agree with the list
+        summary = get_summary(db_session, 1)
+        filtered = get_summary(db_session, 1, TradeListQuery(symbol="LEGACY"))
+        assert summary.open_equity == 1000
+        assert summary.total_pnl == 110.0
+        assert filtered.open_equity == 0
+        assert filtered.total_pnl == 10.0
+
+    def test_paging_params_keep_aggregate_path(self, db_session):
+        assert not has_filters(TradeListQuery(limit=5, offset=10, sort_order="asc"))
+        assert has_filters(TradeListQuery(date_from="2025-01-01"))
@@ -0,0 +1,152 @@
+"""Tests for the AsyncSession trade read services.
+
+Each async function must return exactly what its sync twin returns for
+the same database, so both stacks can serve the same routes.
+"""
+
+import random
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..database import async_database_url
+from ..db import Base
+from ..models.trade.trade_list_query import TradeListQuery
+from ..services.data_version_service import bump_data_version, get_data_version
+from ..services.trade_aggregates_service import rebuild_trade_aggregates
+from ..services.trade_query_service import (
+    get_facets,
+    get_summary,
+    get_trade_by_id,
+    iter_trade_chunks,
+    list_trades,
+)
+from ..services.trade_result_cache import facets_cache, summary_cache
+from ..services.trade_stream import (
+    aiter_trade_list_json,
+    aiter_trade_ndjson,
+    iter_trade_list_json,
+    iter_trade_ndjson,
+)
+from ..services.user_facets_service import rebuild_user_facets
+from .test_trade_sql_metrics import _random_trade, _store
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from ..services.trade_query_service_async import (  # noqa: E402
+    aiter_trade_chunks,
+    get_data_version_async,
+    get_facets_async,
+    get_summary_async,
+    get_trade_by_id_async,
+    list_trades_async,
+)
+
+QUERIES = [
+    TradeListQuery(),
+    TradeListQuery(status="closed", sort_by="pnl", limit=7),
+    TradeListQuery(tags=["a"], sort_order="asc", count="has_more"),
+    TradeListQuery(symbol="btc", paginate=False),
+]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    """File database: the sync and async engines need to share it."""
+    url = f"sqlite:///{tmp_path / 'trades.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    rng = random.Random(25)
+    trades = [_random_trade(rng) for _ in range(60)]
+    for trade in trades:
+        trade.tags = rng.choice((None, ["a"], ["a", "b"]))
+    _store(session, 1, trades)
+    _store(session, 2, [_random_trade(rng) for _ in range(5)])
+    rebuild_user_facets(session)
+    rebuild_trade_aggregates(session)
+    bump_data_version(session, 1)
+    session.commit()
+    session.close()
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def sync_session(db_url):
+    engine = create_engine(db_url)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+async def async_session(db_url):
+    engine = create_async_engine(async_database_url(db_url))
+    async with async_sessionmaker(engine)() as session:
+        yield session
+    await engine.dispose()
+
+
+def _clear_result_caches():
+    summary_cache.clear()
+    facets_cache.clear()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("query", QUERIES)
+async def test_list_and_summary_match_sync(sync_session, async_session, query):
+    page = await list_trades_async(async_session, 1, query)
+    summary = await get_summary_async(async_session, 1, query)
+    _clear_result_caches()
+    assert page.model_dump() == list_trades(sync_session, 1, query).model_dump()
+    assert summary == get_summary(sync_session, 1, query)
+
+
+@pytest.mark.anyio
+async def test_facets_version_and_lookup_match_sync(sync_session, async_session):
+    facets = await get_facets_async(async_session, 1)
+    _clear_result_caches()
+    assert facets == get_facets(sync_session, 1)
+    assert await get_data_version_async(async_session, 1) == get_data_version(sync_session, 1) == 1
+
+    trade = await get_trade_by_id_async(async_session, 1, 3)
+    assert trade.id == get_trade_by_id(sync_session, 1, 3).id
+    assert await get_trade_by_id_async(async_session, 2, 3) is None
+
+
+@pytest.mark.anyio
+async def test_streams_match_sync(sync_session, async_session):
+    query = TradeListQuery(paginate=False, sort_by="closed_at")
+    chunks = [chunk async for chunk in aiter_trade_chunks(async_session, 1, query, chunk_size=16)]
+    assert [len(chunk) for chunk in chunks] == [16, 16, 16, 12]
+    assert [t for chunk in chunks for t in chunk] == [
+        t for chunk in iter_trade_chunks(sync_session, 1, query) for t in chunk
+    ]
+
+    ndjson = b"".join([part async for part in aiter_trade_ndjson(async_session, 1, query)])
+    assert ndjson == b"".join(iter_trade_ndjson(sync_session, 1, query))
+    body = b"".join([part async for part in aiter_trade_list_json(async_session, 1, query)])
+    assert body == b"".join(iter_trade_list_json(sync_session, 1, query))
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("postgresql://u:p@db:5432/app", "postgresql+psycopg://u:***@db:5432/app"),
+        ("postgresql+psycopg://u:p@db/app", "postgresql+psycopg://u:***@db/app"),
+        ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+    ],
+)
+def test_async_database_url(url, expected):
+    assert str(async_database_url(url)) == expected
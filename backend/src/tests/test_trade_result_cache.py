@@ -0,0 +1,190 @@
+"""Tests for the per-process summary/facets result cache."""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..db import Base, TradeORM
+from ..models.trade.trade_list_query import TradeListQuery
+from ..services import trade_query_service
+from ..services.trade_metrics import SUMMARY_WINDOW
+from ..services.trade_query_service import get_facets, get_summary
+from ..services.trade_result_cache import (
+    TradeResultCache,
+    facets_cache,
+    render_cache_metrics,
+    summary_cache,
+)
+from ..services.trade_write_service import apply_trade_changes, invalidate_trade_caches
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+def _create(session, user_id, opened_at, close_price=None, symbol="BTCUSDT"):
+    trade = TradeORM(
+        user_id=user_id,
+        symbol=symbol,
+        type="buy",
+        open_price=100,
+        quantity=1,
+        opened_at=opened_at,
+        close_price=close_price,
+        closed_at=opened_at + timedelta(minutes=1) if close_price else None,
+    )
+    session.add(trade)
+    apply_trade_changes(session, user_id, added=[trade.to_domain()])
+    session.commit()
+    invalidate_trade_caches(user_id)
+    return trade
+
+
+class TestTradeResultCache:
+    def test_hit_and_miss_counters(self, clock):
+        cache = TradeResultCache("t")
+        assert cache.get(1, "a") is None
+        cache.set(1, "a", "value")
+        assert cache.get(1, "a") == "value"
+        assert cache.stats() == {
+            "entries": 1,
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def test_lru_eviction_across_users(self, clock):
+        cache = TradeResultCache("t", max_entries=2)
+        cache.set(1, None, "one")
+        cache.set(2, None, "two")
+        cache.get(1)  # 2 is now least recently used
+        cache.set(3, None, "three")
+        assert cache.get(2) is None
+        assert cache.get(1) == "one"
+        assert cache.get(3) == "three"
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_and_earlier_deadline(self, clock):
+        cache = TradeResultCache("t", ttl_sec=60)
+        cache.set(1, "ttl", "x")
+        cache.set(1, "short", "y", expires_at=clock.now + 10)
+        cache.set(1, "long", "z", expires_at=clock.now + 600)
+        clock.now += 30
+        assert cache.get(1, "short") is None
+        assert cache.get(1, "ttl") == "x"
+        clock.now += 31
+        assert cache.get(1, "ttl") is None
+        assert cache.get(1, "long") is None  # capped by the TTL
+        assert cache.stats()["expirations"] == 3
+        assert cache.stats()["entries"] == 0
+
+    def test_invalidate_user_only_drops_that_user(self, clock):
+        cache = TradeResultCache("t")
+        cache.set(1, "a", 1)
+        cache.set(1, "b", 2)
+        cache.set(2, "a", 3)
+        cache.invalidate_user(1)
+        assert cache.get(1, "a") is None
+        assert cache.get(1, "b") is None
+        assert cache.get(2, "a") == 3
+        assert cache.stats()["invalidations"] == 2
+
+    def test_value_computed_before_a_write_is_not_stored(self, clock):
+        cache = TradeResultCache("t")
+        assert cache.get(1, "k") is None  # request starts computing
+        cache.invalidate_user(1)  # a write commits meanwhile
+        cache.set(1, "k", "stale")
+        assert cache.get(1, "k") is None
+
+        cache.set(1, "k", "fresh")  # recomputed after the write
+        assert cache.get(1, "k") == "fresh"
+
+    def test_clear_also_refuses_earlier_misses(self, clock):
+        cache = TradeResultCache("t")
+        assert cache.get(1, "k") is None
+        cache.clear()
+        cache.set(1, "k", "stale")
+        assert cache.get(1, "k") is None
+
+    def test_render_metrics(self):
+        cache = TradeResultCache("demo")
+        cache.get(1)
+        text = render_cache_metrics((cache,))
+        assert "# TYPE logitrades_result_cache_misses_total counter" in text
+        assert 'logitrades_result_cache_misses_total{cache="demo"} 1' in text
+        assert 'logitrades_result_cache_entries{cache="demo"} 0' in text
+
+
+class TestCachedReads:
+    def test_facets_cached_until_invalidated(self, db_session):
+        _create(db_session, 1, datetime(2025, 1, 1, tzinfo=timezone.utc))
+        assert get_facets(db_session, 1).symbols == ["BTCUSDT"]
+        assert get_facets(db_session, 1) is get_facets(db_session, 1)
+        assert facets_cache.stats()["hits"] == 2
+
+        _create(db_session, 1, datetime(2025, 1, 2, tzinfo=timezone.utc), symbol="ETHUSDT")
+        assert get_facets(db_session, 1).symbols == ["BTCUSDT", "ETHUSDT"]
+
+    def test_summary_cached_per_filter_set(self, db_session):
+        _create(db_session, 1, datetime(2025, 1, 1, tzinfo=timezone.utc), close_price=110)
+        _create(db_session, 1, datetime(2025, 1, 2, tzinfo=timezone.utc))
+        assert get_summary(db_session, 1).open_equity == 100
+        assert get_summary(db_session, 1, TradeListQuery(status="closed")).open_equity == 0
+        # Paging and sort don't change the summary, so they share an entry
+        assert get_summary(db_session, 1, TradeListQuery(limit=5)).open_equity == 100
+        assert summary_cache.stats()["hits"] == 1
+
+    def test_summary_expires_when_window_edge_passes(self, db_session, clock):
+        now = datetime.now(timezone.utc)
+        _create(db_session, 1, now - SUMMARY_WINDOW + timedelta(hours=1), close_price=110)
+        assert get_summary(db_session, 1).pnl_last_7_days == pytest.approx(10)
+
+        clock.now += 3500
+        get_summary(db_session, 1)
+        assert summary_cache.stats()["hits"] == 1
+
+        clock.now += 200
+        get_summary(db_session, 1)
+        assert summary_cache.stats()["expirations"] == 1
+
+    def test_write_between_compute_and_set(self, db_session, monkeypatch):
+        _create(db_session, 1, datetime(2025, 1, 1, tzinfo=timezone.utc))
+        read_summary = trade_query_service.read_summary
+
+        def read_then_write(*args, **kwargs):
+            summary = read_summary(*args, **kwargs)
+            # Another request adds a trade before this one caches its result
+            _create(db_session, 1, datetime(2025, 1, 2, tzinfo=timezone.utc))
+            return summary
+
+        monkeypatch.setattr(trade_query_service, "read_summary", read_then_write)
+        assert get_summary(db_session, 1).open_equity == 100
+        monkeypatch.undo()
+
+        assert get_summary(db_session, 1).open_equity == 200
@@ -0,0 +1,180 @@
+"""HTTP tests for the trade endpoints: ETags, 304 revalidation and the
+DB_STACK=async handlers served by a real uvicorn process."""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from .. import database
+from ..auth import create_auth_token
+from ..db import Base
+from ..main import app
+from .test_trade_query_service_async import db_url  # noqa: F401 (fixture)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+SERVER_START_TIMEOUT_SEC = 20
+
+ANALYTICS_PATHS = [
+    "/api/v1/trades/analytics",
+    "/api/v1/trades/equity-curve",
+    "/api/v1/trades/pnl-buckets",
+    "/api/v1/trades/breakdown",
+    "/api/v1/trades/r-multiples",
+]
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    def get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[database.get_db] = get_db
+    with TestClient(app) as test_client:
+        test_client.cookies.set("access_token", create_auth_token(1, "access"))
+        yield test_client
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+class TestAnalyticsEtags:
+    @pytest.mark.parametrize("path", ANALYTICS_PATHS)
+    def test_revalidates_until_a_write(self, client, valid_trade_form, path):
+        params = {"status": "closed"}
+        first = client.get(path, params=params)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        again = client.get(path, params=params, headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+
+        other_filter = client.get(
+            path, params={**params, "symbol": "BTC"}, headers={"If-None-Match": etag}
+        )
+        assert other_filter.status_code == 200
+
+        assert client.post("/api/v1/trades", json=valid_trade_form).status_code == 200
+        after_write = client.get(path, params=params, headers={"If-None-Match": etag})
+        assert after_write.status_code == 200
+        assert after_write.headers["etag"] != etag
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def async_stack(db_url):
+    """uvicorn serving src.main:app with DB_STACK=async on `db_url`."""
+    port = _free_port()
+    env = {**os.environ, "DB_STACK": "async", "DATABASE_URL": db_url, "CACHE_URL": ""}
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "src.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + SERVER_START_TIMEOUT_SEC
+    while True:
+        try:
+            httpx.get(f"{base_url}/metrics")
+            break
+        except httpx.TransportError:
+            if server.poll() is not None or time.monotonic() > deadline:
+                server.kill()
+                pytest.fail(f"uvicorn did not start: {server.stderr.read().decode()}")
+            time.sleep(0.1)
+    with httpx.Client(base_url=f"{base_url}/api/v1") as http:
+        http.cookies.set("access_token", create_auth_token(1, "access"))
+        yield http
+    server.terminate()
+    server.wait(timeout=10)
+
+
+class TestAsyncStack:
+    def test_list_and_revalidation(self, async_stack):
+        page = async_stack.get("/trades", params={"limit": 10, "sort_order": "asc"})
+        assert page.status_code == 200
+        assert page.json()["total"] == 60
+        assert len(page.json()["items"]) == 10
+        etag = page.headers["etag"]
+
+        cached = async_stack.get(
+            "/trades", params={"sort_order": "asc", "limit": 10}, headers={"If-None-Match": etag}
+        )
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+
+        for path in ("/trades/summary", "/trades/facets"):
+            first = async_stack.get(path)
+            assert first.status_code == 200
+            again = async_stack.get(path, headers={"If-None-Match": first.headers["etag"]})
+            assert again.status_code == 304
+
+    def test_streaming(self, async_stack):
+        params = {"paginate": "false", "status": "closed"}
+        paged = async_stack.get("/trades", params=params).json()
+
+        streamed = async_stack.get("/trades", params={**params, "stream": "json"})
+        assert streamed.headers["content-type"].startswith("application/json")
+        assert streamed.json()["items"] == paged["items"]
+
+        ndjson = async_stack.get("/trades", params={**params, "stream": "ndjson"})
+        lines = [json.loads(line) for line in ndjson.text.splitlines()]
+        assert lines == paged["items"]
+
+    def test_writes_are_visible_to_async_reads(self, async_stack, valid_trade_form):
+        before = async_stack.get("/trades", params={"limit": 1})
+        summary = async_stack.get("/trades/summary").json()
+
+        created = async_stack.post("/trades", json=valid_trade_form)
+        assert created.status_code == 200
+        trade_id = created.json()["id"]
+
+        after = async_stack.get(
+            "/trades", params={"limit": 1}, headers={"If-None-Match": before.headers["etag"]}
+        )
+        assert after.status_code == 200
+        assert after.json()["total"] == before.json()["total"] + 1
+        assert async_stack.get(f"/trades/{trade_id}").json()["symbol"] == "BTCUSDT"
+        assert async_stack.get("/trades/summary").json()["open_equity"] == (
+            summary["open_equity"] + 100 * 10
+        )
+
+        updated = async_stack.put(f"/trades/{trade_id}", json={**valid_trade_form, "symbol": "ETHUSDT"})
+        assert updated.status_code == 200
+        assert async_stack.get(f"/trades/{trade_id}").json()["symbol"] == "ETHUSDT"
+        assert "ETHUSDT" in async_stack.get("/trades/facets").json()["symbols"]
+
+        assert async_stack.delete(f"/trades/{trade_id}").status_code == 200
+        assert async_stack.get(f"/trades/{trade_id}").status_code == 404
+        assert async_stack.get("/trades", params={"limit": 1}).json()["total"] == before.json()["total"]
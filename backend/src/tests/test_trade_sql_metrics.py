@@ -0,0 +1,114 @@
+"""Parity tests: SQL summary aggregate vs the Python reference implementation."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..db import Base, TradeORM
+from ..domain.trade.enums import TradeType
+from ..domain.trade.trade_domain import TradeDomain
+from ..services.trade_metrics import calc_absolute_pnl, compute_summary
+from ..services.trade_sql_metrics import absolute_pnl_expr, compute_summary_sql
+
+NOW = datetime(2025, 6, 15, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+def _random_trade(rng: random.Random) -> TradeDomain:
+    open_price = round(rng.uniform(0.5, 50_000), 4)
+    opened_at = NOW - timedelta(hours=rng.uniform(0, 24 * 20))
+    close_price = None
+    closed_at = None
+    if rng.random() < 0.7:
+        # Wide moves so leveraged trades regularly cross liquidation
+        close_price = round(open_price * rng.uniform(0.3, 1.7), 4)
+        closed_at = opened_at + timedelta(minutes=rng.randint(1, 60 * 24 * 5))
+    return TradeDomain(
+        symbol=rng.choice(["BTCUSDT", "ETHUSDT", "AAPL"]),
+        type=rng.choice([TradeType.buy, TradeType.sell]),
+        open_price=open_price,
+        quantity=round(rng.uniform(0.001, 100), 6),
+        opened_at=opened_at,
+        leverage=rng.choice([None, None, 1, 2, 5, 10, 50, 125]),
+        close_price=close_price,
+        closed_at=closed_at,
+    )
+
+
+def _store(session, user_id: int, trades: list[TradeDomain]) -> None:
+    for trade in trades:
+        db_trade = TradeORM(**trade.to_dict())
+        db_trade.user_id = user_id
+        session.add(db_trade)
+    session.commit()
+
+
+class TestAbsolutePnlExpression:
+    @pytest.mark.parametrize(
+        ("trade_type", "leverage", "close_price"),
+        [
+            (TradeType.buy, None, 120),
+            (TradeType.sell, None, 120),
+            (TradeType.buy, 10, 89),  # liquidated long
+            (TradeType.buy, 10, 90),  # exactly at liquidation price
+            (TradeType.sell, 10, 111),  # liquidated short
+            (TradeType.sell, 10, 105),
+            (TradeType.buy, 1, 50),
+        ],
+    )
+    def test_matches_calc_absolute_pnl(self, db_session, trade_type, leverage, close_price):
+        trade = TradeDomain(
+            symbol="BTCUSDT",
+            type=trade_type,
+            open_price=100,
+            quantity=3,
+            opened_at=NOW - timedelta(days=1),
+            leverage=leverage,
+            close_price=close_price,
+            closed_at=NOW,
+        )
+        _store(db_session, 1, [trade])
+        sql_pnl = db_session.query(absolute_pnl_expr()).scalar()
+        assert sql_pnl == pytest.approx(calc_absolute_pnl(trade))
+
+    def test_open_trade_is_null(self, db_session):
+        trade = TradeDomain(
+            symbol="BTCUSDT",
+            type=TradeType.buy,
+            open_price=100,
+            quantity=1,
+            opened_at=NOW,
+        )
+        _store(db_session, 1, [trade])
+        assert db_session.query(absolute_pnl_expr()).scalar() is None
+
+
+class TestSummaryParity:
+    @pytest.mark.parametrize("seed", range(10))
+    def test_randomized_trades(self, db_session, seed):
+        rng = random.Random(seed)
+        trades = [_random_trade(rng) for _ in range(rng.randint(1, 200))]
+        _store(db_session, 1, trades)
+        _store(db_session, 2, [_random_trade(rng) for _ in range(20)])
+
+        expected = compute_summary(trades, now=NOW)
+        actual = compute_summary_sql(db_session, 1, now=NOW)
+
+        assert actual.keys() == expected.keys()
+        for key, value in expected.items():
+            assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-6), key
+
+    def test_no_trades(self, db_session):
+        assert compute_summary_sql(db_session, 1, now=NOW) == compute_summary([], now=NOW)
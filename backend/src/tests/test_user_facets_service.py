@@ -0,0 +1,135 @@
+"""Tests for the incrementally maintained user facet dictionary."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..db import Base, TradeORM, UserFacetORM
+from ..services.trade_query_service import get_facets
+from ..services.user_facets_service import (
+    apply_facet_changes,
+    rebuild_user_facets,
+    trade_facet_keys,
+)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+def _add_trade(session, user_id: int, symbol: str, tags: list[str] | None) -> TradeORM:
+    trade = TradeORM(
+        user_id=user_id,
+        symbol=symbol,
+        type="buy",
+        open_price=1,
+        quantity=1,
+        opened_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        tags=tags,
+    )
+    session.add(trade)
+    apply_facet_changes(session, user_id, added=trade_facet_keys(symbol, tags))
+    session.commit()
+    return trade
+
+
+def _facet_rows(session, user_id: int) -> dict[tuple[str, str], int]:
+    return {
+        (row.kind, row.value): row.trade_count
+        for row in session.query(UserFacetORM).filter(UserFacetORM.user_id == user_id)
+    }
+
+
+class TestTradeFacetKeys:
+    def test_symbol_is_uppercased_and_tags_kept(self):
+        assert trade_facet_keys("btc", ["a", "b"]) == [
+            ("symbol", "BTC"),
+            ("tag", "a"),
+            ("tag", "b"),
+        ]
+
+    def test_empty_values_skipped(self):
+        assert trade_facet_keys("", None) == []
+
+
+class TestApplyFacetChanges:
+    def test_counts_accumulate(self, db_session):
+        _add_trade(db_session, 1, "btc", ["a"])
+        _add_trade(db_session, 1, "BTC", ["a", "b"])
+        assert _facet_rows(db_session, 1) == {
+            ("symbol", "BTC"): 2,
+            ("tag", "a"): 2,
+            ("tag", "b"): 1,
+        }
+
+    def test_removal_deletes_exhausted_entries(self, db_session):
+        trade = _add_trade(db_session, 1, "BTC", ["a"])
+        _add_trade(db_session, 1, "ETH", ["a"])
+        apply_facet_changes(db_session, 1, removed=trade_facet_keys(trade.symbol, trade.tags))
+        db_session.delete(trade)
+        db_session.commit()
+        assert _facet_rows(db_session, 1) == {("symbol", "ETH"): 1, ("tag", "a"): 1}
+
+    def test_update_moves_counts(self, db_session):
+        trade = _add_trade(db_session, 1, "BTC", ["a"])
+        previous = trade_facet_keys(trade.symbol, trade.tags)
+        trade.symbol = "ETH"
+        trade.tags = ["a", "b"]
+        apply_facet_changes(
+            db_session,
+            1,
+            added=trade_facet_keys(trade.symbol, trade.tags),
+            removed=previous,
+        )
+        db_session.commit()
+        facets = get_facets(db_session, 1)
+        assert facets.symbols == ["ETH"]
+        assert facets.tag_counts == {"a": 1, "b": 1}
+
+    def test_rollback_discards_changes(self, db_session):
+        db_session.add(
+            TradeORM(
+                user_id=1,
+                symbol="BTC",
+                type="buy",
+                open_price=1,
+                quantity=1,
+                opened_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            )
+        )
+        apply_facet_changes(db_session, 1, added=[("symbol", "BTC")])
+        db_session.rollback()
+        assert _facet_rows(db_session, 1) == {}
+
+
+class TestRebuildUserFacets:
+    def test_rebuild_matches_incremental(self, db_session):
+        _add_trade(db_session, 1, "btc", ["a", "b"])
+        _add_trade(db_session, 1, "ETH", None)
+        _add_trade(db_session, 2, "SOL", ["c"])
+        incremental = {1: _facet_rows(db_session, 1), 2: _facet_rows(db_session, 2)}
+
+        rebuild_user_facets(db_session)
+        db_session.commit()
+
+        assert {1: _facet_rows(db_session, 1), 2: _facet_rows(db_session, 2)} == incremental
+
+    def test_rebuild_repairs_single_user(self, db_session):
+        _add_trade(db_session, 1, "BTC", ["a"])
+        _add_trade(db_session, 2, "SOL", None)
+        db_session.query(UserFacetORM).update({UserFacetORM.trade_count: 99})
+        db_session.commit()
+
+        rebuild_user_facets(db_session, user_id=1)
+        db_session.commit()
+
+        assert _facet_rows(db_session, 1) == {("symbol", "BTC"): 1, ("tag", "a"): 1}
+        assert _facet_rows(db_session, 2) == {("symbol", "SOL"): 99}
@@ -1,3 +1,4 @@
+import { formatDuration } from '$lib/formatters';
 import type { Trade } from '$lib/types';
 
 export function calcAbsolutePnl(trade: Trade): number | null {
@@ -279,19 +280,7 @@ export function calcAverageTradeDuration(trades: Trade[]): string {
 		return sum + (closeTime - openTime);
 	}, 0);
 
-	const avgDurationMs = totalDurationMs / closedTrades.length;
-	const avgDurationMinutes = avgDurationMs / (1000 * 60);
-	const avgDurationHours = avgDurationMinutes / 60;
-	const avgDurationDays = avgDurationHours / 24;
-
-	// Smart formatting: use most appropriate unit
-	if (avgDurationDays >= 1) {
-		return `${avgDurationDays.toFixed(1)}d`;
-	} else if (avgDurationHours >= 1) {
-		return `${avgDurationHours.toFixed(1)}h`;
-	} else {
-		return `${Math.round(avgDurationMinutes)}m`;
-	}
+	return formatDuration(totalDurationMs / closedTrades.length / 1000);
 }
 
 export function calcMaxDrawdown(trades: Trade[]): {
@@ -1,11 +1,13 @@
-import {
-	calcAbsolutePnl,
-	calcWinrate,
-	pnlForPeriod,
-	totalTradedVolumeForPeriod,
-} from './calcFunctions';
 import { chartTheme } from './chart-theme';
-import type { BarChartData, LineChartData, PieChartData, Trade } from './types';
+import type {
+	BarChartData,
+	EquityCurvePoint,
+	HistogramBin,
+	LineChartData,
+	PnlBucket,
+	TradeGroupStats,
+	TradeRMultipleHistogram,
+} from './types';
 
 /**
  *
@@ -86,19 +88,16 @@ function generateMonthRange(startMonth: string, count: number): string[] {
 	return result;
 }
 
-// Helper function to create monthly P&L data
+// Helper function to create monthly P&L data from the month buckets
 // Always shows 6 months starting from the earliest month with data
 // (within the last 6 months from current). Current month is always visible.
-export function createMonthlyPnLData(trades: Trade[]): BarChartData {
+export function createMonthlyPnLData(buckets: PnlBucket[]): BarChartData {
 	const MONTHS_TO_SHOW = 6;
 	const pnlByMonth = new Map<string, number>();
 
-	// Aggregate PnL by month
-	trades.forEach((trade) => {
-		const pnl = calcAbsolutePnl(trade);
-		if (pnl == null || !trade.closedAt) return;
-		const monthKey = toMonthKey(new Date(trade.closedAt));
-		pnlByMonth.set(monthKey, (pnlByMonth.get(monthKey) || 0) + pnl);
+	// period_start is "YYYY-MM-01"
+	buckets.forEach((bucket) => {
+		pnlByMonth.set(bucket.period_start.slice(0, 7), bucket.pnl);
 	});
 
 	const currentMonth = toMonthKey(new Date());
@@ -143,19 +142,14 @@ export type SymbolStatsRow = {
 	winrate: number;
 };
 
-export function getSymbolStats(allTrades: Trade[]): SymbolStatsRow[] {
-	const statsBySymbol = Object.groupBy(allTrades, (trade) => trade.symbol);
-
-	return Object.entries(statsBySymbol)
-		.map(([symbol, trades = []]) => {
-			return {
-				symbol,
-				pnl: pnlForPeriod(trades),
-				notionalVolume: totalTradedVolumeForPeriod(trades),
-				winrate: calcWinrate(trades),
-			};
-		})
-		.sort((a, b) => b.notionalVolume - a.notionalVolume);
+// Rows of the breakdown's by_symbol list, already ordered by volume
+export function getSymbolStats(groups: TradeGroupStats[]): SymbolStatsRow[] {
+	return groups.map((group) => ({
+		symbol: group.key,
+		pnl: group.realized_pnl,
+		notionalVolume: group.volume,
+		winrate: group.winrate,
+	}));
 }
 
 export type TradeTypeStats = {
@@ -164,92 +158,35 @@ export type TradeTypeStats = {
 	winrate: number;
 };
 
-export function createTradeTypeStats(trades: Trade[]): TradeTypeStats[] {
-	const calculateStats = (tradeType: 'buy' | 'sell'): TradeTypeStats => {
-		const filteredTrades = trades.filter((t) => t.tradeType === tradeType);
-		const closedTrades = filteredTrades.filter(
-			(t) => t.closePrice && t.closedAt,
-		);
-		const wins = closedTrades.filter((t) => {
-			const pnl = calcAbsolutePnl(t);
-			return pnl !== null && pnl > 0;
-		}).length;
-
+// Long/short cards from the breakdown's by_side list; winrate in percent
+export function createTradeTypeStats(
+	bySide: TradeGroupStats[],
+): TradeTypeStats[] {
+	const sideStats = (tradeType: 'buy' | 'sell'): TradeTypeStats => {
+		const group = bySide.find((g) => g.key === tradeType);
 		return {
 			type: tradeType === 'buy' ? 'long' : 'short',
-			tradeCount: filteredTrades.length,
-			winrate: closedTrades.length > 0 ? (wins / closedTrades.length) * 100 : 0,
+			tradeCount: group?.trade_count ?? 0,
+			winrate: (group?.winrate ?? 0) * 100,
 		};
 	};
 
-	return [calculateStats('buy'), calculateStats('sell')];
+	return [sideStats('buy'), sideStats('sell')];
 }
 
-// Helper function to create equity curve data
+// Helper function to create equity curve data from the server's
+// (already downsampled) curve, one point per closed trade
 export function createEquityCurveData(
-	trades: Trade[],
-	initialBalance: number = 0,
-	timeframe: 'daily' | 'weekly' | 'monthly' = 'daily',
+	points: EquityCurvePoint[],
 ): LineChartData {
-	// Get all closed trades sorted by close date
-	const closedTrades = trades
-		.filter((trade) => trade.closePrice && trade.closedAt)
-		.reverse() // Assuming trades are sorted by closedAt descending
-		.map((trade) => ({
-			...trade,
-			pnl: calcAbsolutePnl(trade) ?? 0,
-			closeDate: new Date(trade.closedAt!),
-		}));
-
-	// Group trades by timeframe
-	const equityByTimeframe = new Map<string, number>();
-	let cumulativePnL = 0;
-
-	closedTrades.forEach((trade) => {
-		const date = trade.closeDate;
-		let key: string;
-
-		switch (timeframe) {
-			case 'daily':
-				key = date.toISOString().split('T')[0];
-				break;
-			case 'weekly':
-				const weekStart = new Date(date);
-				weekStart.setDate(date.getDate() - date.getDay());
-				key = weekStart.toISOString().split('T')[0];
-				break;
-			case 'monthly':
-				key = toMonthKey(date);
-				break;
-		}
-
-		cumulativePnL += trade.pnl;
-		equityByTimeframe.set(key, initialBalance + cumulativePnL);
-	});
-
-	// Convert to array and sort by date
-	const sortedEntries = Array.from(equityByTimeframe.entries()).sort(
-		([a], [b]) => a.localeCompare(b),
-	);
-
-	// Create labels and data arrays with formatted dates
-	const labels = sortedEntries.map(([date]) => {
-		if (timeframe === 'monthly') {
-			return formatDateMMMYY(date);
-		}
-		return formatDateDDMMMYY(date);
-	});
-	const equityData = sortedEntries.map(([, equity]) => equity);
-
-	// Calculate drawdown data if requested
-	const drawdownData = calculateDrawdown(equityData);
+	const labels = points.map((point) => formatDateDDMMMYY(point.closed_at));
 
 	return {
 		labels,
 		datasets: [
 			{
 				label: 'Equity Curve',
-				data: equityData,
+				data: points.map((point) => point.equity),
 				borderColor: financialColors.primary,
 				backgroundColor: 'hsl(209.1 65.4% 40.8% / 0.15)',
 				tension: 0.4,
@@ -258,12 +195,11 @@ export function createEquityCurveData(
 				pointRadius: 0,
 				pointHoverRadius: 6,
 			},
-			// Add drawdown dataset if requested
-			...(drawdownData.length > 0
+			...(points.length > 0
 				? [
 						{
 							label: 'Drawdown',
-							data: drawdownData,
+							data: points.map((point) => point.drawdown),
 							borderColor: financialColors.loss,
 							backgroundColor: 'hsl(0 40% 48% / 0.22)',
 							tension: 0.4,
@@ -278,52 +214,28 @@ export function createEquityCurveData(
 	};
 }
 
-// Helper function to create Risk/Reward ratio distribution
-export function createRiskRewardDistribution(trades: Trade[]): BarChartData {
-	const ranges = [
-		{ min: -Infinity, max: -4, label: '<-4' },
-		{ min: -4, max: -2, label: '[-4, -2)' },
-		{ min: -2, max: -1.2, label: '[-2, -1.2)' },
-		{ min: -1.2, max: -0.8, label: '[-1.2, -0.8)' },
-		{ min: -0.8, max: 0.8, label: '[-0.8, 0.8)' },
-		{ min: 0.8, max: 1.2, label: '[0.8, 1.2)' },
-		{ min: 1.2, max: 2, label: '[1.2, 2)' },
-		{ min: 2, max: 4, label: '[2, 4]' },
-		{ min: 4, max: Infinity, label: '>4' },
-	];
-
-	const rangeCounts = new Array(ranges.length).fill(0);
-
-	// Filter and process trades
-	trades.forEach((trade) => {
-		const pnl = calcAbsolutePnl(trade);
-		if (!trade.stopLoss || !pnl) {
-			return;
-		}
-
-		const risk =
-			Math.abs(trade.stopLoss - trade.openPrice) * trade.quantity;
-		const ratio = pnl / risk;
-
-		// Find the appropriate range and increment its counter
-		const rangeIndex = ranges.findIndex(
-			(range) => ratio >= range.min && ratio < range.max,
-		);
-		if (rangeIndex !== -1) {
-			rangeCounts[rangeIndex]++;
-		}
-	});
+function formatBinLabel(bin: HistogramBin): string {
+	if (bin.lower == null) return `<${bin.upper}`;
+	if (bin.upper == null) return `>${bin.lower}`;
+	return `[${bin.lower}, ${bin.upper})`;
+}
 
+// Helper function to create Risk/Reward ratio distribution from the
+// R-multiple histogram
+export function createRiskRewardDistribution(
+	histogram: TradeRMultipleHistogram,
+): BarChartData {
 	return {
-		labels: ranges.map((range) => range.label),
+		labels: histogram.bins.map(formatBinLabel),
 		datasets: [
 			{
 				label: 'Risk/Reward Ratio Distribution',
-				data: rangeCounts,
-				backgroundColor: rangeCounts.map((_, index) => {
-					if (index < 4) return financialColors.loss;
-					if (index === 4) return financialColors.neutral;
-					return financialColors.profit;
+				data: histogram.bins.map((bin) => bin.count),
+				backgroundColor: histogram.bins.map((bin) => {
+					if (bin.upper != null && bin.upper <= 0) return financialColors.loss;
+					if (bin.lower != null && bin.lower >= 0)
+						return financialColors.profit;
+					return financialColors.neutral;
 				}),
 				borderWidth: 0,
 				borderRadius: 4,
@@ -333,21 +245,3 @@ export function createRiskRewardDistribution(trades: Trade[]): BarChartData {
 		],
 	};
 }
-
-// Helper function to calculate drawdown from equity curve
-function calculateDrawdown(equityData: number[]): number[] {
-	if (equityData.length === 0) return [];
-
-	const drawdown: number[] = [];
-	let peak = 0;
-
-	equityData.forEach((equity) => {
-		if (equity > peak) {
-			peak = equity;
-		}
-		const currentDrawdown = equity - peak;
-		drawdown.push(currentDrawdown);
-	});
-
-	return drawdown;
-}
@@ -38,12 +38,13 @@ type TradeListQueryContext = {
 	paginate?: boolean;
 };
 
-export function tradeFiltersToSearchParams(
+/** Filter params only, for the endpoints that aggregate instead of paging. */
+export function tradeFiltersToFilterParams(
 	filters: TradeFilters,
-	ctx: TradeListQueryContext,
+	status: 'open' | 'closed',
 ): URLSearchParams {
 	const params = new URLSearchParams();
-	params.set('status', ctx.status);
+	params.set('status', status);
 
 	if (filters.symbol?.trim()) {
 		params.set('symbol', filters.symbol.trim());
@@ -60,8 +61,18 @@ export function tradeFiltersToSearchParams(
 	if (filters.dateTo) {
 		params.set('date_to', filters.dateTo);
 	}
+	return params;
+}
+
+export function tradeFiltersToSearchParams(
+	filters: TradeFilters,
+	ctx: TradeListQueryContext,
+): URLSearchParams {
+	const params = tradeFiltersToFilterParams(filters, ctx.status);
 	if (ctx.paginate === false) {
 		params.set('paginate', 'false');
+		// Server streams the full list from a DB cursor in the same JSON shape
+		params.set('stream', 'json');
 	} else {
 		params.set('limit', String(ctx.limit ?? 50));
 		params.set('offset', String(ctx.offset ?? 0));
@@ -29,3 +29,16 @@ export const formatNumber = (value: number, maxFractionDigits = 2): string => {
 		maximumFractionDigits: maxFractionDigits,
 	}).format(value);
 };
+
+// Most appropriate single unit: "2.5d", "3.0h" or "45m"
+export const formatDuration = (seconds: number): string => {
+	const minutes = seconds / 60;
+	const hours = minutes / 60;
+	const days = hours / 24;
+	if (days >= 1) {
+		return `${days.toFixed(1)}d`;
+	} else if (hours >= 1) {
+		return `${hours.toFixed(1)}h`;
+	}
+	return `${Math.round(minutes)}m`;
+};
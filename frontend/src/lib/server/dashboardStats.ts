@@ -0,0 +1,60 @@
+import { httpClient } from '$lib/server/http-client/http-client';
+import { tradeFiltersToFilterParams } from '$lib/filters/tradeFilters';
+import type {
+	DashboardStats,
+	TradeAnalytics,
+	TradeBreakdown,
+	TradeEquityCurve,
+	TradeFilters,
+	TradePnlBuckets,
+	TradeRMultipleHistogram,
+} from '$lib/types';
+
+function withParams(
+	params: URLSearchParams,
+	extra: Record<string, string>,
+): URLSearchParams {
+	const merged = new URLSearchParams(params);
+	for (const [key, value] of Object.entries(extra)) {
+		merged.set(key, value);
+	}
+	return merged;
+}
+
+/**
+ * Dashboard statistics and chart series for the closed trades matching
+ * `filters`, aggregated by the backend instead of downloading every trade.
+ * Months are bucketed in UTC.
+ */
+export async function fetchDashboardStats(
+	fetch: typeof globalThis.fetch,
+	filters: TradeFilters,
+): Promise<DashboardStats> {
+	const searchParams = tradeFiltersToFilterParams(filters, 'closed');
+
+	const [analytics, equityCurve, monthlyPnl, breakdown, rMultiples] =
+		await Promise.all([
+			httpClient.get<TradeAnalytics>('/trades/analytics', {
+				fetch,
+				searchParams,
+			}),
+			httpClient.get<TradeEquityCurve>('/trades/equity-curve', {
+				fetch,
+				searchParams,
+			}),
+			httpClient.get<TradePnlBuckets>('/trades/pnl-buckets', {
+				fetch,
+				searchParams: withParams(searchParams, { granularity: 'month' }),
+			}),
+			httpClient.get<TradeBreakdown>('/trades/breakdown', {
+				fetch,
+				searchParams,
+			}),
+			httpClient.get<TradeRMultipleHistogram>('/trades/r-multiples', {
+				fetch,
+				searchParams,
+			}),
+		]);
+
+	return { analytics, equityCurve, monthlyPnl, breakdown, rMultiples };
+}
@@ -0,0 +1,57 @@
+const ETAG_CACHE_MAX_ENTRIES = 500;
+const ETAG_CACHE_MAX_CHARS = 8 * 1024 * 1024;
+
+type EtagCacheEntry = { etag: string; body: string };
+
+/**
+ * Last ETag and raw JSON body per GET URL, so repeated reads can be
+ * revalidated with If-None-Match and a 304 answered from memory.
+ *
+ * Shared across users on the server: backend ETags hash the user id, so
+ * a tag stored for one user never matches another user's data and only
+ * leads to a full 200 response. LRU, bounded by entries and body size.
+ */
+export class EtagCache {
+	private readonly entries = new Map<string, EtagCacheEntry>();
+	private readonly maxEntries: number;
+	private readonly maxChars: number;
+	private chars = 0;
+
+	constructor(
+		maxEntries = ETAG_CACHE_MAX_ENTRIES,
+		maxChars = ETAG_CACHE_MAX_CHARS,
+	) {
+		this.maxEntries = maxEntries;
+		this.maxChars = maxChars;
+	}
+
+	get(url: string): EtagCacheEntry | undefined {
+		const entry = this.entries.get(url);
+		if (entry) {
+			this.entries.delete(url);
+			this.entries.set(url, entry);
+		}
+		return entry;
+	}
+
+	set(url: string, etag: string, body: string): void {
+		this.delete(url);
+		if (body.length > this.maxChars) {
+			return;
+		}
+		this.entries.set(url, { etag, body });
+		this.chars += body.length;
+		while (this.entries.size > this.maxEntries || this.chars > this.maxChars) {
+			const oldest = this.entries.keys().next().value as string;
+			this.delete(oldest);
+		}
+	}
+
+	delete(url: string): void {
+		const entry = this.entries.get(url);
+		if (entry) {
+			this.chars -= entry.body.length;
+			this.entries.delete(url);
+		}
+	}
+}
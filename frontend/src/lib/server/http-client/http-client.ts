@@ -1,6 +1,7 @@
 import { BACKEND_API_URL } from '$env/static/private';
 import type { Cookies } from '@sveltejs/kit';
 import { forwardCookies } from './cookie-utils';
+import { EtagCache } from './etag-cache';
 
 type ResponseType<T = null> = T;
 
@@ -22,6 +23,7 @@ type AuthRequestResult<T = unknown> =
 export class HttpClient {
 	private readonly baseUrl: string;
 	private readonly customFetch?: typeof fetch;
+	private readonly etagCache = new EtagCache();
 
 	constructor(customFetch?: typeof fetch) {
 		this.baseUrl = BACKEND_API_URL;
@@ -145,23 +147,47 @@ export class HttpClient {
 	): Promise<ResponseType<K>> {
 		const { payload, headers = {} } = options;
 		const fetchFn = options.fetch || this.customFetch || fetch;
-		const response = await fetchFn(
-			this.buildRequestUrl(url, options.searchParams),
-			{
-				method,
-				headers: { 'Content-Type': 'application/json', ...headers },
-				body: payload ? JSON.stringify(payload) : undefined,
-				credentials: 'include',
+		const requestUrl = this.buildRequestUrl(url, options.searchParams);
+		// GETs revalidate the last body seen for the URL (ETag / 304)
+		const cached = method === 'GET' ? this.etagCache.get(requestUrl) : undefined;
+		const response = await fetchFn(requestUrl, {
+			method,
+			headers: {
+				'Content-Type': 'application/json',
+				...(cached ? { 'If-None-Match': cached.etag } : {}),
+				...headers,
 			},
-		);
+			body: payload ? JSON.stringify(payload) : undefined,
+			credentials: 'include',
+		});
+
+		if (cached && response.status === 304) {
+			return parseJson(cached.body) as K;
+		}
 
 		if (!response.ok) {
 			throw await response.json().catch(() => null);
 		}
 
-		const data = await response.json().catch(() => null);
+		const body = await response.text().catch(() => '');
+		if (method === 'GET') {
+			const etag = response.headers.get('ETag');
+			if (etag && body) {
+				this.etagCache.set(requestUrl, etag, body);
+			} else {
+				this.etagCache.delete(requestUrl);
+			}
+		}
 
-		return data as K;
+		return parseJson(body) as K;
+	}
+}
+
+function parseJson(body: string): unknown {
+	try {
+		return JSON.parse(body);
+	} catch {
+		return null;
 	}
 }
 
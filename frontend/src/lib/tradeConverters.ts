@@ -55,5 +55,5 @@ export const convertApiTradeListToUi = (
 	items: response.items.map(convertApiTradeToUiTrade),
 	total: response.total,
 	limit: response.limit,
-	offset: response.offset,
+	offset: response.offset ?? 0,
 });
@@ -1,5 +1,7 @@
 import { deserialize } from '$app/forms';
 import type {
+	DashboardFilterActionResult,
+	DashboardStats,
 	FilterActionResult,
 	TradeListResult,
 	TradeFilters,
@@ -18,7 +20,7 @@ export function filtersToFormData(filters: TradeFilters, offset = 0): FormData {
 }
 
 export async function submitTradeFilterAction(
-	action: 'filterOpened' | 'filterClosed' | 'filterDashboard',
+	action: 'filterOpened' | 'filterClosed',
 	filters: TradeFilters,
 	offset = 0,
 ): Promise<TradeListResult> {
@@ -47,3 +49,21 @@ export async function submitTradeFilterAction(
 		offset: data.offset ?? offset,
 	};
 }
+
+/** Dashboard stats for `filters`, or null when the action failed. */
+export async function submitDashboardFilterAction(
+	filters: TradeFilters,
+): Promise<DashboardStats | null> {
+	const response = await fetch('?/filterDashboard', {
+		method: 'POST',
+		body: filtersToFormData(filters),
+	});
+
+	const result = deserialize(await response.text());
+
+	if (result.type !== 'success') {
+		return null;
+	}
+
+	return ((result.data ?? {}) as DashboardFilterActionResult).stats ?? null;
+}
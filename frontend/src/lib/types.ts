@@ -35,13 +35,18 @@ export type ApiTrade = {
 	created_at: string;
 	comment?: string | null;
 	tags?: string[] | null;
+	realized_pnl?: number | null;
+	pnl_pct?: number | null;
 };
 
 export type ApiTradeListResponse = {
 	items: ApiTrade[];
 	total: number;
 	limit: number | null;
-	offset: number;
+	// null on cursor pages
+	offset: number | null;
+	next_cursor?: string | null;
+	prev_cursor?: string | null;
 };
 
 export type FilterActionResult = {
@@ -55,6 +60,8 @@ export type FilterActionResult = {
 export type TradeFacets = {
 	symbols: string[];
 	tags: string[];
+	symbol_counts?: Record<string, number>;
+	tag_counts?: Record<string, number>;
 };
 
 export type TradeSummary = {
@@ -64,6 +71,97 @@ export type TradeSummary = {
 	total_pnl: number;
 };
 
+// Dashboard analytics endpoints, all over the closed trades matching the filters
+export type TradeAnalytics = {
+	closed_trades: number;
+	winrate: number;
+	average_win: number;
+	average_loss: number;
+	// null when there are winning trades but no losing ones
+	profit_factor: number | null;
+	expectancy: number;
+	best_trade: number | null;
+	worst_trade: number | null;
+	gross_profit: number;
+	gross_loss: number;
+	max_win_streak: number;
+	max_loss_streak: number;
+	average_duration_seconds: number;
+	max_drawdown: number;
+	max_drawdown_pct: number;
+	average_risk_reward: number | null;
+};
+
+export type EquityCurvePoint = {
+	trade_id: number;
+	closed_at: string;
+	equity: number;
+	drawdown: number;
+};
+
+export type TradeEquityCurve = {
+	points: EquityCurvePoint[];
+	total_points: number;
+	max_drawdown: number;
+};
+
+export type PnlBucket = {
+	// YYYY-MM-DD, first day of the period
+	period_start: string;
+	pnl: number;
+	trade_count: number;
+	win_count: number;
+};
+
+export type TradePnlBuckets = {
+	granularity: 'day' | 'week' | 'month';
+	tz: string;
+	buckets: PnlBucket[];
+};
+
+export type TradeGroupStats = {
+	key: string;
+	trade_count: number;
+	closed_trades: number;
+	win_count: number;
+	winrate: number;
+	realized_pnl: number;
+	volume: number;
+	average_pnl: number;
+};
+
+export type TradeBreakdown = {
+	by_symbol: TradeGroupStats[];
+	by_side: TradeGroupStats[];
+	by_tag: TradeGroupStats[];
+};
+
+export type HistogramBin = {
+	// null on the open-ended first/last bins; bins are [lower, upper)
+	lower: number | null;
+	upper: number | null;
+	count: number;
+};
+
+export type TradeRMultipleHistogram = {
+	edges: number[];
+	bins: HistogramBin[];
+	total: number;
+};
+
+export type DashboardStats = {
+	analytics: TradeAnalytics;
+	equityCurve: TradeEquityCurve;
+	monthlyPnl: TradePnlBuckets;
+	breakdown: TradeBreakdown;
+	rMultiples: TradeRMultipleHistogram;
+};
+
+export type DashboardFilterActionResult = {
+	success?: boolean;
+	stats?: DashboardStats;
+};
+
 export type TradeListResult = {
 	items: Trade[];
 	total: number;
@@ -1,18 +1,14 @@
 import type { PageServerLoad } from './$types';
 import { redirect } from '@sveltejs/kit';
 import { httpClient } from '$lib/server/http-client/http-client';
-import { convertApiTradeListToUi } from '$lib/tradeConverters';
+import { fetchDashboardStats } from '$lib/server/dashboardStats';
 import {
+	EMPTY_TRADE_FILTERS,
 	tradeFiltersFromFormData,
-	tradeFiltersToSearchParams,
 } from '$lib/filters/tradeFilters';
 import type { Actions } from './$types';
 import { fail } from '@sveltejs/kit';
-import type {
-	ApiTradeListResponse,
-	TradeFacets,
-	TradeFilters,
-} from '$lib/types';
+import type { TradeFacets } from '$lib/types';
 
 export const load = (async ({ parent, fetch, depends }) => {
 	depends('dashboard:trades');
@@ -23,28 +19,14 @@ export const load = (async ({ parent, fetch, depends }) => {
 		throw redirect(303, '/login');
 	}
 
-	const defaultFilters: TradeFilters = {
-		symbol: '',
-		tradeType: 'all',
-		tags: [],
-	};
-	const searchParams = tradeFiltersToSearchParams(defaultFilters, {
-		status: 'closed',
-		paginate: false,
-	});
-
-	const [closedTradesResponse, facetsResponse] = await Promise.all([
-		httpClient.get<ApiTradeListResponse>('/trades', { fetch, searchParams }),
+	const [stats, facetsResponse] = await Promise.all([
+		fetchDashboardStats(fetch, EMPTY_TRADE_FILTERS),
 		httpClient.get<TradeFacets>('/trades/facets', {
 			fetch,
 		}),
 	]);
 
-	const closedTrades = closedTradesResponse
-		? convertApiTradeListToUi(closedTradesResponse)
-		: { items: [], total: 0, limit: null, offset: 0 };
-
-	return { closedTrades, facets: facetsResponse };
+	return { stats, facets: facetsResponse };
 }) satisfies PageServerLoad;
 
 export const actions = {
@@ -52,21 +34,9 @@ export const actions = {
 		try {
 			const formData = await request.formData();
 			const filters = tradeFiltersFromFormData(formData);
-			const searchParams = tradeFiltersToSearchParams(filters, {
-				status: 'closed',
-				paginate: false,
-			});
-
-			const response = await httpClient.get<ApiTradeListResponse>('/trades', {
-				fetch,
-				searchParams,
-			});
-
-			const result = response
-				? convertApiTradeListToUi(response)
-				: { items: [], total: 0, limit: null, offset: 0 };
+			const stats = await fetchDashboardStats(fetch, filters);
 
-			return { success: true, ...result };
+			return { success: true, stats };
 		} catch (error) {
 			return fail(500, { error });
 		}
@@ -1,60 +1,64 @@
 /**
  * Unit tests for chart data helper functions.
  *
- * Focuses on pure data-transformation and aggregation functions.
- * All expected values are derived from first principles, independently
- * of the implementation source.
+ * Focuses on the pure mapping of the analytics endpoints' responses
+ * (breakdown, equity curve, PnL buckets, R-multiple histogram) to chart
+ * and table inputs.
  */
 
 import { describe, it, expect } from 'vitest';
-import type { Trade } from '$lib/types';
+import type { TradeGroupStats, TradeRMultipleHistogram } from '$lib/types';
 import {
 	getColorPalette,
 	getSymbolStats,
 	createTradeTypeStats,
 	createRiskRewardDistribution,
+	createEquityCurveData,
+	createMonthlyPnLData,
 } from '$lib/chartsHelpers';
 
 // ---------------------------------------------------------------------------
 // Helpers
 // ---------------------------------------------------------------------------
 
-let _id = 0;
-
-function makeTrade(params: {
-	symbol?: string;
-	tradeType: 'buy' | 'sell';
-	openPrice: number;
-	quantity: number;
-	closePrice?: number;
-	closedAt?: string;
-	openedAt?: string;
-	leverage?: number;
-	stopLoss?: number;
-}): Trade {
-	const base: Trade = {
-		id: ++_id,
-		symbol: params.symbol ?? 'TEST',
-		tradeType: params.tradeType,
-		openPrice: params.openPrice,
-		quantity: params.quantity,
-		openedAt: params.openedAt ?? '2024-01-01T10:00:00Z',
-		createdAt: '2024-01-01T10:00:00Z',
+function group(
+	key: string,
+	params: Partial<Omit<TradeGroupStats, 'key'>> = {},
+): TradeGroupStats {
+	return {
+		key,
+		trade_count: 0,
+		closed_trades: 0,
+		win_count: 0,
+		winrate: 0,
+		realized_pnl: 0,
+		volume: 0,
+		average_pnl: 0,
+		...params,
 	};
-	if (params.closePrice !== undefined) base.closePrice = params.closePrice;
-	if (params.closedAt !== undefined) base.closedAt = params.closedAt;
-	if (params.leverage !== undefined) base.leverage = params.leverage;
-	if (params.stopLoss !== undefined) base.stopLoss = params.stopLoss;
-	return base;
 }
 
-function closed(
-	params: Parameters<typeof makeTrade>[0] & { closePrice: number },
-): Trade {
-	return makeTrade({
-		...params,
-		closedAt: params.closedAt ?? '2024-01-02T10:00:00Z',
-	});
+function monthKey(offset: number): string {
+	const now = new Date();
+	const date = new Date(now.getFullYear(), now.getMonth() + offset, 1);
+	const month = String(date.getMonth() + 1).padStart(2, '0');
+	return `${date.getFullYear()}-${month}`;
+}
+
+// Default edges of /trades/r-multiples
+const R_EDGES = [-4, -2, -1.2, -0.8, 0.8, 1.2, 2, 4];
+
+function histogram(counts: number[]): TradeRMultipleHistogram {
+	const bounds = [null, ...R_EDGES, null];
+	return {
+		edges: R_EDGES,
+		bins: counts.map((count, i) => ({
+			lower: bounds[i],
+			upper: bounds[i + 1],
+			count,
+		})),
+		total: counts.reduce((sum, count) => sum + count, 0),
+	};
 }
 
 // ---------------------------------------------------------------------------
@@ -84,98 +88,19 @@ describe('getColorPalette', () => {
 // ---------------------------------------------------------------------------
 
 describe('getSymbolStats', () => {
-	it('returns an empty array for no trades', () => {
+	it('returns an empty array for no groups', () => {
 		expect(getSymbolStats([])).toEqual([]);
 	});
 
-	it('aggregates PnL, notional volume and winrate per symbol', () => {
-		// AAPL trades:
-		//   t1: long open=100, close=120, qty=5 → pnl=+100, volume=(100+120)×5=1100
-		//   t2: long open=100, close=85,  qty=5 → pnl=-75,  volume=(100+85)×5=925
-		//   AAPL total pnl=25, notional=2025, winrate=1/2=0.5
-		//
-		// GOOG trades:
-		//   t3: short open=200, close=175, qty=3 → pnl=+75, volume=(200+175)×3=1125
-		//   GOOG total pnl=75, notional=1125, winrate=1/1=1.0
-		const trades = [
-			closed({
-				symbol: 'AAPL',
-				tradeType: 'buy',
-				openPrice: 100,
-				quantity: 5,
-				closePrice: 120,
-			}),
-			closed({
-				symbol: 'AAPL',
-				tradeType: 'buy',
-				openPrice: 100,
-				quantity: 5,
-				closePrice: 85,
-			}),
-			closed({
-				symbol: 'GOOG',
-				tradeType: 'sell',
-				openPrice: 200,
-				quantity: 3,
-				closePrice: 175,
-			}),
-		];
-
-		const stats = getSymbolStats(trades);
-
-		const aapl = stats.find((s) => s.symbol === 'AAPL')!;
-		expect(aapl).toBeDefined();
-		expect(aapl.pnl).toBeCloseTo(25);
-		expect(aapl.notionalVolume).toBeCloseTo(2025);
-		expect(aapl.winrate).toBeCloseTo(0.5);
-
-		const goog = stats.find((s) => s.symbol === 'GOOG')!;
-		expect(goog).toBeDefined();
-		expect(goog.pnl).toBeCloseTo(75);
-		expect(goog.notionalVolume).toBeCloseTo(1125);
-		expect(goog.winrate).toBeCloseTo(1.0);
-	});
-
-	it('sorts results by notional volume descending', () => {
-		// AAPL notional=2025, GOOG notional=1125 → AAPL should appear first
-		const trades = [
-			closed({
-				symbol: 'AAPL',
-				tradeType: 'buy',
-				openPrice: 100,
-				quantity: 5,
-				closePrice: 120,
-			}),
-			closed({
-				symbol: 'AAPL',
-				tradeType: 'buy',
-				openPrice: 100,
-				quantity: 5,
-				closePrice: 85,
-			}),
-			closed({
-				symbol: 'GOOG',
-				tradeType: 'sell',
-				openPrice: 200,
-				quantity: 3,
-				closePrice: 175,
-			}),
-		];
-		const stats = getSymbolStats(trades);
-		expect(stats[0].symbol).toBe('AAPL');
-		expect(stats[1].symbol).toBe('GOOG');
-	});
-
-	it('notional volume uses 0 for missing closePrice on open trades', () => {
-		const openTrade = makeTrade({
-			symbol: 'BTC',
-			tradeType: 'buy',
-			openPrice: 30000,
-			quantity: 1,
-		});
-		const stats = getSymbolStats([openTrade]);
-		// volume = (30000 + 0) × 1 = 30000
-		expect(stats[0].notionalVolume).toBe(30000);
+	it('maps breakdown groups to table rows, keeping their order', () => {
+		const stats = getSymbolStats([
+			group('AAPL', { realized_pnl: 25, volume: 2025, winrate: 0.5 }),
+			group('GOOG', { realized_pnl: 75, volume: 1125, winrate: 1 }),
+		]);
+		expect(stats).toEqual([
+			{ symbol: 'AAPL', pnl: 25, notionalVolume: 2025, winrate: 0.5 },
+			{ symbol: 'GOOG', pnl: 75, notionalVolume: 1125, winrate: 1 },
+		]);
 	});
 });
 
@@ -186,97 +111,103 @@ describe('getSymbolStats', () => {
 describe('createTradeTypeStats', () => {
 	it('always returns two entries: long and short', () => {
 		const result = createTradeTypeStats([]);
-		expect(result).toHaveLength(2);
-		expect(result.map((r) => r.type)).toContain('long');
-		expect(result.map((r) => r.type)).toContain('short');
-	});
-
-	it('counts all buy trades (including open) in tradeCount for long', () => {
-		const trades = [
-			closed({
-				tradeType: 'buy',
-				openPrice: 100,
-				quantity: 1,
-				closePrice: 110,
-			}),
-			closed({ tradeType: 'buy', openPrice: 100, quantity: 1, closePrice: 90 }),
-			makeTrade({ tradeType: 'buy', openPrice: 100, quantity: 1 }), // open
-		];
-		const longStats = createTradeTypeStats(trades).find(
-			(s) => s.type === 'long',
-		)!;
-		expect(longStats.tradeCount).toBe(3);
+		expect(result.map((r) => r.type)).toEqual(['long', 'short']);
+		expect(result.every((r) => r.tradeCount === 0 && r.winrate === 0)).toBe(
+			true,
+		);
+	});
+
+	it('maps buy to long and sell to short, winrate in percent', () => {
+		const result = createTradeTypeStats([
+			group('sell', { trade_count: 2, winrate: 0.5 }),
+			group('buy', { trade_count: 3, winrate: 2 / 3 }),
+		]);
+		const long = result.find((s) => s.type === 'long')!;
+		const short = result.find((s) => s.type === 'short')!;
+		expect(long.tradeCount).toBe(3);
+		expect(long.winrate).toBeCloseTo((2 / 3) * 100);
+		expect(short.tradeCount).toBe(2);
+		expect(short.winrate).toBeCloseTo(50);
 	});
+});
 
-	it('computes winrate only from closed buy trades', () => {
-		// 2 closed wins + 1 closed loss → winrate = 2/3 × 100 ≈ 66.67
-		const trades = [
-			closed({
-				tradeType: 'buy',
-				openPrice: 100,
-				quantity: 1,
-				closePrice: 110,
-			}), // W
-			closed({
-				tradeType: 'buy',
-				openPrice: 100,
-				quantity: 1,
-				closePrice: 110,
-			}), // W
-			closed({ tradeType: 'buy', openPrice: 100, quantity: 1, closePrice: 90 }), // L
-		];
-		const longStats = createTradeTypeStats(trades).find(
-			(s) => s.type === 'long',
-		)!;
-		expect(longStats.winrate).toBeCloseTo((2 / 3) * 100);
-	});
+// ---------------------------------------------------------------------------
+// createEquityCurveData
+// ---------------------------------------------------------------------------
 
-	it('counts all sell trades in tradeCount for short', () => {
-		const trades = [
-			closed({
-				tradeType: 'sell',
-				openPrice: 200,
-				quantity: 1,
-				closePrice: 175,
-			}), // W
-			closed({
-				tradeType: 'sell',
-				openPrice: 200,
-				quantity: 1,
-				closePrice: 220,
-			}), // L
-		];
-		const shortStats = createTradeTypeStats(trades).find(
-			(s) => s.type === 'short',
-		)!;
-		expect(shortStats.tradeCount).toBe(2);
-		expect(shortStats.winrate).toBeCloseTo(50);
+describe('createEquityCurveData', () => {
+	it('returns only the equity dataset for an empty curve', () => {
+		const result = createEquityCurveData([]);
+		expect(result.labels).toEqual([]);
+		expect(result.datasets).toHaveLength(1);
+	});
+
+	it('plots equity and drawdown per point', () => {
+		const result = createEquityCurveData([
+			{
+				trade_id: 1,
+				closed_at: '2024-01-02T10:00:00Z',
+				equity: 100,
+				drawdown: 0,
+			},
+			{
+				trade_id: 2,
+				closed_at: '2024-01-03T10:00:00Z',
+				equity: 40,
+				drawdown: -60,
+			},
+		]);
+		expect(result.labels).toEqual(['02 Jan 24', '03 Jan 24']);
+		expect(result.datasets[0].data).toEqual([100, 40]);
+		expect(result.datasets[1].label).toBe('Drawdown');
+		expect(result.datasets[1].data).toEqual([0, -60]);
 	});
+});
 
-	it('returns winrate 0 when there are no closed trades of a given type', () => {
-		const trades = [
-			makeTrade({ tradeType: 'sell', openPrice: 200, quantity: 1 }), // open sell trade
-		];
-		const shortStats = createTradeTypeStats(trades).find(
-			(s) => s.type === 'short',
-		)!;
-		expect(shortStats.winrate).toBe(0);
-	});
+// ---------------------------------------------------------------------------
+// createMonthlyPnLData
+// ---------------------------------------------------------------------------
 
-	it('long tradeCount is 0 when there are only short trades', () => {
-		const trades = [
-			closed({
-				tradeType: 'sell',
-				openPrice: 200,
-				quantity: 1,
-				closePrice: 175,
-			}),
-		];
-		const longStats = createTradeTypeStats(trades).find(
-			(s) => s.type === 'long',
-		)!;
-		expect(longStats.tradeCount).toBe(0);
-		expect(longStats.winrate).toBe(0);
+describe('createMonthlyPnLData', () => {
+	it('shows six months starting at the current one when there is no data', () => {
+		const result = createMonthlyPnLData([]);
+		expect(result.labels).toHaveLength(6);
+		expect(result.datasets[0].data.every((v) => v === null)).toBe(true);
+	});
+
+	it('starts at the earliest bucket in the last six months', () => {
+		const result = createMonthlyPnLData([
+			{
+				period_start: `${monthKey(-12)}-01`,
+				pnl: 5,
+				trade_count: 1,
+				win_count: 1,
+			},
+			{
+				period_start: `${monthKey(-2)}-01`,
+				pnl: 50,
+				trade_count: 2,
+				win_count: 1,
+			},
+			{
+				period_start: `${monthKey(0)}-01`,
+				pnl: -20,
+				trade_count: 1,
+				win_count: 0,
+			},
+		]);
+		// months -2..3: data at -2 and 0 only
+		expect(result.datasets[0].data).toEqual([
+			50,
+			null,
+			-20,
+			null,
+			null,
+			null,
+		]);
+		const colors = result.datasets[0].backgroundColor as string[];
+		expect(colors[1]).toBe('transparent');
+		expect(colors[0]).not.toBe(colors[2]);
 	});
 });
 
@@ -285,107 +216,35 @@ describe('createTradeTypeStats', () => {
 // ---------------------------------------------------------------------------
 
 describe('createRiskRewardDistribution', () => {
-	it('returns 9 buckets covering the full RR range', () => {
-		const result = createRiskRewardDistribution([]);
-		expect(result.datasets[0].data).toHaveLength(9);
-		expect(result.labels).toHaveLength(9);
-	});
-
-	it('returns all-zero counts for empty trades', () => {
-		const result = createRiskRewardDistribution([]);
-		expect(result.datasets[0].data.every((v) => v === 0)).toBe(true);
-	});
-
-	it('places a trade with RR=1.5 in the [1.2, 2) bucket (index 6)', () => {
-		// long, open=100, close=115, qty=10, SL=90
-		// actualPnl = (115-100)×10 = 150
-		// plannedRisk = |90-100|×10 = 100
-		// RR = 150/100 = 1.5 → bucket index 6 → label "[1.2, 2)"
-		const trade = closed({
-			tradeType: 'buy',
-			openPrice: 100,
-			quantity: 10,
-			closePrice: 115,
-			stopLoss: 90,
-		});
-		const result = createRiskRewardDistribution([trade]);
-		const counts = result.datasets[0].data as number[];
-		expect(counts[6]).toBe(1);
-		// All other buckets should be 0
-		counts.forEach((c, i) => {
-			if (i !== 6) expect(c).toBe(0);
-		});
-	});
-
-	it('places a trade with RR=-2.0 in the [-2, -1.2) bucket (index 2)', () => {
-		// long, open=100, close=80, qty=10, SL=90
-		// actualPnl = (80-100)×10 = -200
-		// plannedRisk = |90-100|×10 = 100
-		// RR = -200/100 = -2.0 → bucket index 2 → label "[-2, -1.2)"
-		const trade = closed({
-			tradeType: 'buy',
-			openPrice: 100,
-			quantity: 10,
-			closePrice: 80,
-			stopLoss: 90,
-		});
-		const result = createRiskRewardDistribution([trade]);
-		const counts = result.datasets[0].data as number[];
-		expect(counts[2]).toBe(1);
-	});
-
-	it('ignores trades without a stop-loss', () => {
-		const tradeNoSL = closed({
-			tradeType: 'buy',
-			openPrice: 100,
-			quantity: 10,
-			closePrice: 115,
-		});
-		const result = createRiskRewardDistribution([tradeNoSL]);
-		const counts = result.datasets[0].data as number[];
-		expect(counts.every((v) => v === 0)).toBe(true);
-	});
-
-	it('places a highly profitable trade (RR>4) in the >4 bucket (index 8)', () => {
-		// open=100, close=160, qty=10, SL=95
-		// actualPnl = (160-100)×10 = 600
-		// plannedRisk = |95-100|×10 = 50
-		// RR = 600/50 = 12.0 → index 8 → label ">4"
-		const trade = closed({
-			tradeType: 'buy',
-			openPrice: 100,
-			quantity: 10,
-			closePrice: 160,
-			stopLoss: 95,
-		});
-		const result = createRiskRewardDistribution([trade]);
-		const counts = result.datasets[0].data as number[];
-		expect(counts[8]).toBe(1);
-	});
-
-	it('accumulates multiple trades in the correct buckets', () => {
-		// trade1: RR=1.5 → index 6
-		// trade2: RR=-2.0 → index 2
-		const trade1 = closed({
-			tradeType: 'buy',
-			openPrice: 100,
-			quantity: 10,
-			closePrice: 115,
-			stopLoss: 90,
-		});
-		const trade2 = closed({
-			tradeType: 'buy',
-			openPrice: 100,
-			quantity: 10,
-			closePrice: 80,
-			stopLoss: 90,
-		});
-		const result = createRiskRewardDistribution([trade1, trade2]);
-		const counts = result.datasets[0].data as number[];
-		expect(counts[6]).toBe(1);
-		expect(counts[2]).toBe(1);
-		// Total across all buckets should be 2
-		const total = counts.reduce((sum, v) => sum + v, 0);
-		expect(total).toBe(2);
+	it('labels one bar per histogram bin', () => {
+		const result = createRiskRewardDistribution(histogram(Array(9).fill(0)));
+		expect(result.labels).toEqual([
+			'<-4',
+			'[-4, -2)',
+			'[-2, -1.2)',
+			'[-1.2, -0.8)',
+			'[-0.8, 0.8)',
+			'[0.8, 1.2)',
+			'[1.2, 2)',
+			'[2, 4)',
+			'>4',
+		]);
+	});
+
+	it('plots the bin counts', () => {
+		const counts = [0, 0, 1, 0, 0, 0, 1, 0, 2];
+		const result = createRiskRewardDistribution(histogram(counts));
+		expect(result.datasets[0].data).toEqual(counts);
+	});
+
+	it('colors losing bins, the bin around 0 and winning bins apart', () => {
+		const colors = createRiskRewardDistribution(histogram(Array(9).fill(0)))
+			.datasets[0].backgroundColor as string[];
+		const loss = colors[0];
+		const neutral = colors[4];
+		const profit = colors[8];
+		expect(new Set([loss, neutral, profit]).size).toBe(3);
+		expect(colors.slice(0, 4).every((c) => c === loss)).toBe(true);
+		expect(colors.slice(5).every((c) => c === profit)).toBe(true);
 	});
 });
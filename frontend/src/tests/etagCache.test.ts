@@ -0,0 +1,51 @@
+import { describe, expect, it } from 'vitest';
+import { EtagCache } from '$lib/server/http-client/etag-cache';
+
+describe('EtagCache', () => {
+	it('returns the stored etag and body per url', () => {
+		const cache = new EtagCache();
+		cache.set('/trades?limit=50', 'W/"1-a"', '{"items":[]}');
+		expect(cache.get('/trades?limit=50')).toEqual({
+			etag: 'W/"1-a"',
+			body: '{"items":[]}',
+		});
+		expect(cache.get('/trades?limit=20')).toBeUndefined();
+	});
+
+	it('replaces the entry for a url', () => {
+		const cache = new EtagCache();
+		cache.set('/trades/facets', 'W/"1-a"', '{}');
+		cache.set('/trades/facets', 'W/"2-a"', '{"symbols":[]}');
+		expect(cache.get('/trades/facets')?.etag).toBe('W/"2-a"');
+	});
+
+	it('evicts the least recently used entry beyond maxEntries', () => {
+		const cache = new EtagCache(2);
+		cache.set('/a', 'W/"1"', '1');
+		cache.set('/b', 'W/"1"', '2');
+		cache.get('/a');
+		cache.set('/c', 'W/"1"', '3');
+		expect(cache.get('/a')).toBeDefined();
+		expect(cache.get('/b')).toBeUndefined();
+		expect(cache.get('/c')).toBeDefined();
+	});
+
+	it('is bounded by total body size', () => {
+		const cache = new EtagCache(10, 5);
+		cache.set('/a', 'W/"1"', '123');
+		cache.set('/b', 'W/"1"', '456');
+		expect(cache.get('/a')).toBeUndefined();
+		expect(cache.get('/b')).toBeDefined();
+
+		cache.set('/big', 'W/"1"', '123456');
+		expect(cache.get('/big')).toBeUndefined();
+		expect(cache.get('/b')).toBeDefined();
+	});
+
+	it('forgets a deleted url', () => {
+		const cache = new EtagCache();
+		cache.set('/a', 'W/"1"', '1');
+		cache.delete('/a');
+		expect(cache.get('/a')).toBeUndefined();
+	});
+});
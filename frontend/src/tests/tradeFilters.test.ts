@@ -4,6 +4,7 @@ import {
 	hasActiveTradeFilters,
 	normalizeTradeFilterType,
 	tradeFiltersFromFormData,
+	tradeFiltersToFilterParams,
 	tradeFiltersToSearchParams,
 } from '$lib/filters/tradeFilters';
 
@@ -47,6 +48,14 @@ describe('tradeFilters', () => {
 		expect(sellParams.get('type')).toBe('sell');
 	});
 
+	it('leaves pagination out of the filter-only params', () => {
+		const params = tradeFiltersToFilterParams(
+			{ ...EMPTY_TRADE_FILTERS, tradeType: 'sell', tags: ['swing'] },
+			'closed',
+		);
+		expect(params.toString()).toBe('status=closed&type=sell&tags=swing');
+	});
+
 	it('parses tradeType from form data', () => {
 		const formData = new FormData();
 		formData.set('symbol', 'BTC');